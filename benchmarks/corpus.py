@@ -0,0 +1,284 @@
+# Copyright (c) 2006-2021  Andrey Golovizin
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Generate synthetic bibliography databases for benchmarks.
+
+The generated databases look like real-world ``.bib`` files: most entries are
+articles and conference papers, journals are referenced with ``@string``
+macros, conference papers cross-reference their proceedings, most entries
+have a few authors and some have hundreds, and names and titles contain
+non-ASCII characters, LaTeX accents and math.
+
+The output depends only on the number of entries and the seed.
+
+Usage::
+
+    python benchmarks/corpus.py num_entries filename.bib [--seed SEED]
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import io
+import random
+
+ENTRY_TYPES = [
+    ('article', 50),
+    ('inproceedings', 25),
+    ('book', 6),
+    ('incollection', 5),
+    ('techreport', 4),
+    ('phdthesis', 3),
+    ('mastersthesis', 2),
+    ('misc', 5),
+]
+
+# (number of authors, weight); ranges are sampled uniformly
+AUTHOR_COUNTS = [
+    ((1, 1), 15),
+    ((2, 2), 20),
+    ((3, 3), 20),
+    ((4, 4), 14),
+    ((5, 10), 21),
+    ((11, 50), 8),
+    ((51, 500), 2),
+]
+
+FIRST_NAMES = [
+    'John', 'Mary', 'Wei', 'Yuki', 'Olga', 'Pierre', 'Jean-Luc', 'Ana', 'Ahmed',
+    'Donald E.', 'Leslie', 'S.', 'J. R. R.', 'Łukasz', 'Søren', 'José', 'Zoë',
+    'Fran{\\c{c}}ois', 'J{\\"o}rg', 'Ren{\\\'e}', 'Andr{\\\'e}s', 'Ji{\\v{r}}{\\\'\\i}',
+]
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Wang', 'Tanaka', 'Ivanova', 'Dupont', 'García', 'Müller',
+    'Knuth', 'Lamport', 'Nguyen', 'O\'Brien', 'Kowalski', 'Andersen', 'Schröder',
+    'M{\\"u}ller', 'Erd{\\H{o}}s', 'Dvo{\\v{r}}{\\\'a}k', 'Stra{\\ss}e', '{Barnes and Noble}',
+    'Smith-Jones', '{\\v{S}}koda',
+]
+VON_PARTS = ['van', 'van der', 'de', 'de la', 'von', 'di']
+JR_PARTS = ['Jr.', 'III', 'Sr.']
+
+TITLE_WORDS = [
+    'analysis', 'of', 'the', 'efficient', 'algorithms', 'for', 'large', 'scale',
+    'distributed', 'systems', 'a', 'study', 'on', 'neural', 'networks', 'learning',
+    'quantum', 'error', 'correction', 'in', 'graphs', 'with', 'applications', 'to',
+    'parsing', 'typesetting', 'über', 'naïve', 'approach', 'models', 'random', 'sparse',
+]
+TITLE_SPECIALS = [
+    '{DNA}', '{B}ayesian', '{M}arkov', '$O(n \\log n)$', '$\\alpha$-stable',
+    '{\\TeX}', 'Schr{\\"o}dinger', '{GPU}', '$\\mathbb{R}^n$', 'Poincaré',
+]
+
+JOURNALS = [
+    ('jacm', 'Journal of the ACM'),
+    ('cacm', 'Communications of the ACM'),
+    ('tugboat', 'TUGboat'),
+    ('prl', 'Physical Review Letters'),
+    ('nature', 'Nature'),
+    ('tpami', 'IEEE Transactions on Pattern Analysis and Machine Intelligence'),
+    ('jmlr', 'Journal of Machine Learning Research'),
+    ('sicomp', 'SIAM Journal on Computing'),
+]
+LITERAL_JOURNALS = [
+    'Annals of Mathematics', 'Zeitschrift f{\\"u}r Physik', 'Acta Numerica',
+    'Journal für die reine und angewandte Mathematik',
+]
+PUBLISHERS = ['Addison-Wesley', 'Springer', 'Cambridge University Press', 'MIT Press', 'Éditions Dunod']
+ADDRESSES = ['Reading, MA', 'Berlin', 'Cambridge, UK', 'Paris', 'New York']
+SCHOOLS = ['Stanford University', 'ETH Z{\\"u}rich', 'Université Paris-Sud', 'MIT']
+MONTHS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+CONFERENCES = ['SODA', 'STOC', 'NeurIPS', 'ICML', 'SIGGRAPH', 'POPL', 'TUG', 'CVPR']
+
+# conference papers that cross-reference their proceedings
+CROSSREF_RATE = 0.3
+ENTRIES_PER_PROCEEDINGS = 20
+
+
+def weighted_choice(rng, choices):
+    total = sum(weight for value, weight in choices)
+    point = rng.uniform(0, total)
+    for value, weight in choices:
+        point -= weight
+        if point <= 0:
+            return value
+    return choices[-1][0]
+
+
+class CorpusGenerator(object):
+    """Generate a reproducible synthetic BibTeX database."""
+
+    def __init__(self, num_entries, seed=0):
+        self.num_entries = num_entries
+        self.rng = random.Random(seed)
+        self.num_proceedings = max(1, num_entries // ENTRIES_PER_PROCEEDINGS // 4)
+        self.num_regular = max(0, num_entries - self.num_proceedings)
+
+    def make_name(self):
+        rng = self.rng
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        if rng.random() < 0.08:
+            last = rng.choice(VON_PARTS) + ' ' + last
+        if rng.random() < 0.03:
+            return '{0}, {1}, {2}'.format(last, rng.choice(JR_PARTS), first)
+        if rng.random() < 0.5:
+            return '{0}, {1}'.format(last, first)
+        return '{0} {1}'.format(first, last)
+
+    def make_names(self):
+        low, high = weighted_choice(self.rng, AUTHOR_COUNTS)
+        num_names = self.rng.randint(low, high)
+        return ' and '.join(self.make_name() for _ in range(num_names))
+
+    def make_title(self):
+        rng = self.rng
+        words = [rng.choice(TITLE_WORDS) for _ in range(rng.randint(3, 14))]
+        if rng.random() < 0.3:
+            words.insert(rng.randint(0, len(words)), rng.choice(TITLE_SPECIALS))
+        words[0] = words[0].capitalize()
+        return ' '.join(words)
+
+    def make_pages(self):
+        start = self.rng.randint(1, 2000)
+        return '{0}--{1}'.format(start, start + self.rng.randint(1, 40))
+
+    def quoted(self, value):
+        if self.rng.random() < 0.2:
+            return '"{0}"'.format(value)
+        return '{{{0}}}'.format(value)
+
+    def make_fields(self, entry_type, key):
+        rng = self.rng
+        fields = []
+
+        def add(name, value, raw=False):
+            fields.append((name, value if raw else self.quoted(value)))
+
+        if entry_type == 'book' and rng.random() < 0.1:
+            add('editor', self.make_names())
+        else:
+            add('author', self.make_names())
+        add('title', self.make_title())
+        year = str(rng.randint(1950, 2024))
+        if entry_type == 'article':
+            if rng.random() < 0.7:
+                add('journal', rng.choice(JOURNALS)[0], raw=True)
+            else:
+                add('journal', rng.choice(LITERAL_JOURNALS))
+            add('volume', str(rng.randint(1, 120)), raw=rng.random() < 0.5)
+            if rng.random() < 0.7:
+                add('number', str(rng.randint(1, 12)))
+            add('pages', self.make_pages())
+        elif entry_type == 'inproceedings':
+            add('pages', self.make_pages())
+            if rng.random() < CROSSREF_RATE:
+                add('crossref', 'proc-{0}'.format(rng.randrange(self.num_proceedings)))
+                year = None
+            else:
+                add('booktitle', 'Proceedings of {0} {1}'.format(rng.choice(CONFERENCES), year))
+                if rng.random() < 0.5:
+                    add('publisher', rng.choice(PUBLISHERS))
+        elif entry_type == 'book':
+            add('publisher', rng.choice(PUBLISHERS))
+            add('address', rng.choice(ADDRESSES))
+            if rng.random() < 0.3:
+                add('edition', rng.choice(['Second', 'Third']))
+        elif entry_type == 'incollection':
+            add('booktitle', self.make_title())
+            add('editor', self.make_names())
+            add('publisher', rng.choice(PUBLISHERS))
+            add('pages', self.make_pages())
+        elif entry_type == 'techreport':
+            add('institution', rng.choice(SCHOOLS))
+            add('number', 'TR-{0}'.format(rng.randint(1, 999)))
+        elif entry_type in ('phdthesis', 'mastersthesis'):
+            add('school', rng.choice(SCHOOLS))
+        elif entry_type == 'misc':
+            add('howpublished', '\\url{{https://example.org/{0}}}'.format(key))
+        if year:
+            add('year', year, raw=rng.random() < 0.6)
+        if rng.random() < 0.4:
+            add('month', rng.choice(MONTHS), raw=True)
+        if rng.random() < 0.4:
+            add('doi', '10.{0}/{1}'.format(rng.randint(1000, 9999), key))
+        if rng.random() < 0.1:
+            add('note', self.make_title())
+        return fields
+
+    def format_entry(self, entry_type, key, fields):
+        lines = ['@{0}{{{1},'.format(entry_type, key)]
+        lines.extend('    {0} = {1},'.format(name, value) for name, value in fields)
+        lines.append('}\n\n')
+        return '\n'.join(lines)
+
+    def make_proceedings(self, index):
+        rng = self.rng
+        conference = rng.choice(CONFERENCES)
+        year = str(rng.randint(1970, 2024))
+        fields = [
+            ('title', self.quoted('Proceedings of {0} {1}'.format(conference, year))),
+            ('booktitle', self.quoted('Proceedings of {0} {1}'.format(conference, year))),
+            ('editor', self.quoted(' and '.join(self.make_name() for _ in range(rng.randint(1, 4))))),
+            ('publisher', self.quoted(rng.choice(PUBLISHERS))),
+            ('year', year),
+        ]
+        return self.format_entry('proceedings', 'proc-{0}'.format(index), fields)
+
+    def __iter__(self):
+        """Yield the database in chunks of text."""
+
+        yield '% Synthetic bibliography database: {0} entries\n\n'.format(self.num_entries)
+        yield '@preamble{ "\\newcommand{\\noopsort}[1]{}" }\n\n'
+        for macro, value in JOURNALS:
+            yield '@string{{{0} = "{1}"}}\n'.format(macro, value)
+        yield '\n'
+        for index in range(self.num_regular):
+            entry_type = weighted_choice(self.rng, ENTRY_TYPES)
+            key = '{0}{1}-{2}'.format(entry_type[:3], self.rng.randint(1950, 2024), index)
+            yield self.format_entry(entry_type, key, self.make_fields(entry_type, key))
+        # BibTeX needs cross-referenced entries to come after the entries that refer to them
+        for index in range(self.num_proceedings):
+            yield self.make_proceedings(index)
+
+
+def generate_string(num_entries, seed=0):
+    """Return a synthetic BibTeX database as a string."""
+    return ''.join(CorpusGenerator(num_entries, seed))
+
+
+def write_corpus(filename, num_entries, seed=0):
+    """Write a synthetic BibTeX database to a file."""
+    with io.open(filename, 'w', encoding='UTF-8') as bib_file:
+        for chunk in CorpusGenerator(num_entries, seed):
+            bib_file.write(chunk)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Generate a synthetic BibTeX database.')
+    arg_parser.add_argument('num_entries', type=int)
+    arg_parser.add_argument('filename')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+    write_corpus(args.filename, args.num_entries, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+# Copyright (c) 2006-2021  Andrey Golovizin
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Measure formatting of entries with thousands of authors.
+
+The test database contains entries like those of large physics
+collaborations, with 5000 authors each. The styles print only the first
+three names followed by "et al.".
+
+Usage::
+
+    python benchmarks/hyper_authored.py [num_authors]
+"""
+
+from __future__ import print_function, unicode_literals
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pybtex.bibtex import format_from_string  # noqa
+from pybtex.database import parse_string  # noqa
+from pybtex.style.formatting.alpha import Style as AlphaStyle  # noqa
+from pybtex.style.formatting.unsrt import Style as UnsrtStyle  # noqa
+
+NUM_ENTRIES = 10
+
+# format the first three names and the number of names
+ET_AL_BST = r"""
+ENTRY { author title } {} {}
+FUNCTION {format.authors}
+{ author #1 "{vv~}{ll}{, jj}{, f.}" format.name$
+  author #2 "{vv~}{ll}{, jj}{, f.}" format.name$ * ", " *
+  author #3 "{vv~}{ll}{, jj}{, f.}" format.name$ * " et al. (" *
+  author num.names$ int.to.str$ * " authors)" *
+}
+FUNCTION {article}
+{ "\bibitem{" cite$ * "}" * write$ newline$
+  format.authors write$ newline$
+  title write$ newline$
+}
+READ
+ITERATE {call.type$}
+"""
+
+
+def make_database(num_authors, num_entries=NUM_ENTRIES):
+    entries = []
+    for entry_number in range(num_entries):
+        authors = ' and '.join(
+            'Author{0}-{1}, First{1} M.'.format(entry_number, author_number)
+            for author_number in range(num_authors)
+        )
+        entries.append((
+            '@article{{collab{0},\n'
+            '    author = {{{1}}},\n'
+            '    title = {{Observation {0}}},\n'
+            '    journal = {{Phys. Rev.}},\n'
+            '    year = {{2020}},\n'
+            '}}\n'
+        ).format(
+            entry_number, authors,
+        ))
+    return '\n'.join(entries)
+
+
+def measure(function, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(num_authors):
+    text = make_database(num_authors)
+    bib_data = parse_string(text, 'bibtex')
+    entries = list(bib_data.entries.values())
+
+    def format_python(style_cls):
+        style = style_cls(max_names=3)
+        bib_data = parse_string(text, 'bibtex')
+        style.format_bibliography(bib_data)
+
+    bst_dir = tempfile.mkdtemp()
+    try:
+        style = os.path.join(bst_dir, 'etal')
+        with open(style + '.bst', 'w') as bst_file:
+            bst_file.write(ET_AL_BST)
+        benchmarks = [
+            ('parse', lambda: parse_string(text, 'bibtex')),
+            ('count authors', lambda: [len(entry.persons['author']) for entry in parse_string(text, 'bibtex').entries.values()]),
+            ('unsrt, 3 names', lambda: format_python(UnsrtStyle)),
+            ('alpha, 3 names', lambda: format_python(AlphaStyle)),
+            ('BibTeX style, 3 names', lambda: format_from_string(text, style, citations=['*'])),
+        ]
+        print('{0} entries with {1} authors each'.format(len(entries), num_authors))
+        for name, function in benchmarks:
+            print('{0:24} {1:7.3f} s'.format(name, measure(function)))
+    finally:
+        shutil.rmtree(bst_dir)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+
+# Copyright (c) 2006-2021  Andrey Golovizin
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Measure the throughput of the BibTeX parser on large .bib files.
+
+The test database is made by repeating the entries from ``tests/data`` with
+unique keys until it reaches the requested size.
+
+Usage::
+
+    python benchmarks/parse_bibtex.py [megabytes ...]
+"""
+
+from __future__ import print_function, unicode_literals
+
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pybtex import errors  # noqa
+from pybtex.database.input.bibtex import Parser  # noqa
+
+SAMPLE_FILES = ['xampl.bib', 'IEEEtran.bib', 'cyrillic.bib']
+entry_key_re = re.compile(r'^(@\s*(?!string|preamble|comment)\w+\s*[{(]\s*)([^\s,]+)', re.MULTILINE | re.IGNORECASE)
+
+
+def read_sample():
+    samples = []
+    for filename in SAMPLE_FILES:
+        with open(os.path.join(ROOT, 'tests', 'data', filename), encoding='UTF-8') as sample_file:
+            samples.append(sample_file.read())
+    return '\n'.join(samples)
+
+
+def make_database(size):
+    """Return a string of at least ``size`` characters of BibTeX data."""
+    sample = read_sample()
+    parts = []
+    length = 0
+    copy = 0
+    while length < size:
+        part = entry_key_re.sub(r'\g<1>\g<2>-{0}'.format(copy), sample)
+        parts.append(part)
+        length += len(part)
+        copy += 1
+    return ''.join(parts)
+
+
+def benchmark(text, repeat=3):
+    best = None
+    for _ in range(repeat):
+        parser = Parser()
+        start = time.perf_counter()
+        with errors.capture():
+            parser.parse_string(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(parser.data.entries)
+
+
+def main(sizes):
+    for megabytes in sizes:
+        text = make_database(int(megabytes * 1024 * 1024))
+        elapsed, num_entries = benchmark(text)
+        print('{0:6.1f} MB, {1:7d} entries: {2:7.3f} s, {3:6.2f} MB/s'.format(
+            len(text) / 1024.0 / 1024.0, num_entries, elapsed, len(text) / 1024.0 / 1024.0 / elapsed,
+        ))
+
+
+if __name__ == '__main__':
+    main([float(arg) for arg in sys.argv[1:]] or [1, 4])
@@ -0,0 +1,339 @@
+# Copyright (c) 2006-2021  Andrey Golovizin
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Run the Pybtex benchmark suite.
+
+Each benchmark is run on synthetic databases of the given sizes
+(see ``benchmarks/corpus.py``). The suite measures:
+
+- ``parse/FORMAT``: :py:func:`pybtex.database.parse_file` for BibTeX, YAML and BibTeXML,
+- ``format/STYLE/BACKEND``: :py:meth:`.PybtexEngine.format_from_files`
+  with Pythonic styles,
+- ``parallel/STYLE/N``: the same with ``N`` worker processes,
+- ``bibtex/STYLE``: :py:meth:`.BibTeXEngine.format_from_files` with the ``.bst``
+  styles from ``tests/data``,
+- ``write/FORMAT``: :py:meth:`.BibliographyData.to_file`.
+
+For each benchmark, the best time of several runs, the throughput in entries
+per second and the peak memory usage are reported. The results can be saved
+to a JSON file and compared with a previously saved baseline::
+
+    python benchmarks/run.py --sizes 1000 10000 --output baseline.json
+    # ... change something ...
+    python benchmarks/run.py --sizes 1000 10000 --baseline baseline.json
+
+Use ``--filter`` to run only some of the benchmarks::
+
+    python benchmarks/run.py --filter 'parse/*' --sizes 1000000
+
+To see how parallel formatting scales with the number of CPU cores::
+
+    python benchmarks/run.py --filter 'format/unsrt/latex' --filter 'parallel/*' --sizes 100000
+"""
+
+from __future__ import print_function, unicode_literals
+
+import argparse
+import datetime
+import fnmatch
+import gc
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pybtex  # noqa
+import pybtex.io  # noqa
+from pybtex import errors  # noqa
+from pybtex.database import parse_file  # noqa
+
+from corpus import write_corpus  # noqa
+
+DATA_DIR = os.path.join(ROOT, 'tests', 'data')
+BIB_FORMATS = [('bibtex', '.bib'), ('yaml', '.yaml'), ('bibtexml', '.xml')]
+PYTHON_STYLES = ['unsrt', 'alpha']
+BACKENDS = ['latex', 'html', 'markdown', 'plaintext']
+PARALLEL_WORKERS = [2, 4, 8, 16]
+BST_STYLES = sorted(
+    os.path.splitext(filename)[0]
+    for filename in os.listdir(DATA_DIR) if filename.endswith('.bst')
+)
+DEFAULT_SIZES = [1000, 10000]
+
+benchmarks = []
+
+
+def benchmark(name):
+    def decorator(f):
+        benchmarks.append((name, f))
+        return f
+    return decorator
+
+
+class Workspace(object):
+    """Synthetic databases of a given size in a temporary directory."""
+
+    def __init__(self, directory, size, seed):
+        self.directory = directory
+        self.size = size
+        self.seed = seed
+        self._files = {}
+        self._bib_data = None
+
+    def path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def get_database_file(self, bib_format):
+        if bib_format not in self._files:
+            suffix = dict(BIB_FORMATS)[bib_format]
+            filename = self.path('corpus' + suffix)
+            if bib_format == 'bibtex':
+                write_corpus(filename, self.size, self.seed)
+            else:
+                self.get_bib_data().to_file(filename, bib_format=bib_format)
+            self._files[bib_format] = filename
+        return self._files[bib_format]
+
+    def get_bib_data(self):
+        if self._bib_data is None:
+            self._bib_data = parse_file(self.get_database_file('bibtex'))
+        return self._bib_data
+
+
+def make_parse_benchmark(bib_format):
+    def run(workspace):
+        filename = workspace.get_database_file(bib_format)
+        return lambda: parse_file(filename, bib_format=bib_format)
+    return run
+
+
+def make_format_benchmark(style, backend, workers=None):
+    def run(workspace):
+        filename = workspace.get_database_file('bibtex')
+        output_filename = workspace.path('output')
+        return lambda: pybtex.PybtexEngine().format_from_files(
+            [filename], style, output_backend=backend, output_filename=output_filename, workers=workers,
+        )
+    return run
+
+
+def make_bibtex_benchmark(style):
+    def run(workspace):
+        from pybtex.bibtex import BibTeXEngine
+
+        filename = workspace.get_database_file('bibtex')
+        output_filename = workspace.path('output.bbl')
+        return lambda: BibTeXEngine().format_from_files(
+            [filename], os.path.join(DATA_DIR, style), output_filename=output_filename,
+        )
+    return run
+
+
+def make_write_benchmark(bib_format):
+    def run(workspace):
+        bib_data = workspace.get_bib_data()
+        output_filename = workspace.path('output' + dict(BIB_FORMATS)[bib_format])
+        return lambda: bib_data.to_file(output_filename, bib_format=bib_format)
+    return run
+
+
+for bib_format, suffix in BIB_FORMATS:
+    benchmark('parse/' + bib_format)(make_parse_benchmark(bib_format))
+for style in PYTHON_STYLES:
+    for backend in BACKENDS:
+        benchmark('format/{0}/{1}'.format(style, backend))(make_format_benchmark(style, backend))
+for workers in PARALLEL_WORKERS:
+    benchmark('parallel/unsrt/{0}'.format(workers))(make_format_benchmark('unsrt', 'latex', workers))
+for style in BST_STYLES:
+    benchmark('bibtex/' + style)(make_bibtex_benchmark(style))
+for bib_format, suffix in BIB_FORMATS:
+    benchmark('write/' + bib_format)(make_write_benchmark(bib_format))
+
+
+class quiet(object):
+    """Silence the messages that .bst styles print to the terminal."""
+
+    def __enter__(self):
+        self.stdout = pybtex.io.stdout
+        pybtex.io.stdout = io.StringIO()
+
+    def __exit__(self, type_, value, traceback):
+        pybtex.io.stdout = self.stdout
+
+
+def measure_time(function, repeat):
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure_memory(function):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmarks(names, sizes, seed=0, repeat=3, memory=True, verbose=True):
+    results = []
+    for size in sizes:
+        directory = tempfile.mkdtemp(prefix='pybtex-benchmark-')
+        try:
+            workspace = Workspace(directory, size, seed)
+            for name, setup in benchmarks:
+                if name not in names:
+                    continue
+                function = setup(workspace)
+                with errors.capture(), quiet():
+                    seconds = measure_time(function, repeat)
+                    peak_memory = measure_memory(function) if memory else None
+                result = {
+                    'name': name,
+                    'size': size,
+                    'seconds': seconds,
+                    'entries_per_second': size / seconds,
+                    'peak_memory': peak_memory,
+                }
+                results.append(result)
+                if verbose:
+                    print(format_result(result))
+                    sys.stdout.flush()
+        finally:
+            shutil.rmtree(directory)
+    return results
+
+
+def format_memory(size):
+    if size is None:
+        return '-'
+    return '{0:.1f} MB'.format(size / 1024.0 / 1024.0)
+
+
+def format_result(result):
+    return '{name:28} {size:8d} entries {seconds:9.3f} s {entries_per_second:10.0f} entries/s {memory:>10}'.format(
+        memory=format_memory(result['peak_memory']), **result
+    )
+
+
+def get_metadata(seed, repeat):
+    return {
+        'pybtex_version': pybtex.__version__,
+        'python_version': platform.python_version(),
+        'python_implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'date': datetime.datetime.now().isoformat(),
+        'seed': seed,
+        'repeat': repeat,
+    }
+
+
+def compare_results(results, baseline, tolerance):
+    """Print the results next to the baseline and return the number of regressions."""
+
+    baseline_results = {
+        (result['name'], result['size']): result for result in baseline['results']
+    }
+    regressions = 0
+    print()
+    print('{0:28} {1:>8} {2:>10} {3:>10} {4:>8}'.format('benchmark', 'entries', 'baseline', 'current', 'ratio'))
+    for result in results:
+        old_result = baseline_results.get((result['name'], result['size']))
+        if old_result is None:
+            continue
+        ratio = result['seconds'] / old_result['seconds']
+        if ratio > 1 + tolerance:
+            status = 'slower'
+            regressions += 1
+        elif ratio < 1 - tolerance:
+            status = 'faster'
+        else:
+            status = ''
+        print('{0:28} {1:8d} {2:9.3f}s {3:9.3f}s {4:7.2f}x {5}'.format(
+            result['name'], result['size'], old_result['seconds'], result['seconds'], ratio, status,
+        ))
+    return regressions
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description='Run Pybtex benchmarks.')
+    arg_parser.add_argument(
+        '--sizes', type=int, nargs='+', default=DEFAULT_SIZES, metavar='N',
+        help='numbers of entries in the test databases (default: %(default)s)',
+    )
+    arg_parser.add_argument(
+        '--filter', action='append', metavar='PATTERN',
+        help='run only the benchmarks matching the pattern (like "parse/*")',
+    )
+    arg_parser.add_argument('--list', action='store_true', help='list the benchmarks and exit')
+    arg_parser.add_argument('--seed', type=int, default=0, help='seed for the database generator')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='run each benchmark this many times')
+    arg_parser.add_argument('--no-memory', action='store_false', dest='memory', help='do not measure memory usage')
+    arg_parser.add_argument('--output', metavar='FILE', help='save the results to a JSON file')
+    arg_parser.add_argument('--baseline', metavar='FILE', help='compare the results with a JSON file')
+    arg_parser.add_argument(
+        '--tolerance', type=float, default=0.1,
+        help='report benchmarks that got slower by more than this fraction (default: %(default)s)',
+    )
+    args = arg_parser.parse_args(argv)
+
+    names = [
+        name for name, setup in benchmarks
+        if not args.filter or any(fnmatch.fnmatch(name, pattern) for pattern in args.filter)
+    ]
+    if args.list:
+        for name in names:
+            print(name)
+        return 0
+
+    results = run_benchmarks(names, args.sizes, seed=args.seed, repeat=args.repeat, memory=args.memory)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump({
+                'metadata': get_metadata(args.seed, args.repeat),
+                'results': results,
+            }, output_file, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        if compare_results(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -121,6 +121,11 @@ class PybtexEngine(Engine):
         min_crossrefs=2,
         output_filename=None,
         add_output_suffix=False,
+        use_index=False,
+        use_cache=False,
+        cache_dir=None,
+        workers=None,
+        entry_cache=None,
         **kwargs
     ):
         """
@@ -142,26 +147,51 @@ class PybtexEngine(Engine):
             string. Else, the result will be written to the specified file.
         :param add_output_suffix: Append default suffix to the output file
             name (``.bbl`` for LaTeX, ``.html`` for HTML, etc.).
+        :param use_index: Read only the cited entries from ``.bib`` files
+            using a sidecar index file (see :py:class:`.BibTeXIndex`).
+        :param use_cache: Cache parsed ``.bib`` files and formatted entries on disk.
+        :param cache_dir: Cache directory. If not specified, a directory
+            in the user cache directory is used. Implies ``use_cache``.
+        :param workers: Format the entries in this many worker processes.
+        :param entry_cache: A :py:class:`.FormattedEntryCache` to use instead
+            of the default one in the cache directory.
         """
 
         from pybtex.plugin import find_plugin
 
-        bib_parser = find_plugin('pybtex.database.input', bib_format)
-        bib_data = bib_parser(
-            encoding=bib_encoding,
-            wanted_entries=citations,
-            min_crossrefs=min_crossrefs,
-        ).parse_files(bib_files_or_filenames)
-
         style_cls = find_plugin('pybtex.style.formatting', style)
         style = style_cls(
             label_style=kwargs.get('label_style'),
             name_style=kwargs.get('name_style'),
             sorting_style=kwargs.get('sorting_style'),
             abbreviate_names=kwargs.get('abbreviate_names'),
+            max_names=kwargs.get('max_names'),
             min_crossrefs=min_crossrefs,
         )
-        formatted_bibliography = style.format_bibliography(bib_data, citations)
+
+        bib_parser = find_plugin('pybtex.database.input', bib_format)
+        bib_data = bib_parser(
+            encoding=bib_encoding,
+            wanted_entries=citations,
+            wanted_fields=style.get_fields(),
+            min_crossrefs=min_crossrefs,
+            use_index=use_index,
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+        ).parse_files(bib_files_or_filenames)
+
+        own_entry_cache = entry_cache is None and (use_cache or cache_dir)
+        if own_entry_cache:
+            from pybtex.cache import get_default_cache_dir
+            from pybtex.style.cache import FormattedEntryCache
+            entry_cache = FormattedEntryCache.from_directory(cache_dir or get_default_cache_dir())
+        try:
+            formatted_bibliography = style.format_bibliography(
+                bib_data, citations, workers=workers, entry_cache=entry_cache,
+            )
+        finally:
+            if own_entry_cache:
+                entry_cache.close()
 
         output_backend = find_plugin('pybtex.backends', output_backend)
         if add_output_suffix:
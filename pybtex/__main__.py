@@ -54,6 +54,13 @@ It is also possible to define bibliography formatting styles in Python.
                 help='ignored for compatibility with BibTeX',
             ),
             standard_option('min_crossrefs'),
+            standard_option('use_index'),
+            standard_option('use_cache'),
+            standard_option('no_cache'),
+            standard_option('cache_dir'),
+            standard_option('clear_cache'),
+            standard_option('workers'),
+            standard_option('profile_bst'),
             standard_option('bib_format'),
             standard_option('output_backend'),
             standard_option('style'),
@@ -68,6 +75,7 @@ It is also possible to define bibliography formatting styles in Python.
             standard_option('name_style'),
             standard_option('sorting_style'),
             standard_option('abbreviate_names'),
+            standard_option('max_names'),
         )),
         ('Encoding options', (
             standard_option('encoding'),
@@ -96,6 +104,7 @@ It is also possible to define bibliography formatting styles in Python.
             'name_style': 'name styles',
             'sorting_style': 'sorting styles',
             'abbreviate_names': 'abbreviated names',
+            'max_names': 'name list limits',
         }
         if style_language != 'python':
             for option, what_is_not_supported in not_supported_by_bibtex.items():
@@ -104,6 +113,20 @@ It is also possible to define bibliography formatting styles in Python.
                         '%s are only supported by the Pythonic style engine (-l python)' % what_is_not_supported
                     )
 
+        profile_bst = options.pop('profile_bst')
+        if profile_bst:
+            if style_language != 'bibtex':
+                self.opt_parser.error('--profile-bst is only supported by the BibTeX style engine')
+            from pybtex.bibtex.profiler import Profiler
+            options['profiler'] = Profiler()
+
+        if options.pop('clear_cache'):
+            from pybtex.cache import clear_cache
+            clear_cache(options['cache_dir'])
+        if options.pop('no_cache'):
+            options['use_cache'] = False
+            options['cache_dir'] = None
+
         for encoding_option in 'bib_encoding', 'bst_encoding', 'output_encoding':
             if not options[encoding_option]:
                 options[encoding_option] = encoding
@@ -112,6 +135,8 @@ It is also possible to define bibliography formatting styles in Python.
         if ext != '.aux':
             filename = path.extsep.join([filename, 'aux'])
         engine.make_bibliography(filename, **options)
+        if profile_bst:
+            options['profiler'].write_report(profile_bst)
 
 main = PybtexCommandLine()
 
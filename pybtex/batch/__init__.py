@@ -0,0 +1,181 @@
+# Copyright (c) 2006-2021  Andrey Golovizin
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Produce bibliographies for many LaTeX documents at once.
+
+Documents that use the same ``.bst`` styles and ``.bib`` databases are
+processed faster together than with a separate :command:`pybtex` run for
+each document: every style and database is parsed only once, and the
+documents are formatted in a pool of worker processes.
+"""
+
+from __future__ import unicode_literals
+
+import traceback
+from os import path
+
+from pybtex import errors
+from pybtex.exceptions import PybtexError
+
+
+class DocumentResult(object):
+    """The outcome of processing a single ``.aux`` file.
+
+    :py:attr:`warnings` is a list of formatted warning messages.
+    :py:attr:`error` is the formatted message of the error that stopped
+    processing the document, or ``None`` if the ``.bbl`` file was written.
+    """
+
+    def __init__(self, aux_filename, warnings=(), error=None):
+        self.aux_filename = aux_filename
+        self.warnings = list(warnings)
+        self.error = error
+
+    def __repr__(self):
+        return '{0}({1!r}, {2!r}, {3!r})'.format(
+            type(self).__name__, self.aux_filename, self.warnings, self.error,
+        )
+
+
+def make_bibliographies(engine, aux_filenames, workers=None, **kwargs):
+    """Produce a formatted bibliography for each of the given ``.aux`` files.
+
+    Each ``.bbl`` file is written next to its ``.aux`` file, as with
+    :py:meth:`.Engine.make_bibliography`. The keyword arguments are passed
+    to :py:meth:`.BibTeXEngine.format_from_files`.
+
+    Parsed ``.bst`` styles and ``.bib`` files are kept in memory and reused
+    by all documents. With ``workers``, every style and database is parsed
+    before the documents are formatted in that many worker processes.
+    The workers are forked, so that they inherit the parsed data.
+
+    An error in one document does not stop processing the others.
+    Return a list of :py:class:`DocumentResult` objects in the same order
+    as ``aux_filenames``.
+    """
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    global _batch
+
+    kwargs['memory_cache'] = True
+    context = None
+    if workers and workers > 1 and len(aux_filenames) > 1:
+        try:
+            context = multiprocessing.get_context('fork')
+        except ValueError:
+            pass
+    if context is None:
+        return [_make_bibliography(engine, aux_filename, kwargs) for aux_filename in aux_filenames]
+
+    _load_styles_and_databases(aux_filenames, **kwargs)
+    _batch = engine, kwargs
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            return list(executor.map(_make_bibliography_in_worker, aux_filenames))
+    finally:
+        _batch = None
+
+
+# the engine and the options, inherited by the worker processes
+_batch = None
+
+
+def _make_bibliography_in_worker(aux_filename):
+    engine, kwargs = _batch
+    return _make_bibliography(engine, aux_filename, kwargs)
+
+
+def _make_bibliography(engine, aux_filename, kwargs):
+    warnings = []
+    try:
+        if errors.strict:
+            engine.make_bibliography(aux_filename, **kwargs)
+        else:
+            with errors.capture() as warnings:
+                engine.make_bibliography(aux_filename, **kwargs)
+    except PybtexError as error:
+        return DocumentResult(aux_filename, _format_warnings(warnings), errors.format_error(error))
+    except Exception:
+        return DocumentResult(aux_filename, _format_warnings(warnings), traceback.format_exc().rstrip())
+    return DocumentResult(aux_filename, _format_warnings(warnings))
+
+
+def _format_warnings(warnings):
+    return [errors.format_error(warning, 'WARNING: ') for warning in warnings]
+
+
+def _get_macros(bst_script):
+    """Return the macros defined by the style before reading the database."""
+
+    macros = {}
+    for command in bst_script:
+        name = command[0].upper()
+        if name == 'READ':
+            break
+        if name == 'MACRO':
+            macros[command[1][0].value()] = command[2][0].value()
+    return macros
+
+
+def _load_styles_and_databases(
+    aux_filenames, output_encoding=None, bib_format=None, bib_encoding=None, bst_encoding=None,
+    use_cache=False, cache_dir=None, **kwargs
+):
+    """Parse the styles and the databases used by the documents.
+
+    Parsed files are kept in memory by :py:func:`pybtex.bibtex.bst.parse_file`
+    and :py:meth:`.bibtex.Parser.parse_cached`.
+    Nothing is reported here: the errors are reported for each document
+    when it is processed.
+    """
+
+    from pybtex import auxfile
+    from pybtex.bibtex import bst
+    from pybtex.database.input.bibtex import Parser
+
+    if bib_format is None:
+        bib_format = Parser
+    if not issubclass(bib_format, Parser):
+        return
+    loaded = set()
+    with errors.capture():
+        for aux_filename in aux_filenames:
+            try:
+                aux_data = auxfile.parse_file(aux_filename, output_encoding)
+                bst_filename = aux_data.style + path.extsep + 'bst'
+                bst_script = bst.parse_file(bst_filename, bst_encoding, use_cache=use_cache, cache_dir=cache_dir)
+                if not isinstance(bst_script, list):
+                    # the style has errors
+                    continue
+                macros = _get_macros(bst_script)
+                bib_filenames = [filename + bib_format.default_suffix for filename in aux_data.data]
+                key = tuple(bib_filenames), tuple(sorted(macros.items()))
+                if key in loaded:
+                    continue
+                loaded.add(key)
+                parser = bib_format(
+                    encoding=bib_encoding, macros=macros, person_fields=[], wanted_entries=[],
+                    use_cache=use_cache, cache_dir=cache_dir, memory_cache=True,
+                )
+                parser.parse_files(bib_filenames)
+            except PybtexError:
+                pass
@@ -0,0 +1,106 @@
+# Copyright (c) 2006-2021  Andrey Golovizin
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import print_function, unicode_literals
+
+from os import path
+
+from pybtex.cmdline import CommandLine, make_option, standard_option
+
+
+class PybtexBatchCommandLine(CommandLine):
+    prog = 'pybtex-batch'
+    args = '[options] auxfile.aux [auxfile.aux ...]'
+    description = 'produce bibliographies for many LaTeX documents at once'
+    long_description = """
+
+pybtex-batch reads several LaTeX .aux files and writes a .bbl file for each of
+them, like running pybtex for each file. BibTeX .bst styles and .bib files
+shared by the documents are parsed only once, and the documents can be
+processed in several worker processes. An error in one document does not stop
+processing the others.
+
+    """.strip()
+    num_args = None
+
+    options = (
+        (None, (
+            standard_option('strict'),
+            standard_option('min_crossrefs'),
+            standard_option('use_index'),
+            standard_option('use_cache'),
+            standard_option('no_cache'),
+            standard_option('cache_dir'),
+            make_option(
+                '-j', '--workers', type='int', dest='workers',
+                help='process N documents at once',
+                metavar='N',
+            ),
+            standard_option('bib_format'),
+        )),
+        ('Encoding options', (
+            standard_option('encoding'),
+            make_option('--bibtex-encoding', dest='bib_encoding', metavar='ENCODING'),
+            make_option('--bst-encoding', dest='bst_encoding', metavar='ENCODING'),
+            standard_option('output_encoding'),
+        )),
+    )
+    option_defaults = {
+        'min_crossrefs': 2,
+    }
+
+    def run(self, *filenames, **options):
+        import pybtex.io
+        from pybtex import errors
+        from pybtex.bibtex import make_bibliographies
+
+        encoding = options.pop('encoding')
+        for encoding_option in 'bib_encoding', 'bst_encoding', 'output_encoding':
+            if not options[encoding_option]:
+                options[encoding_option] = encoding
+        if options.pop('no_cache'):
+            options['use_cache'] = False
+            options['cache_dir'] = None
+
+        aux_filenames = [
+            filename if path.splitext(filename)[1] == '.aux' else path.extsep.join([filename, 'aux'])
+            for filename in filenames
+        ]
+        results = make_bibliographies(aux_filenames, **options)
+
+        failed = 0
+        for result in results:
+            messages = result.warnings + ([result.error] if result.error else [])
+            for message in messages:
+                for line in message.splitlines():
+                    print('{0}: {1}'.format(result.aux_filename, line), file=pybtex.io.stderr)
+            if result.error:
+                failed += 1
+            elif result.warnings:
+                errors.error_code = 2
+        if failed:
+            print('{0} of {1} documents failed'.format(failed, len(results)), file=pybtex.io.stderr)
+            errors.error_code = 1
+
+main = PybtexBatchCommandLine()
+
+if __name__ == '__main__':
+    main()
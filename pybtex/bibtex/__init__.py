@@ -48,6 +48,12 @@ class BibTeXEngine(Engine):
         min_crossrefs=2,
         output_filename=None,
         add_output_suffix=False,
+        use_index=False,
+        use_cache=False,
+        cache_dir=None,
+        memory_cache=False,
+        workers=None,
+        profiler=None,
         **kwargs
     ):
         """
@@ -65,11 +71,22 @@ class BibTeXEngine(Engine):
         :param min_crossrefs: Include cross-referenced entries after this many
             crossrefs. See BibTeX manual for details.
         :param output_filename: If ``None``, the result will be returned as a
-            string. Else, the result will be written to the specified file.
+            string. Else, the result will be written to the specified file
+            line by line, without keeping the whole bibliography in memory.
         :param add_output_suffix: Append a ``.bbl`` suffix to the output file name.
+        :param use_index: Read only the cited entries from ``.bib`` files
+            using a sidecar index file (see :py:class:`.BibTeXIndex`).
+        :param use_cache: Cache parsed ``.bib`` and ``.bst`` files on disk.
+        :param cache_dir: Cache directory. If not specified, a directory
+            in the user cache directory is used. Implies ``use_cache``.
+        :param memory_cache: Keep parsed ``.bib`` files in memory to reuse them
+            in the following calls.
+        :param workers: Number of worker processes for ``ITERATE`` and ``REVERSE``
+            commands that change only entry variables.
+        :param profiler: A :py:class:`.Profiler` to record the time spent
+            in the style functions.
         """
 
-        from io import StringIO
         import pybtex.io
         from pybtex.bibtex import bst
         from pybtex.bibtex.interpreter import Interpreter
@@ -77,20 +94,33 @@ class BibTeXEngine(Engine):
         if bib_format is None:
             from pybtex.database.input.bibtex import Parser as bib_format
         bst_filename = style + path.extsep + 'bst'
-        bst_script = bst.parse_file(bst_filename, bst_encoding)
-        interpreter = Interpreter(bib_format, bib_encoding)
-        bbl_data = interpreter.run(bst_script, citations, bib_files_or_filenames, min_crossrefs=min_crossrefs)
+        bst_script = bst.parse_file(bst_filename, bst_encoding, use_cache=use_cache, cache_dir=cache_dir)
+        interpreter = Interpreter(
+            bib_format, bib_encoding,
+            workers=workers, profiler=profiler,
+            use_index=use_index, use_cache=use_cache, cache_dir=cache_dir, memory_cache=memory_cache,
+        )
 
         if add_output_suffix:
             output_filename = output_filename + '.bbl'
-        if output_filename:
-            output_file = pybtex.io.open_unicode(output_filename, 'w', encoding=output_encoding)
-        else:
-            output_file = StringIO()
-        with output_file:
-            output_file.write(bbl_data)
-            if isinstance(output_file, StringIO):
-                return output_file.getvalue()
+        if not output_filename:
+            return interpreter.run(bst_script, citations, bib_files_or_filenames, min_crossrefs=min_crossrefs)
+        # write the lines as soon as they are formatted
+        with pybtex.io.open_unicode(output_filename, 'w', encoding=output_encoding) as output_file:
+            interpreter.run(
+                bst_script, citations, bib_files_or_filenames, min_crossrefs=min_crossrefs, output=output_file,
+            )
+
+
+    def make_bibliographies(self, aux_filenames, workers=None, **kwargs):
+        """
+        Produce a formatted bibliography for each of the given ``.aux`` files.
+
+        See :py:func:`pybtex.batch.make_bibliographies`.
+        """
+
+        from pybtex.batch import make_bibliographies
+        return make_bibliographies(self, aux_filenames, workers=workers, **kwargs)
 
 
 def make_bibliography(*args, **kwargs):
@@ -98,6 +128,11 @@ def make_bibliography(*args, **kwargs):
     return BibTeXEngine().make_bibliography(*args, **kwargs)
 
 
+def make_bibliographies(*args, **kwargs):
+    """A convenience function that calls :py:meth:`.BibTeXEngine.make_bibliographies`."""
+    return BibTeXEngine().make_bibliographies(*args, **kwargs)
+
+
 def format_from_file(*args, **kwargs):
     """A convenience function that calls :py:meth:`.BibTeXEngine.format_from_file`."""
     return BibTeXEngine().format_from_file(*args, **kwargs)
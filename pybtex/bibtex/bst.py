@@ -21,9 +21,14 @@
 
 from __future__ import unicode_literals
 
+import codecs
+import hashlib
+import io
+import os
 import re
 
 import pybtex.io
+from pybtex.cache import LRUCache
 from pybtex.bibtex.interpreter import (
     FunctionLiteral, Identifier, Integer, QuotedVar, String
 )
@@ -149,7 +154,69 @@ class BstParser(Scanner):
             yield list(self.parse_group())
 
 
-def parse_file(filename, encoding=None):
+# parsed styles, for programs that format many bibliographies
+parsed_styles = LRUCache(max_items=32)
+
+
+def parse_file(filename, encoding=None, use_cache=False, cache_dir=None):
+    """Parse a .bst file and return a list of BST commands.
+
+    Parsed styles are kept in memory and reused as long as the file does not change.
+    With ``use_cache=True``, they are also saved in the cache directory
+    (see :py:mod:`pybtex.cache`) to be reused by later runs.
+    """
+
+    path = pybtex.io.find_file(filename) if isinstance(filename, str) else None
+    if path is None:
+        # report the error as usual
+        return _parse_file(filename, encoding)
+
+    from pybtex import __version__
+    from pybtex.cache import DirectoryCache, get_default_cache_dir
+
+    if encoding is None:
+        encoding = pybtex.io.get_default_encoding()
+    with open(path, 'rb') as bst_file:
+        stat = os.fstat(bst_file.fileno())
+        data = bst_file.read()
+    key = (
+        __version__,
+        os.path.abspath(path),
+        stat.st_size,
+        stat.st_mtime_ns,
+        hashlib.sha1(data).hexdigest(),
+        codecs.lookup(encoding).name,
+    )
+    try:
+        return parsed_styles[key]
+    except KeyError:
+        pass
+
+    disk_cache = None
+    if use_cache or cache_dir:
+        disk_cache = DirectoryCache(os.path.join(cache_dir or get_default_cache_dir(), 'bst'))
+        try:
+            commands = disk_cache[key]
+        except KeyError:
+            commands = None
+    else:
+        commands = None
+
+    if commands is None:
+        try:
+            text = data.decode(encoding)
+            commands = list(parse_stream(io.StringIO(text, newline=None), filename))
+        except (UnicodeDecodeError, PybtexSyntaxError):
+            # the style is parsed and executed command by command,
+            # so the error is reported after running the preceding commands
+            return _parse_file(filename, encoding)
+        if disk_cache is not None:
+            disk_cache[key] = commands
+    parsed_styles[key] = commands
+    return commands
+
+
+def _parse_file(filename, encoding=None):
     with pybtex.io.open_unicode(filename, encoding=encoding) as bst_file:
         return parse_stream(bst_file, filename)
 
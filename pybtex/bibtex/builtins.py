@@ -27,12 +27,14 @@ from __future__ import print_function, unicode_literals
 
 from functools import update_wrapper
 
+import pybtex.errors
 import pybtex.io
 from pybtex.bibtex import utils
 from pybtex.bibtex.exceptions import BibTeXError
-from pybtex.bibtex.names import format_name as format_bibtex_name
+from pybtex.bibtex.names import compile_name_format
+from pybtex.database import Person
 from pybtex.errors import report_error
-from pybtex.utils import memoize
+from pybtex.utils import LazyList, memoize
 
 
 def print_warning(msg):
@@ -40,8 +42,9 @@ def print_warning(msg):
 
 
 class Builtin(object):
-    def __init__(self, f):
+    def __init__(self, f, name=None):
         self.f = f
+        self.name = name
     def execute(self, interpreter):
         self.f(interpreter)
     def __repr__(self):
@@ -51,7 +54,7 @@ builtins = {}
 
 def builtin(name):
     def _builtin(f):
-        b = Builtin(f)
+        b = Builtin(f, name)
         update_wrapper(b, f)
         builtins[name] = b
         return b
@@ -142,7 +145,7 @@ def change_case(i):
     if not mode_letter in ('l', 'u', 't'):
         raise BibTeXError('incorrect change.case$ mode: %s' % mode)
 
-    i.push(utils.change_case(string, mode_letter))
+    i.push(_change_case(string, mode_letter))
 
 @builtin('chr.to.int$')
 def chr_to_int(i):
@@ -173,15 +176,53 @@ def empty(i):
         i.push(1)
 
 
+# styles convert the same titles and names many times while building sort keys
+_change_case = memoize(utils.change_case)
+_purify = memoize(utils.bibtex_purify)
+
+
 @memoize
 def _split_names(names):
-    return utils.split_name_list(names)
+    # split lazily: styles often format only the first few names
+    return LazyList(utils.iter_name_list(names))
+
+
+def _get_name_parts(name):
+    """Parse the name and return its parts and the errors reported
+    while parsing it.
+    """
+
+    with pybtex.errors.capture() as errors:
+        person = Person(name)
+    parts = (
+        person.first_names, person.middle_names, person.prelast_names,
+        person.last_names, person.lineage_names,
+    )
+    return tuple(tuple(names) for names in parts), tuple(errors)
+
+
+# the same persons are formatted for sort keys, labels and the output;
+# keep enough of them to cover several passes over a large bibliography
+_parse_name = memoize(_get_name_parts, capacity=16384)
 
 
 @memoize
+def _format_parsed_name(name, format):
+    parts, errors = _parse_name(name)
+    person = Person()
+    (
+        person.first_names, person.middle_names, person.prelast_names,
+        person.last_names, person.lineage_names,
+    ) = map(list, parts)
+    return compile_name_format(format)(person)
+
+
 def _format_name(names, n, format):
     name = _split_names(names)[n - 1]
-    return format_bibtex_name(name, format)
+    # like BibTeX, warn about an invalid name every time it is formatted
+    for error in _parse_name(name)[1]:
+        report_error(error)
+    return _format_parsed_name(name, format)
 
 
 @builtin('format.name$')
@@ -230,7 +271,7 @@ def newline(i):
 @builtin('num.names$')
 def num_names(i):
     names = i.pop()
-    i.push(len(utils.split_name_list(names)))
+    i.push(len(_split_names(names)))
 
 @builtin('pop$')
 def pop(i):
@@ -243,7 +284,7 @@ def preamble(i):
 @builtin('purify$')
 def purify(i):
     s = i.pop()
-    i.push(utils.bibtex_purify(s))
+    i.push(_purify(s))
 
 @builtin('quote$')
 def quote(i):
@@ -21,11 +21,10 @@
 
 from __future__ import print_function, unicode_literals
 
-from collections import defaultdict
-
-from pybtex.bibtex.builtins import builtins, print_warning
+from pybtex.bibtex.builtins import Builtin, builtins, print_warning
 from pybtex.bibtex.exceptions import BibTeXError
 from pybtex.bibtex.utils import wrap
+from pybtex.errors import report_error
 from pybtex.utils import CaseInsensitiveDict
 
 
@@ -64,16 +63,23 @@ class Variable(object):
 
 
 class EntryVariable(Variable):
+    """A variable with a separate value for each entry.
+
+    The values are stored in a list indexed by the entry number
+    (see :py:meth:`Interpreter.allocate_entry_variables`).
+    """
+
     def __init__(self, interpreter, name):
         Variable.__init__(self)
         self.interpreter = interpreter
         self.name = name
+        self.values = []
     def set(self, value):
         if value is not None:
             self.validate(value)
-            self.interpreter.current_entry_vars[self.name] = value
+            self.values[self.interpreter.current_entry_number] = value
     def value(self):
-        return self.interpreter.current_entry_vars.get(self.name, self.default)
+        return self.values[self.interpreter.current_entry_number]
 
 
 class Integer(Variable):
@@ -153,10 +159,11 @@ class QuotedVar(Variable):
 
 
 class Function(object):
-    def __init__(self, body=None):
+    def __init__(self, body=None, name=None):
         if body is None:
             body = []
         self.body = body
+        self.name = name
 
     def __repr__(self):
         return u'{0}({1})'.format(type(self).__name__, repr(self.body))
@@ -165,9 +172,7 @@ class Function(object):
         return type(self) == type(other) and self.body == other.body
 
     def execute(self, interpreter):
-#        print 'executing function', self.body
-        for element in self.body:
-            element.execute(interpreter)
+        interpreter.compile_function(self)()
 
 
 class FunctionLiteral(Function):
@@ -175,19 +180,328 @@ class FunctionLiteral(Function):
         interpreter.push(Function(self.body))
 
 
+class CompiledFunction(Function):
+    """A function with the body already compiled by :py:meth:`Interpreter.compile_function`."""
+
+    def __init__(self, body, code):
+        super(CompiledFunction, self).__init__(body)
+        self.code = code
+
+    def execute(self, interpreter):
+        self.code()
+
+
+class FunctionCompiler(object):
+    """Compile the body of a BibTeX function into a Python function.
+
+    Identifiers are looked up once, at compile time, and literals are stored
+    as constants. Function literals followed by ``if$`` or ``while$`` are
+    compiled into Python ``if`` and ``while`` statements instead of being
+    pushed to the stack and executed by the builtins.
+    """
+
+    # Python limits the nesting of indented and loop blocks
+    max_depth = 40
+    max_loop_depth = 15
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.namespace = {
+            'i': interpreter,
+            'push': interpreter.stack.append,
+            'pop': interpreter.pop,
+        }
+        self.lines = []
+        self.if_ = builtins['if$']
+        self.while_ = builtins['while$']
+        self.skip = builtins['skip$']
+
+    def compile(self, body):
+        self.compile_body(body, depth=1, loop_depth=0)
+        source = 'def execute():\n{0}\n'.format('\n'.join(self.lines))
+        exec(compile(source, '<BibTeX function>', 'exec'), self.namespace)
+        return self.namespace['execute']
+
+    def add_constant(self, value):
+        name = 'c{0}'.format(len(self.namespace))
+        self.namespace[name] = value
+        return name
+
+    def emit(self, depth, line, *args):
+        self.lines.append('    ' * depth + line.format(*map(self.add_constant, args)))
+
+    def lookup(self, element):
+        try:
+            return self.interpreter.vars[element.value()]
+        except KeyError:
+            return None
+
+    def get_control_builtin(self, body, index):
+        """Return if$ or while$ if it is applied to two function literals at body[index]."""
+
+        if not (
+            index + 2 < len(body)
+            and isinstance(body[index], FunctionLiteral)
+            and isinstance(body[index + 1], FunctionLiteral)
+            and isinstance(body[index + 2], Identifier)
+        ):
+            return None
+        f = self.lookup(body[index + 2])
+        if f is self.if_ or f is self.while_:
+            return f
+
+    def compile_body(self, body, depth, loop_depth):
+        start = len(self.lines)
+        index = 0
+        while index < len(body):
+            control = self.get_control_builtin(body, index)
+            if control is self.if_ and depth < self.max_depth:
+                self.emit(depth, 'if pop() > 0:')
+                self.compile_body(body[index].body, depth + 1, loop_depth)
+                self.emit(depth, 'else:')
+                self.compile_body(body[index + 1].body, depth + 1, loop_depth)
+                index += 3
+            elif control is self.while_ and depth < self.max_depth and loop_depth < self.max_loop_depth:
+                self.emit(depth, 'while True:')
+                self.compile_body(body[index].body, depth + 1, loop_depth + 1)
+                self.emit(depth + 1, 'if pop() <= 0:')
+                self.emit(depth + 2, 'break')
+                self.compile_body(body[index + 1].body, depth + 1, loop_depth + 1)
+                index += 3
+            else:
+                self.compile_element(body[index], depth)
+                index += 1
+        if len(self.lines) == start:
+            self.emit(depth, 'pass')
+
+    def compile_element(self, element, depth):
+        if isinstance(element, FunctionLiteral):
+            code = self.interpreter.compile_function(element)
+            self.emit(depth, 'push({0})', CompiledFunction(element.body, code))
+        elif isinstance(element, Identifier):
+            self.compile_identifier(element, depth)
+        elif isinstance(element, QuotedVar):
+            var = self.lookup(element)
+            if var is None:
+                self.emit(depth, '{0}(i)', element.execute)
+            else:
+                self.emit(depth, 'push({0})', var)
+        elif isinstance(element, (Integer, String)):
+            self.emit(depth, 'push({0})', element.value())
+        else:
+            self.emit(depth, '{0}(i)', element.execute)
+
+    def compile_identifier(self, element, depth):
+        f = self.lookup(element)
+        if f is None:
+            # the function may be defined later, fail only if it is executed
+            self.emit(depth, '{0}(i)', element.execute)
+        elif f is self.skip:
+            pass
+        elif isinstance(f, Builtin):
+            if self.interpreter.profiler is not None:
+                self.emit(depth, '{0}(i)', self.interpreter.profiler.wrap(f.name, f.f, kind='builtin'))
+            else:
+                self.emit(depth, '{0}(i)', f.f)
+        elif isinstance(f, Function):
+            self.emit(depth, '{0}()', self.interpreter.compile_function(f))
+        elif type(f).execute in (Variable.execute, Field.execute):
+            self.emit(depth, 'push({0}.value())', f)
+        else:
+            self.emit(depth, '{0}(i)', f.execute)
+
+
+class SideEffectChecker(object):
+    """Check if functions change anything except the entry variables.
+
+    Such functions can be executed for different entries independently
+    (see :py:meth:`Interpreter.iterate_parallel`). The check is conservative:
+    output, undefined identifiers and assignments that cannot be analyzed
+    statically all count as side effects. Warnings are not side effects,
+    they are reported by the main process.
+
+    Styles often use global variables as temporaries. Assignments
+    to global variables are allowed, the variables are collected in
+    :py:attr:`global_variables` to be checked at run time
+    (see :py:class:`GlobalVariableTracker`).
+    """
+
+    unsafe_builtins = 'write$', 'newline$', 'top$', 'stack$'
+
+    def __init__(self, interpreter, entry_types):
+        self.interpreter = interpreter
+        self.entry_types = entry_types
+        self.unsafe = set(builtins[name] for name in self.unsafe_builtins)
+        self.assign = builtins[':=']
+        self.call_type = builtins['call.type$']
+        self.checked = set()
+        self.global_variables = {}
+
+    def lookup(self, element):
+        try:
+            return self.interpreter.vars[element.value()]
+        except KeyError:
+            return None
+
+    def has_side_effects(self, f):
+        if id(f) in self.checked:
+            # already checked, or a recursive call being checked now
+            return False
+        self.checked.add(id(f))
+        if isinstance(f, Builtin):
+            return self.builtin_has_side_effects(f)
+        elif isinstance(f, Function):
+            return self.body_has_side_effects(f.body)
+        else:
+            # variables and fields only push their values
+            return not isinstance(f, (Variable, Field))
+
+    def builtin_has_side_effects(self, f):
+        if f in self.unsafe or f is self.assign:
+            return True
+        elif f is self.call_type:
+            for entry_type in self.entry_types:
+                function = self.interpreter.vars.get(entry_type, self.interpreter.vars.get('default.type'))
+                if function is not None and self.has_side_effects(function):
+                    return True
+        return False
+
+    def body_has_side_effects(self, body):
+        index = 0
+        while index < len(body):
+            element = body[index]
+            if isinstance(element, FunctionLiteral):
+                if self.body_has_side_effects(element.body):
+                    return True
+            elif isinstance(element, QuotedVar):
+                var = self.lookup(element)
+                if var is None:
+                    return True
+                is_assignment = (
+                    index + 1 < len(body)
+                    and isinstance(body[index + 1], Identifier)
+                    and self.lookup(body[index + 1]) is self.assign
+                )
+                if is_assignment:
+                    if isinstance(var, (Integer, String)) and not isinstance(var, EntryVariable):
+                        self.global_variables[element.value().lower()] = var
+                    elif not isinstance(var, EntryVariable):
+                        return True
+                    index += 1
+                elif self.has_side_effects(var):
+                    # the function may be executed by if$ or while$
+                    return True
+            elif isinstance(element, Identifier):
+                f = self.lookup(element)
+                if f is None or self.has_side_effects(f):
+                    return True
+            index += 1
+        return False
+
+
+class GlobalVariableTracker(object):
+    """Find out if an entry depends on the global variables set for the previous entries.
+
+    This is the case if the entry reads a variable before setting it.
+    While the tracker is active, the ``value`` and ``set`` methods of the
+    tracked variables are replaced.
+    """
+
+    def __init__(self, variables):
+        self.variables = variables
+        self.assigned = set()
+        self.changed = set()
+        self.depends_on_previous_entry = False
+
+    def __enter__(self):
+        for name, var in self.variables.items():
+            self.track(name, var)
+        return self
+
+    def __exit__(self, type_, value, traceback):
+        for var in self.variables.values():
+            del var.value
+            del var.set
+
+    def track(self, name, var):
+        value = var.value
+        set_value = var.set
+
+        def tracked_value():
+            if name not in self.assigned:
+                self.depends_on_previous_entry = True
+            return value()
+
+        def tracked_set(new_value):
+            set_value(new_value)
+            self.assigned.add(name)
+            self.changed.add(name)
+
+        var.value = tracked_value
+        var.set = tracked_set
+
+    def start_entry(self):
+        self.assigned = set()
+        self.depends_on_previous_entry = False
+
+    def get_changed_values(self):
+        return dict((name, self.variables[name]._value) for name in self.changed)
+
+
+def _iterate_chunk(citations):
+    """Run the function for the citations in a worker process.
+
+    Return a list of new entry variable values and reported errors for each
+    citation and the changed global variables, or ``None`` if the function
+    has to be executed serially.
+    """
+
+    import pybtex.errors
+
+    interpreter, f, global_variables = _parallel_iterate
+    results = []
+    with pybtex.errors.capture() as captured_errors, GlobalVariableTracker(global_variables) as tracker:
+        try:
+            for entry_number in citations:
+                tracker.start_entry()
+                interpreter.execute_for_entry(f, entry_number)
+                if interpreter.stack or tracker.depends_on_previous_entry:
+                    return None
+                entry_values = [var.values[entry_number] for var in interpreter.entry_variables]
+                results.append((entry_values, list(captured_errors)))
+                del captured_errors[:]
+        except Exception:
+            return None
+        return results, tracker.get_changed_values()
+
+
+# the interpreter, the function and its global variables for the forked worker processes
+_parallel_iterate = None
+
+
 class Interpreter(object):
-    def __init__(self, bib_format, bib_encoding):
+    # do not start worker processes for less entries per process
+    min_chunk_size = 250
+
+    def __init__(self, bib_format, bib_encoding, workers=None, profiler=None, **bib_options):
         self.bib_format = bib_format
         self.bib_encoding = bib_encoding
+        self.bib_options = bib_options
+        self.workers = workers
+        self.profiler = profiler
         self.stack = []
+        self.compiled_functions = {}
+        self.entry_keys = []
+        self.entry_fields = None
+        self.entry_variables = []
         self.vars = CaseInsensitiveDict(builtins)
         self.add_variable('global.max$', Integer(20000))  # constants taken from
         self.add_variable('entry.max$', Integer(250))     # BibTeX 0.99d (TeX Live 2012)
-        self.add_variable('sort.key$', EntryString(self, 'sort.key$'))
+        self.add_entry_variable('sort.key$', EntryString(self, 'sort.key$'))
         self.macros = {}
         self.output_buffer = []
         self.output_lines = []
-        self.entry_vars = defaultdict(dict)
+        self.write_output = self.output_lines.append
 
     def push(self, value):
 #        print 'push <%s>' % value
@@ -208,20 +522,81 @@ class Interpreter(object):
     def add_variable(self, name, value):
         if name in self.vars:
             raise BibTeXError('variable "{0}" already declared as {1}'.format(name, type(value).__name__))
+        self.set_variable(name, value)
+
+    def add_entry_variable(self, name, variable):
+        self.add_variable(name, variable)
+        self.entry_variables.append(variable)
+        variable.values = [variable.default] * len(self.entry_keys)
+
+    def allocate_entry_variables(self):
+        """Number the cited entries and allocate the values of entry variables.
+
+        :py:attr:`citation_order` is the list of entry numbers in the
+        current citation order.
+        """
+
+        entry_numbers = {}
+        self.citation_order = [
+            entry_numbers.setdefault(key, len(entry_numbers))
+            for key in self.citations
+        ]
+        self.entry_keys = list(entry_numbers)
+        for variable in self.entry_variables:
+            variable.values = [variable.default] * len(self.entry_keys)
+
+    def set_variable(self, name, value):
         self.vars[name] = value
+        # compiled functions may refer to the old value
+        self.compiled_functions.clear()
+
+    def compile_function(self, function):
+        """Compile the function body into a Python function.
+
+        All identifiers in the body are looked up only once, at compile time.
+        Compiled functions are cached until a variable is (re)defined.
+        With a :py:attr:`profiler`, named functions record their run time.
+        """
+
+        key = id(function)
+        try:
+            return self.compiled_functions[key][1]
+        except KeyError:
+            pass
+
+        def execute_recursive():
+            return self.compiled_functions[key][1]()
+
+        # recursive calls find the function in the cache when they are executed
+        self.compiled_functions[key] = function, execute_recursive
+        execute = FunctionCompiler(self).compile(function.body)
+        if self.profiler is not None and function.name is not None:
+            execute = self.profiler.wrap(function.name, execute)
+        self.compiled_functions[key] = function, execute
+        return execute
 
     def output(self, string):
         self.output_buffer.append(string)
 
     def newline(self):
         output = wrap(u''.join(self.output_buffer))
-        self.output_lines.append(output)
-        self.output_lines.append(u'\n')
+        self.write_output(output + u'\n')
         self.output_buffer = []
 
-    def run(self, bst_script, citations, bib_files, min_crossrefs):
-        """Run bst script and return formatted bibliography."""
+    def run(self, bst_script, citations, bib_files, min_crossrefs, output=None):
+        """Run bst script and return formatted bibliography.
 
+        :param output: A text stream or a function that is called with
+            each line of the formatted bibliography. The lines are written
+            as soon as they are complete, and ``None`` is returned.
+        """
+
+        if output is None:
+            self.write_output = self.output_lines.append
+        elif hasattr(output, 'write'):
+            self.write_output = output.write
+        else:
+            self.write_output = output
         self.bst_script = iter(bst_script)
         self.citations = citations
         self.bib_files = bib_files
@@ -236,19 +611,22 @@ class Interpreter(object):
             else:
                 print('Unknown command', name)
 
-        return u''.join(self.output_lines)
+        if output is None:
+            return u''.join(self.output_lines)
 
     def command_entry(self, fields, ints, strings):
         for id in fields:
             name = id.value()
             self.add_variable(name, Field(self, name))
+        # other fields are not read from the database
+        self.entry_fields = [id.value() for id in fields]
         self.add_variable('crossref', Crossref(self))
         for id in ints:
             name = id.value()
-            self.add_variable(name, EntryInteger(self, name))
+            self.add_entry_variable(name, EntryInteger(self, name))
         for id in strings:
             name = id.value()
-            self.add_variable(name, EntryString(self, name))
+            self.add_entry_variable(name, EntryString(self, name))
 
     def command_execute(self, command_):
 #        print 'EXECUTE'
@@ -256,26 +634,102 @@ class Interpreter(object):
 
     def command_function(self, name_, body):
         name = name_[0].value()
-        self.add_variable(name, Function(body))
+        self.add_variable(name, Function(body, name))
 
     def command_integers(self, identifiers):
 #        print 'INTEGERS'
         for identifier in identifiers:
-            self.vars[identifier.value()] = Integer()
+            self.set_variable(identifier.value(), Integer())
 
     def command_iterate(self, function_group):
         function = function_group[0].value()
-        self._iterate(function, self.citations)
+        self._iterate(function, self.citation_order)
 
     def _iterate(self, function, citations):
         f = self.vars[function]
-        for key in citations:
-            self.current_entry_key = key
-            self.current_entry = self.bib_data.entries[key]
-            self.current_entry_vars = self.entry_vars[key]
-            f.execute(self)
+        citations = list(citations)
+        if self.profiler is not None:
+            # the profiler needs all functions to run in this process
+            timer = self.profiler.timer
+            for entry_number in citations:
+                start = timer()
+                self.execute_for_entry(f, entry_number)
+                self.profiler.add_entry_time(function, self.current_entry_key, timer() - start)
+        else:
+            if self.workers and self.workers > 1:
+                citations = self.iterate_parallel(f, citations)
+            for entry_number in citations:
+                self.execute_for_entry(f, entry_number)
         self.currentEntry = None
 
+    def execute_for_entry(self, f, entry_number):
+        self.current_entry_number = entry_number
+        self.current_entry_key = self.entry_keys[entry_number]
+        self.current_entry = self.bib_data.entries[self.current_entry_key]
+        f.execute(self)
+
+    def iterate_parallel(self, f, citations):
+        """Execute the function for the citations in a pool of worker processes.
+
+        This is done only if the function changes nothing but the entry
+        variables and temporary global variables (see :py:class:`SideEffectChecker`).
+        The citations are split into chunks. The first chunk is processed
+        in this process to check that the entries do not depend on each other
+        (see :py:class:`GlobalVariableTracker`), the other chunks are sent to the
+        worker processes. Then the entry variables and the global variables
+        computed by the workers are copied back, and the warnings are reported
+        in the citation order, like in a serial run. Worker processes are
+        forked, so that they inherit the state of the interpreter.
+
+        Return the list of citations that have to be processed serially.
+        """
+
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        global _parallel_iterate
+
+        num_chunks = min(self.workers * 4, len(citations) // self.min_chunk_size)
+        if num_chunks < 2 or self.stack or len(set(citations)) != len(citations):
+            return citations
+        try:
+            context = multiprocessing.get_context('fork')
+        except ValueError:
+            return citations
+        entry_types = set(self.bib_data.entries[self.entry_keys[entry_number]].type for entry_number in citations)
+        checker = SideEffectChecker(self, entry_types)
+        if checker.has_side_effects(f):
+            return citations
+
+        chunk_size = -(-len(citations) // num_chunks)
+        chunks = [citations[start:start + chunk_size] for start in range(0, len(citations), chunk_size)]
+        with GlobalVariableTracker(checker.global_variables) as tracker:
+            for index, key in enumerate(chunks[0]):
+                tracker.start_entry()
+                self.execute_for_entry(f, key)
+                if self.stack or (index > 0 and tracker.depends_on_previous_entry):
+                    return citations[index + 1:]
+
+        _parallel_iterate = self, f, checker.global_variables
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as executor:
+                results = list(executor.map(_iterate_chunk, chunks[1:]))
+        except Exception:
+            results = [None]
+        finally:
+            _parallel_iterate = None
+        if any(result is None for result in results):
+            return citations[len(chunks[0]):]
+
+        for chunk, (chunk_results, global_values) in zip(chunks[1:], results):
+            for entry_number, (entry_values, errors) in zip(chunk, chunk_results):
+                for var, value in zip(self.entry_variables, entry_values):
+                    var.values[entry_number] = value
+                for error in errors:
+                    report_error(error)
+            for name, value in global_values.items():
+                checker.global_variables[name].set(value)
+        return []
+
     def command_macro(self, name_, value_):
         name = name_[0].value()
         value = value_[0].value()
@@ -288,10 +742,13 @@ class Interpreter(object):
             macros=self.macros,
             person_fields=[],
             wanted_entries=self.citations,
+            wanted_fields=self.entry_fields,
+            **self.bib_options
         )
         self.bib_data = p.parse_files(self.bib_files)
         self.citations = self.bib_data.add_extra_citations(self.citations, self.min_crossrefs)
         self.citations = list(self.remove_missing_citations(self.citations))
+        self.allocate_entry_variables()
 #        for k, v in self.bib_data.items():
 #            print k
 #            for field, value in v.fields.items():
@@ -307,17 +764,17 @@ class Interpreter(object):
 
     def command_reverse(self, function_group):
         function = function_group[0].value()
-        self._iterate(function, reversed(self.citations))
+        self._iterate(function, reversed(self.citation_order))
 
     def command_sort(self):
-        def key(citation):
-            return self.entry_vars[citation]['sort.key$']
-        self.citations.sort(key=key)
+        sort_keys = self.vars['sort.key$'].values
+        self.citation_order.sort(key=sort_keys.__getitem__)
+        self.citations = [self.entry_keys[entry_number] for entry_number in self.citation_order]
 
     def command_strings(self, identifiers):
         #print 'STRINGS'
         for identifier in identifiers:
-            self.vars[identifier.value()] = String()
+            self.set_variable(identifier.value(), String())
 
     @staticmethod
     def is_missing_field(field):
@@ -50,6 +50,7 @@ from pybtex.database import Person
 from pybtex.scanner import (
     Literal, Pattern, PrematureEOF, PybtexSyntaxError, Scanner
 )
+from pybtex.utils import memoize
 
 
 class BibTeXNameFormatError(Exception):
@@ -69,6 +70,10 @@ class Text(object):
     def format(self, person):
         return self.text
 
+    def compile(self):
+        text = self.text
+        return lambda person: text
+
     def to_python(self):
         return repr(self.text)
 
@@ -152,6 +157,48 @@ class NamePart(object):
 
         return formatted_part + discretionary
 
+    def compile(self):
+        """Return a function that formats this part of a :py:class:`.Person`.
+
+        Everything that depends only on the format string is decided here,
+        so the returned function does the same as :py:meth:`format`
+        with less work.
+        """
+
+        if not self.format_char:
+            constant = self.format(None)
+            return lambda person: constant
+
+        names_attribute = self.types[self.format_char] + '_names'
+        pre_text = self.pre_text
+        post_text = self.post_text
+        delimiter = self.delimiter
+        abbreviate = self.abbreviate
+
+        if delimiter is not None:
+            join_names = delimiter.join
+        elif abbreviate:
+            join_names = lambda names: join(names, '.~', '. ')
+        else:
+            join_names = join
+
+        if self.tie == '~':
+            discretionary = tie_or_space
+        elif self.tie == '~~':
+            discretionary = lambda formatted_part: '~'
+        else:
+            discretionary = lambda formatted_part: ''
+
+        def format_part(person):
+            names = getattr(person, names_attribute)
+            if not names:
+                return ''
+            if abbreviate:
+                names = [bibtex_abbreviate(name, delimiter) for name in names]
+            formatted_part = pre_text + join_names(names) + post_text
+            return formatted_part + discretionary(formatted_part)
+        return format_part
+
     def to_python(self):
         from pybtex.style.names import name_part
         class NamePart(object):
@@ -228,6 +275,20 @@ class NameFormat(object):
         person = Person(name)
         return ''.join(part.format(person) for part in self.parts)
 
+    def compile(self):
+        """Return a function that formats a :py:class:`.Person`.
+
+        >>> format_person = NameFormat('{vv~}{ll}{, jj}{, f.}').compile()
+        >>> print(format_person(Person('Charles Louis Xavier Joseph de la Vallee Poussin')))
+        de~la Vallee~Poussin, C.~L. X.~J.
+        """
+
+        part_formatters = [part.compile() for part in self.parts]
+
+        def format_person(person):
+            return ''.join([format_part(person) for format_part in part_formatters])
+        return format_person
+
     def to_python(self):
         """Convert BibTeX name format to Python (inexactly)."""
         parts = ',\n'.join(' ' * 8 + part.to_python() for part in self.parts)
@@ -273,8 +334,20 @@ def join(words, tie='~', space=' '):
                 tie + words[-1])
 
 
+@memoize
+def compile_name_format(format):
+    """Parse a name format string and compile it into a function.
+
+    The compiled functions are cached, so each format string is parsed only once.
+
+    >>> compile_name_format('{ff~}{vv~}{ll}{, jj}') is compile_name_format('{ff~}{vv~}{ll}{, jj}')
+    True
+    """
+    return NameFormat(format).compile()
+
+
 def format_name(name, format):
-    return NameFormat(format).format(name)
+    return compile_name_format(format)(Person(name))
 
 
 class UnbalancedBraceError(PybtexSyntaxError):
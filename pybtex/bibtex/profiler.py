@@ -0,0 +1,178 @@
+# Copyright (c) 2006-2021  Andrey Golovizin
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Find out where the time goes when a BibTeX style runs.
+
+A :py:class:`Profiler` records the number of calls, the total time and
+the self time of every ``FUNCTION`` defined by the style and every
+built-in function, and the time spent on each entry by ``ITERATE`` and
+``REVERSE`` commands. To use it, pass it to
+:py:meth:`.BibTeXEngine.format_from_files`::
+
+    from pybtex.bibtex import format_from_files
+    from pybtex.bibtex.profiler import Profiler
+
+    profiler = Profiler()
+    format_from_files(['refs.bib'], 'plain', output_filename='refs.bbl', profiler=profiler)
+    print(profiler.format_report(limit=20))
+
+The :command:`pybtex` command has the ``--profile-bst`` option that writes
+the report to a file.
+
+If-then-else and loops in function bodies are usually compiled into Python
+code (see :py:class:`.FunctionCompiler`), so ``if$`` and ``while$`` are only
+reported when they are called with functions that are not literals.
+"""
+
+from __future__ import unicode_literals
+
+import json
+import time
+from collections import defaultdict
+
+
+class FunctionStats(object):
+    def __init__(self, name, kind):
+        self.name = name
+        self.kind = kind
+        self.calls = 0
+        self.total_time = 0.0
+        self.self_time = 0.0
+        self.active_calls = 0
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'calls': self.calls,
+            'total_time': self.total_time,
+            'self_time': self.self_time,
+        }
+
+
+class Profiler(object):
+    """Record the time spent in BibTeX functions.
+
+    The total time of a function includes the functions that it calls,
+    the self time does not. The total time of recursive functions is only
+    counted for the outermost call.
+
+    >>> ticks = iter(range(100))
+    >>> profiler = Profiler(timer=lambda: next(ticks))
+    >>> def inner():
+    ...     pass
+    >>> profiled_inner = profiler.wrap('inner', inner)
+    >>> profiled_outer = profiler.wrap('outer', lambda: profiled_inner())
+    >>> profiled_outer()
+    >>> [(stats.name, stats.calls, stats.total_time, stats.self_time) for stats in profiler.get_stats()]
+    [('outer', 1, 3.0, 2.0), ('inner', 1, 1.0, 1.0)]
+    """
+
+    def __init__(self, timer=time.perf_counter):
+        self.timer = timer
+        self.stats = {}
+        self.entry_times = defaultdict(list)
+        # the time spent in the callees of the functions being executed
+        self.callee_times = []
+
+    def wrap(self, name, function, kind='function'):
+        """Return a function that calls the given function and records the time."""
+
+        try:
+            stats = self.stats[name]
+        except KeyError:
+            stats = self.stats[name] = FunctionStats(name, kind)
+        timer = self.timer
+        callee_times = self.callee_times
+
+        def profiled_function(*args):
+            start = timer()
+            callee_times.append(0.0)
+            stats.active_calls += 1
+            try:
+                return function(*args)
+            finally:
+                elapsed = timer() - start
+                stats.active_calls -= 1
+                stats.calls += 1
+                stats.self_time += elapsed - callee_times.pop()
+                if not stats.active_calls:
+                    stats.total_time += elapsed
+                if callee_times:
+                    callee_times[-1] += elapsed
+        return profiled_function
+
+    def add_entry_time(self, function_name, key, elapsed):
+        """Record the time spent by ITERATE or REVERSE on a single entry."""
+        self.entry_times[function_name].append((key, elapsed))
+
+    def get_stats(self):
+        """Return :py:class:`FunctionStats` for all functions, sorted by self time."""
+        return sorted(self.stats.values(), key=lambda stats: (-stats.self_time, stats.name))
+
+    def get_iteration_stats(self, num_slowest=5):
+        iteration_stats = []
+        for function_name, entry_times in self.entry_times.items():
+            total_time = sum(elapsed for key, elapsed in entry_times)
+            slowest = sorted(entry_times, key=lambda key_elapsed: -key_elapsed[1])[:num_slowest]
+            iteration_stats.append({
+                'function': function_name,
+                'entries': len(entry_times),
+                'total_time': total_time,
+                'slowest_entries': [{'key': key, 'time': elapsed} for key, elapsed in slowest],
+            })
+        return iteration_stats
+
+    def to_dict(self):
+        return {
+            'functions': [stats.to_dict() for stats in self.get_stats()],
+            'iterations': self.get_iteration_stats(),
+        }
+
+    def format_report(self, limit=None):
+        """Return a table of functions, sorted by self time."""
+
+        stats = self.get_stats()
+        lines = ['{0:30} {1:8} {2:>10} {3:>10} {4:>10}'.format('function', 'kind', 'calls', 'total, s', 'self, s')]
+        for function_stats in stats[:limit]:
+            lines.append('{0.name:30} {0.kind:8} {0.calls:10d} {0.total_time:10.3f} {0.self_time:10.3f}'.format(
+                function_stats,
+            ))
+        for iteration_stats in self.get_iteration_stats():
+            lines.append('')
+            lines.append('ITERATE {{{function}}}: {entries} entries, {total_time:.3f} s'.format(**iteration_stats))
+            for entry in iteration_stats['slowest_entries']:
+                lines.append('    {key:26} {time:10.3f} s'.format(**entry))
+        return '\n'.join(lines) + '\n'
+
+    def write_report(self, filename):
+        """Write the report to a file, as JSON if the file name ends with ``.json``."""
+
+        import pybtex.io
+
+        if filename == '-':
+            pybtex.io.stdout.write(self.format_report())
+            return
+        with pybtex.io.open_unicode(filename, 'w') as report_file:
+            if filename.endswith('.json'):
+                report_file.write(json.dumps(self.to_dict(), indent=2, sort_keys=True))
+            else:
+                report_file.write(self.format_report())
@@ -28,6 +28,9 @@ from pybtex.utils import pairwise
 
 whitespace_re = re.compile(r'(\s)')
 purify_special_char_re = re.compile(r'^\\[A-Za-z]+')
+purify_space_re = re.compile(r'[\s~-]')
+purify_other_re = re.compile(r'[^\w ]|_')
+purify_non_alnum_re = re.compile(r'[\W_]')
 
 
 def wrap(string, width=79, subsequent_indent='  '):
@@ -170,16 +173,14 @@ def change_case(string, mode):
     {\TeX\ and databases\Dash\TeX DBI}
     """
 
-    def title(char, state):
-        if state == 'start':
-            return char
-        else:
-            return char.lower()
-
-    lower = lambda char, state: char.lower()
-    upper = lambda char, state: char.upper()
+    convert_text = {'l': _lower, 'u': _upper, 't': _title_case}[mode]
 
-    convert = {'l': lower, 'u': upper, 't': title}[mode]
+    def convert_word(word, state):
+        if mode == 'l' or mode == 't' and state != 'start':
+            return word.lower()
+        elif mode == 'u':
+            return word.upper()
+        return word
 
     def convert_special_char(special_char, state):
         # FIXME BibTeX treats some accented and foreign characterss specially
@@ -188,28 +189,61 @@ def change_case(string, mode):
                 if word.startswith('\\'):
                     yield word
                 else:
-                    yield convert(word, state)
+                    yield convert_word(word, state)
 
         return ' '.join(convert_words(special_char.split(' ')))
 
-    def change_case_iter(string, mode):
-        state = 'start'
-        for char, brace_level in scan_bibtex_string(string):
-            if brace_level == 0:
-                yield convert(char, state)
-                if char == ':':
-                    state = 'after colon'
-                elif char.isspace() and state == 'after colon':
-                    state = 'start'
-                else:
-                    state = 'normal'
-            else:
-                if brace_level == 1 and char.startswith('\\'):
-                    yield convert_special_char(char, state)
-                else:
-                    yield char
+    if '{' not in string:
+        return convert_text(string, 'start')[0]
+    state = 'start'
+    result = []
+    for text, kind in _split_groups(string):
+        if kind is _TEXT:
+            text, state = convert_text(text, state)
+            result.append(text)
+        elif kind is _GROUP:
+            result.append(text)
+            state = 'normal'
+        else:
+            result.append('{' + convert_special_char(text, state) + '}')
+            state = 'normal'
+    return ''.join(result)
+
+
+def _lower(text, state=None):
+    # str.lower() treats the final sigma specially, BibTeX converts each character separately
+    if '\u03a3' in text:
+        return ''.join(char.lower() for char in text), 'normal'
+    return text.lower(), 'normal'
+
+
+def _upper(text, state=None):
+    return text.upper(), 'normal'
 
-    return ''.join(change_case_iter(string, mode))
+
+def _title_case(text, state):
+    """Convert text at brace level 0 to title case.
+
+    Only the first character and the characters after a colon and a space
+    keep their case. Return the converted text and the new state.
+    """
+
+    if not text:
+        return text, state
+    if ':' not in text:
+        if state == 'start':
+            return text[0] + _lower(text[1:])[0], 'normal'
+        return _lower(text)
+    result = []
+    for char in text:
+        result.append(char if state == 'start' else _lower(char)[0])
+        if char == ':':
+            state = 'after colon'
+        elif char.isspace() and state == 'after colon':
+            state = 'start'
+        else:
+            state = 'normal'
+    return ''.join(result), state
 
 
 def bibtex_substring(string, start, length):
@@ -280,10 +314,14 @@ def bibtex_len(string):
     >>> print(bibtex_len(r'level 0 {1 {\2}}'))
     12
     """
+    if '{' not in string:
+        return len(string) - string.count('}')
     length = 0
-    for char, brace_level in scan_bibtex_string(string):
-        if char not in '{}':
+    for text, kind in _split_groups(string):
+        if kind is _SPECIAL:
             length += 1
+        else:
+            length += len(text) - text.count('{') - text.count('}')
     return length
 
 
@@ -308,15 +346,28 @@ def bibtex_width(string):
     """
 
     from pybtex.charwidths import charwidths
+    get_width = charwidths.get
+    if '{' not in string:
+        return sum([get_width(char, 0) for char in string])
     width = 0
-    for token, brace_level in scan_bibtex_string(string):
-        if brace_level == 1 and token.startswith('\\'):
-            for char in token[2:]:
-                if char not in '{}':
-                    width += charwidths.get(char, 0)
-            width -= 1000  # two braces
+    for text, kind in _split_groups(string):
+        if kind is _TEXT:
+            width += sum([get_width(char, 0) for char in text])
+        elif kind is _SPECIAL:
+            width += get_width('{', 0) + get_width('}', 0) - 1000  # two braces
+            width += sum([get_width(char, 0) for char in text[2:] if char not in '{}'])
         else:
-            width += charwidths.get(token, 0)
+            brace_level = 0
+            for char in text:
+                if char == '{':
+                    brace_level += 1
+                elif char == '}':
+                    brace_level -= 1
+                elif char == '\\' and brace_level == 1:
+                    # counted like a special character, as Pybtex always did
+                    width -= 1000
+                    continue
+                width += get_width(char, 0)
     return width
 
 
@@ -343,8 +394,12 @@ def bibtex_prefix(string, num_chars):
     ab{\cd}
 
     """
+    if '{' not in string and '}' not in string:
+        return string[:max(num_chars, 1)]
+
     def prefix():
         length = 0
+        brace_level = 0
         for char, brace_level in scan_bibtex_string(string):
             yield char
             if char not in '{}':
@@ -390,32 +445,99 @@ def bibtex_purify(string):
     """
 
     # FIXME BibTeX treats some accented and foreign characterss specially
-    def purify_iter(string):
-        for token, brace_level in scan_bibtex_string(string):
-            if brace_level == 1 and token.startswith('\\'):
-                for char in purify_special_char_re.sub('', token):
-                    if char.isalnum():
-                        yield char
-            else:
-                if token.isalnum():
-                    yield token
-                elif token.isspace() or token in '-~':
-                    yield ' '
+    if '{' not in string:
+        return _purify_text(string)
+    result = []
+    for text, kind in _split_groups(string):
+        if kind is _SPECIAL:
+            result.append(purify_non_alnum_re.sub('', purify_special_char_re.sub('', text)))
+        else:
+            result.append(_purify_text(text))
+    return ''.join(result)
+
 
-    return ''.join(purify_iter(string))
+def _purify_text(text):
+    """Replace spaces, hyphens and ties with spaces, remove other non-alphanumeric characters."""
+    return purify_other_re.sub('', purify_space_re.sub(' ', text))
 
 
 def scan_bibtex_string(string):
-    """ Yield (char, brace_level) tuples.
+    r""" Yield (char, brace_level) tuples.
 
     "Special characters", as in bibtex_len, are treated as a single character
 
+    >>> list(scan_bibtex_string(r'a{b{\c}}{\d e}}'))
+    [('a', 0), ('{', 1), ('b', 1), ('{', 2), ('\\', 2), ('c', 2), ('}', 1), ('}', 0), ('{', 1), ('\\d e', 1), ('}', 0), ('}', 0)]
+    """
+    for text, kind in _split_groups(string):
+        if kind is _TEXT:
+            for char in text:
+                yield char, 0
+        elif kind is _SPECIAL:
+            yield '{', 1
+            yield text, 1
+            yield '}', 0
+        else:
+            brace_level = 0
+            for char in text:
+                if char == '{':
+                    brace_level += 1
+                    yield char, brace_level
+                elif char == '}':
+                    brace_level -= 1
+                    yield char, brace_level
+                else:
+                    yield char, brace_level
+
+
+# kinds of parts returned by _split_groups
+_TEXT = 'text'
+_GROUP = 'group'
+_SPECIAL = 'special'
+
+
+def _split_groups(string, max_level=100):
+    r"""Split the string into text at brace level 0 and groups in braces.
+
+    Return a list of ``(text, kind)`` pairs. Text at brace level 0 includes
+    unmatched closing braces. Groups include the braces, except the missing
+    closing braces at the end of the string. For "special characters", as in
+    :py:func:`bibtex_len`, only the text inside the braces is returned.
+
+    >>> _split_groups(r'a}b{c{d}}{\e {f}}{g')
+    [('a}b', 'text'), ('{c{d}}', 'group'), ('\\e {f}', 'special'), ('{g', 'group')]
     """
-    return BibTeXString(string).traverse(
-        open=lambda string: ('{', string.level),
-        f=lambda char, string: (char, string.level),
-        close=lambda string: ('}', string.level - 1),
-    )
+
+    parts = []
+    start = 0
+    brace_level = 0
+    for brace in BRACE_RE.finditer(string):
+        position = brace.start()
+        if string[position] == '{':
+            if brace_level == 0:
+                if position > start:
+                    parts.append((string[start:position], _TEXT))
+                start = position
+            brace_level += 1
+            if brace_level > max_level:
+                raise BibTeXError('too many nested braces')
+        elif brace_level > 0:
+            brace_level -= 1
+            if brace_level == 0:
+                parts.append(_make_group(string, start, position + 1, position))
+                start = position + 1
+    if brace_level > 0:
+        parts.append(_make_group(string, start, len(string), len(string)))
+    elif start < len(string):
+        parts.append((string[start:], _TEXT))
+    return parts
+
+
+def _make_group(string, start, end, inner_end):
+    if string.startswith('\\', start + 1):
+        return string[start + 1:inner_end], _SPECIAL
+    else:
+        return string[start:end], _GROUP
 
 
 def split_name_list(string):
@@ -442,6 +564,24 @@ def split_name_list(string):
     return split_tex_string(string, ' [Aa][Nn][Dd] ')
 
 
+def iter_name_list(string):
+    r"""
+    Split a list of names, separated by ' and ', one name at a time.
+
+    Unlike :py:func:`split_name_list`, the string is split only as far
+    as the caller reads the names.
+
+    >>> names = iter_name_list('Johnson and Peterson and {Smith and Wesson}')
+    >>> next(names)
+    'Johnson'
+    >>> list(names)
+    ['Peterson', '{Smith and Wesson}']
+    >>> list(iter_name_list(''))
+    []
+    """
+    return iter_split_tex_string(string, ' [Aa][Nn][Dd] ')
+
+
 def _find_closing_brace(string):
     r"""
     >>> _find_closing_brace('')
@@ -516,22 +656,34 @@ def split_tex_string(string, sep=None, strip=True, filter_empty=False):
     ['Qui\\~{n}onero-Candela,', 'J.']
     """
 
+    return list(iter_split_tex_string(string, sep, strip, filter_empty))
+
+
+def iter_split_tex_string(string, sep=None, strip=True, filter_empty=False):
+    """Split a string like :py:func:`split_tex_string`, one part at a time."""
+
     if sep is None:
         sep = BIBTEX_SPACE_RE
         filter_empty = True
 
     sep = re.compile(sep)
 
-    result = []
     word_parts = []
 
+    def make_word(word_parts):
+        word = ''.join(word_parts)
+        return word.strip() if strip else word
+
     while True:
         head, brace, string = string.partition('{')
 
         if head:
             head_parts = sep.split(head)
             for word in head_parts[:-1]:
-                result.append(''.join(word_parts + [word]))
+                word_parts.append(word)
+                word = make_word(word_parts)
+                if word or not filter_empty:
+                    yield word
                 word_parts = []
             word_parts.append(head_parts[-1])
 
@@ -543,13 +695,9 @@ def split_tex_string(string, sep=None, strip=True, filter_empty=False):
             break
 
     if word_parts:
-        result.append(''.join(word_parts))
-
-    if strip:
-        result = [part.strip() for part in result]
-    if filter_empty:
-        result = [part for part in result if part]
-    return result
+        word = make_word(word_parts)
+        if word or not filter_empty:
+            yield word
 
 
 def bibtex_first_letter(string):
@@ -0,0 +1,340 @@
+# Copyright (c) 2006-2021  Andrey Golovizin
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Persistent caches for data that is expensive to compute.
+
+>>> from tempfile import mkdtemp
+>>> from shutil import rmtree
+>>> cache_dir = mkdtemp()
+>>> cache = DirectoryCache(cache_dir)
+>>> cache['key'] = [1, 2, 3]
+>>> cache['key']
+[1, 2, 3]
+>>> cache['missing key']
+Traceback (most recent call last):
+    ...
+KeyError: 'missing key'
+>>> cache.clear()
+>>> 'key' in cache
+False
+>>> rmtree(cache_dir)
+
+"""
+
+from __future__ import unicode_literals
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import sys
+import time
+from collections import OrderedDict
+from tempfile import NamedTemporaryFile
+
+
+def get_default_cache_dir():
+    """Return the directory for Pybtex caches in the user cache directory."""
+
+    if sys.platform == 'win32':
+        base_dir = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base_dir = os.path.expanduser('~/Library/Caches')
+    else:
+        base_dir = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base_dir, 'pybtex')
+
+
+def clear_cache(cache_dir=None):
+    """Remove all cached data from the cache directory and its subdirectories."""
+
+    if cache_dir is None:
+        cache_dir = get_default_cache_dir()
+    for dirpath, dirnames, filenames in os.walk(cache_dir):
+        DirectoryCache(dirpath).clear()
+        for filename in filenames:
+            if filename.endswith(SQLiteCache.suffix):
+                cache = SQLiteCache(os.path.join(dirpath, filename))
+                cache.clear()
+                cache.close()
+
+
+def get_digest(key):
+    return hashlib.sha1(repr(key).encode('UTF-8')).hexdigest()
+
+
+class DirectoryCache(object):
+    """A cache that stores pickled values in a directory, one file per key.
+
+    Keys can be any objects with a stable :py:func:`repr`, like tuples of
+    strings and numbers. When the total size of the cache exceeds ``max_size``
+    bytes, the least recently used values are removed.
+
+    The cache is only an optimization: unreadable cache files are treated
+    as missing, and errors writing to the cache directory are ignored.
+    """
+
+    suffix = '.pickle'
+
+    def __init__(self, directory, max_size=2 ** 28):
+        self.directory = directory
+        self.max_size = max_size
+
+    def get_filename(self, key):
+        return os.path.join(self.directory, get_digest(key) + self.suffix)
+
+    def __contains__(self, key):
+        return os.path.exists(self.get_filename(key))
+
+    def __getitem__(self, key):
+        filename = self.get_filename(key)
+        try:
+            with open(filename, 'rb') as cache_file:
+                cached_key, value = pickle.load(cache_file)
+        except EnvironmentError:
+            raise KeyError(key)
+        except Exception:
+            # a broken cache file is the same as a missing one
+            self.remove(filename)
+            raise KeyError(key)
+        if cached_key != key:
+            raise KeyError(key)
+        try:
+            # update the modification time for LRU eviction
+            os.utime(filename, None)
+        except EnvironmentError:
+            pass
+        return value
+
+    def __setitem__(self, key, value):
+        self.update([(key, value)])
+
+    def update(self, items):
+        """Store many ``(key, value)`` pairs and evict old values only once."""
+
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            for key, value in items:
+                with NamedTemporaryFile(dir=self.directory, suffix='.tmp', delete=False) as cache_file:
+                    pickle.dump((key, value), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(cache_file.name, self.get_filename(key))
+        except EnvironmentError:
+            return
+        self.evict()
+
+    def iter_files(self):
+        """Yield ``(mtime, size, filename)`` for all cache files."""
+
+        try:
+            entries = list(os.scandir(self.directory))
+        except EnvironmentError:
+            return
+        for entry in entries:
+            if entry.name.endswith(self.suffix):
+                try:
+                    stat = entry.stat()
+                except EnvironmentError:
+                    continue
+                yield stat.st_mtime, stat.st_size, entry.path
+
+    def evict(self):
+        """Remove the least recently used values until the cache fits into max_size."""
+
+        files = sorted(self.iter_files())
+        total_size = sum(size for mtime, size, filename in files)
+        for mtime, size, filename in files:
+            if total_size <= self.max_size:
+                break
+            self.remove(filename)
+            total_size -= size
+
+    def remove(self, filename):
+        try:
+            os.remove(filename)
+        except EnvironmentError:
+            pass
+
+    def clear(self):
+        for mtime, size, filename in list(self.iter_files()):
+            self.remove(filename)
+
+
+class SQLiteCache(object):
+    """A cache that stores pickled values in a single SQLite database file.
+
+    It works like :py:class:`DirectoryCache`, but is faster with many small
+    values. To avoid writing to the database on every read, the recently used
+    values are only marked as such by the next :py:meth:`update` or
+    :py:meth:`close`.
+
+    >>> from tempfile import mkdtemp
+    >>> from shutil import rmtree
+    >>> cache_dir = mkdtemp()
+    >>> cache = SQLiteCache(os.path.join(cache_dir, 'test.sqlite'))
+    >>> cache.update([('a', 1), ('b', 2)])
+    >>> cache['b']
+    2
+    >>> 'c' in cache
+    False
+    >>> cache.close()
+    >>> rmtree(cache_dir)
+    """
+
+    suffix = '.sqlite'
+
+    def __init__(self, filename, max_size=2 ** 28):
+        self.filename = filename
+        self.max_size = max_size
+        self._connection = None
+        self._used = {}
+
+    def connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.filename)
+            if directory and not os.path.isdir(directory):
+                os.makedirs(directory)
+            connection = sqlite3.connect(self.filename, timeout=60)
+            with connection:
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS cache '
+                    '(digest TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)'
+                )
+            self._connection = connection
+        return self._connection
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __getitem__(self, key):
+        digest = get_digest(key)
+        try:
+            row = self.connect().execute('SELECT value FROM cache WHERE digest = ?', (digest,)).fetchone()
+        except (EnvironmentError, sqlite3.Error):
+            raise KeyError(key)
+        if row is None:
+            raise KeyError(key)
+        try:
+            cached_key, value = pickle.loads(row[0])
+        except Exception:
+            raise KeyError(key)
+        if cached_key != key:
+            raise KeyError(key)
+        self._used[digest] = time.time()
+        return value
+
+    def __setitem__(self, key, value):
+        self.update([(key, value)])
+
+    def update(self, items):
+        """Store many ``(key, value)`` pairs in a single transaction."""
+
+        now = time.time()
+        rows = []
+        for key, value in items:
+            data = pickle.dumps((key, value), protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((get_digest(key), data, len(data), now))
+        try:
+            with self.connect() as connection:
+                connection.executemany(
+                    'UPDATE cache SET used = ? WHERE digest = ?',
+                    [(used, digest) for digest, used in self._used.items()],
+                )
+                connection.executemany('INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)', rows)
+                self._evict(connection)
+        except (EnvironmentError, sqlite3.Error):
+            pass
+        self._used.clear()
+
+    def _evict(self, connection):
+        total_size, = connection.execute('SELECT TOTAL(size) FROM cache').fetchone()
+        if total_size <= self.max_size:
+            return
+        evicted = []
+        for digest, size in connection.execute('SELECT digest, size FROM cache ORDER BY used'):
+            if total_size <= self.max_size:
+                break
+            evicted.append((digest,))
+            total_size -= size
+        connection.executemany('DELETE FROM cache WHERE digest = ?', evicted)
+
+    def evict(self):
+        """Remove the least recently used values until the cache fits into max_size."""
+
+        self.update([])
+
+    def clear(self):
+        try:
+            with self.connect() as connection:
+                connection.execute('DELETE FROM cache')
+        except (EnvironmentError, sqlite3.Error):
+            pass
+        self._used.clear()
+
+    def close(self):
+        if self._connection is not None:
+            self.update([])
+            self._connection.close()
+            self._connection = None
+
+
+class LRUCache(object):
+    """An in-memory cache that keeps at most ``max_items`` recently used values.
+
+    >>> cache = LRUCache(max_items=2)
+    >>> cache['a'] = 1
+    >>> cache['b'] = 2
+    >>> cache['a']
+    1
+    >>> cache['c'] = 3
+    >>> 'b' in cache
+    False
+    >>> sorted(cache.keys())
+    ['a', 'c']
+    """
+
+    def __init__(self, max_items=32):
+        self.max_items = max_items
+        self._values = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __getitem__(self, key):
+        value = self._values[key]
+        self._values.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._values[key] = value
+        self._values.move_to_end(key)
+        while len(self._values) > self.max_items:
+            self._values.popitem(last=False)
+
+    def keys(self):
+        return self._values.keys()
+
+    def clear(self):
+        self._values.clear()
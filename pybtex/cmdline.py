@@ -91,6 +91,51 @@ make_standard_option(
     help='allow BibTeX entries without keys and generate unnamed-<number> keys for them'
 )
 
+make_standard_option(
+    '--use-index',
+    action='store_true', dest='use_index',
+    help='read only the cited entries from large .bib files using an index file'
+)
+
+make_standard_option(
+    '--cache',
+    action='store_true', dest='use_cache',
+    help='cache parsed bibliography files and formatted entries in the user cache directory'
+)
+
+make_standard_option(
+    '--no-cache',
+    action='store_true', dest='no_cache',
+    help='do not use the cache, even if --cache or --cache-dir is given'
+)
+
+make_standard_option(
+    '--cache-dir',
+    type='string', dest='cache_dir',
+    help='cache parsed bibliography files and formatted entries in DIRECTORY',
+    metavar='DIRECTORY',
+)
+
+make_standard_option(
+    '--clear-cache',
+    action='store_true', dest='clear_cache',
+    help='remove all cached data before running'
+)
+
+make_standard_option(
+    '--workers',
+    type='int', dest='workers',
+    help='process entries in N worker processes where possible',
+    metavar='N',
+)
+
+make_standard_option(
+    '--profile-bst',
+    type='string', dest='profile_bst',
+    help='write a profile of the BibTeX style to FILE (JSON if FILE ends with .json, - for the terminal)',
+    metavar='FILE',
+)
+
 make_standard_option(
     '-s', '--style',
     type='string', dest='style', help='bibliography formatting style',
@@ -126,6 +171,13 @@ make_standard_option(
     help='use abbreviated name formatting style',
 )
 
+make_standard_option(
+    '--max-names',
+    action='store', type='int', dest='max_names',
+    help='format at most N names, followed by "et al."',
+    metavar='N',
+)
+
 make_standard_option(
     '-e', '--encoding',
     action='store', type='string', dest='encoding',
@@ -236,7 +288,8 @@ class CommandLine(object):
         errors.set_strict_mode(False)
         argv = self.recognize_legacy_optons(sys.argv[1:])
         options, args = self.opt_parser.parse_args(argv)
-        if len(args) != self.num_args:
+        # num_args = None means one or more arguments
+        if len(args) != self.num_args if self.num_args is not None else not args:
             self.opt_parser.print_help()
             sys.exit(1)
         kwargs = self._extract_kwargs(options)
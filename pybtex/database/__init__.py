@@ -27,19 +27,20 @@ import re
 from typing import Iterable, Tuple
 
 try:
-    from collections.abc import Mapping
+    from collections.abc import Mapping, MutableSequence
 except ImportError:
-    from collections import Mapping
+    from collections import Mapping, MutableSequence
 
 import textwrap
 
 from pybtex.exceptions import PybtexError
 from pybtex.utils import (
     deprecated,
-    OrderedCaseInsensitiveDict, CaseInsensitiveDefaultDict, CaseInsensitiveSet
+    OrderedCaseInsensitiveDict, CaseInsensitiveDefaultDict, CaseInsensitiveSet,
+    LazyList,
 )
 from pybtex.richtext import Text
-from pybtex.bibtex.utils import split_tex_string, scan_bibtex_string
+from pybtex.bibtex.utils import iter_name_list, split_tex_string, scan_bibtex_string
 from pybtex.errors import report_error
 from pybtex.plugin import find_plugin
 
@@ -926,6 +927,124 @@ class Person(object):
         return self.bibtex_first_names
 
 
+class PersonList(MutableSequence):
+    """A list of :py:class:`.Person` objects.
+
+    A person list created with :py:meth:`from_string` splits the string
+    into names and parses each name into a :py:class:`.Person` only when
+    it is accessed for the first time. Reading the first few persons of a
+    list with thousands of names does not process the rest of the string.
+
+    >>> persons = PersonList.from_string('Knuth, Donald E. and Leslie Lamport')
+    >>> len(persons)
+    2
+    >>> persons[1]
+    Person('Lamport, Leslie')
+    >>> persons == [Person('Donald E. Knuth'), Person('Lamport, Leslie')]
+    True
+    >>> persons.append(Person('Oren Patashnik'))
+    >>> persons
+    [Person('Knuth, Donald E.'), Person('Lamport, Leslie'), Person('Patashnik, Oren')]
+    >>> persons[:1] + [Person('Leslie Lamport')]
+    [Person('Knuth, Donald E.'), Person('Lamport, Leslie')]
+
+    .. versionadded:: 0.25
+    """
+
+    def __init__(self, persons=()):
+        self._persons = list(persons)
+        self._string = None
+        self._names = None
+        self._parsed = None
+
+    @classmethod
+    def from_string(cls, string):
+        """Create a person list from names separated by ``and``."""
+
+        person_list = cls()
+        person_list._string = string
+        person_list._names = LazyList(iter_name_list(string))
+        person_list._parsed = {}
+        return person_list
+
+    def _get_person(self, index):
+        try:
+            return self._parsed[index]
+        except KeyError:
+            person = self._parsed[index] = Person(self._names[index])
+            return person
+
+    def _materialize(self):
+        if self._names is not None:
+            self._persons = list(self)
+            self._string = self._names = self._parsed = None
+
+    def __len__(self):
+        if self._names is None:
+            return len(self._persons)
+        return len(self._names)
+
+    def __getitem__(self, index):
+        if self._names is None:
+            return self._persons[index]
+        if isinstance(index, slice):
+            # read the names up to the end of the slice
+            self._names[index]
+            return [
+                self._get_person(i)
+                for i in range(*index.indices(self._names.items_read))
+            ]
+        if index < 0:
+            index += len(self._names)
+            if index < 0:
+                raise IndexError('list index out of range')
+        return self._get_person(index)
+
+    def __setitem__(self, index, value):
+        self._materialize()
+        self._persons[index] = value
+
+    def __delitem__(self, index):
+        self._materialize()
+        del self._persons[index]
+
+    def insert(self, index, value):
+        self._materialize()
+        self._persons.insert(index, value)
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, PersonList)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __add__(self, other):
+        if not isinstance(other, (list, PersonList)):
+            return NotImplemented
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        if not isinstance(other, (list, PersonList)):
+            return NotImplemented
+        return list(other) + list(self)
+
+    def copy(self):
+        """Return a shallow copy of the list."""
+
+        if self._names is not None:
+            person_list = type(self).from_string(self._string)
+            person_list._parsed.update(self._parsed)
+            return person_list
+        return type(self)(self._persons)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __reduce__(self):
+        if self._names is not None:
+            return type(self).from_string, (self._string,)
+        return type(self), (self._persons,)
+
+
 def parse_file(file, bib_format=None, **kwargs):
     """
     Read bibliography data from file and return a :py:class:`.BibliographyData` object.
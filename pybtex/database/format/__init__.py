@@ -35,6 +35,7 @@ def format_database(
     parser_options=None,
     min_crossrefs=2,
     style=None,
+    workers=None,
     **kwargs
 ):
     if parser_options is None:
@@ -52,7 +53,8 @@ def format_database(
         name_style=kwargs.get('name_style'),
         sorting_style=kwargs.get('sorting_style'),
         abbreviate_names=kwargs.get('abbreviate_names'),
+        max_names=kwargs.get('max_names'),
         min_crossrefs=min_crossrefs,
     )
-    formatted_bibliography = style.format_bibliography(bib_data)
+    formatted_bibliography = style.format_bibliography(bib_data, workers=workers)
     output_backend(output_encoding).write_to_file(formatted_bibliography, to_filename)
@@ -45,12 +45,14 @@ pybtex-format formats bibliography database as human-readable text.
             standard_option('min_crossrefs'),
             standard_option('keyless_entries'),
             standard_option('style'),
+            standard_option('workers'),
         )),
         ('Pythonic style options', (
             standard_option('label_style'),
             standard_option('name_style'),
             standard_option('sorting_style'),
             standard_option('abbreviate_names'),
+            standard_option('max_names'),
         )),
         ('Encoding options', (
             standard_option('encoding'),
@@ -29,6 +29,7 @@ import pybtex.io
 from pybtex.plugin import Plugin
 from pybtex.database import BibliographyData
 from pybtex.exceptions import PybtexError
+from pybtex.utils import CaseInsensitiveSet
 
 
 class BaseParser(Plugin):
@@ -36,12 +37,26 @@ class BaseParser(Plugin):
     filename = '<INPUT>'
     unicode_io = False
 
-    def __init__(self, encoding=None, wanted_entries=None, min_crossrefs=2, **kwargs):
+    def __init__(self, encoding=None, wanted_entries=None, min_crossrefs=2, wanted_fields=None, **kwargs):
+        """
+        :param wanted_entries: Keys of the entries to read. Other entries are skipped.
+        :param wanted_fields: Names of the fields and person roles to read.
+            Other fields are skipped, except ``crossref``, which is needed to
+            find cross-referenced entries.
+        """
+
         self.encoding = encoding or pybtex.io.get_default_encoding()
         self.data = BibliographyData(
             wanted_entries=wanted_entries,
             min_crossrefs=min_crossrefs,
         )
+        if wanted_fields is not None:
+            wanted_fields = CaseInsensitiveSet(wanted_fields)
+            wanted_fields.add('crossref')
+        self.wanted_fields = wanted_fields
+
+    def want_field(self, name):
+        return self.wanted_fields is None or name in self.wanted_fields
 
     def parse_file(self, filename, file_suffix=None):
         if file_suffix is not None:
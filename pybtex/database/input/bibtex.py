@@ -70,13 +70,21 @@ http://www.sciencemag.org/cgi/content/abstract/276/5315/1109
 """
 from __future__ import unicode_literals
 
+import codecs
+import hashlib
+import heapq
+import json
+import mmap
+import os
 import re
 from string import ascii_letters, digits
 
+import pybtex.io
 from pybtex import textutils
-from pybtex.bibtex.utils import split_name_list
-from pybtex.database import Entry, Person, BibliographyDataError
+from pybtex.cache import LRUCache
+from pybtex.database import Entry, Person, PersonList, BibliographyDataError
 from pybtex.database.input import BaseParser
+from pybtex.exceptions import PybtexError
 from pybtex.scanner import (
     Literal, Pattern, PrematureEOF, PybtexSyntaxError, Scanner
 )
@@ -101,6 +109,13 @@ month_names = {
 NAME_CHARS = ascii_letters + u'@!$&*+-./:;<>?[\\]^_`|~\x7f'
 
 
+def _count_newlines(text, start, end):
+    return (
+        text.count('\n', start, end) + text.count('\r', start, end)
+        - text.count('\r\n', start, end)
+    )
+
+
 class SkipEntry(Exception):
     pass
 
@@ -145,6 +160,7 @@ class LowLevelParser(Scanner):
         macros=month_names,
         handle_error=None,
         want_entry=None,
+        want_field=None,
         filename=None
     ):
         super(LowLevelParser, self).__init__(text, filename)
@@ -154,6 +170,8 @@ class LowLevelParser(Scanner):
             self.handle_error = handle_error
         if want_entry:
             self.want_entry = want_entry
+        if want_field:
+            self.want_field = want_field
 
     def __iter__(self):
         return self.parse_bibliography()
@@ -179,6 +197,9 @@ class LowLevelParser(Scanner):
     def want_entry(self, key):
         return True
 
+    def want_field(self, name):
+        return True
+
     def want_current_entry(self):
         return self.current_entry_key is None or self.want_entry(self.current_entry_key)
 
@@ -237,10 +258,40 @@ class LowLevelParser(Scanner):
         if not self.keyless_entries:
             key_pattern = self.KEY_PAREN if body_end == self.RPAREN else self.KEY_BRACE
             self.current_entry_key = self.required([key_pattern]).value
+            if not self.want_current_entry() and self.skip_entry_fields():
+                raise SkipEntry
         self.parse_entry_fields()
         if not self.want_current_entry():
             raise SkipEntry
 
+    def skip_entry_fields(self):
+        """Skip the fields of an unwanted entry without parsing the values.
+
+        Return ``True`` and move to the end of the fields
+        if they are well-formed. Otherwise, return ``False`` and stay in place,
+        so that the fields are parsed as usual and the errors are reported.
+        """
+
+        text = self.text
+        pos = self.pos
+        while True:
+            match = _skip_field_name_re.match(text, pos)
+            if match:
+                match = _skip_equals_re.match(text, match.end())
+                if not match:
+                    return False
+                pos = _skip_value(text, match.end())
+                if pos is None:
+                    return False
+            match = _skip_comma_re.match(text, pos)
+            if not match:
+                break
+            pos = match.end()
+        if _skip_trailing_whitespace_re.match(text, pos):
+            return False
+        self.pos = pos
+        return True
+
     def parse_entry_fields(self):
         while True:
             self.current_field_name = None
@@ -258,8 +309,23 @@ class LowLevelParser(Scanner):
             return
         self.current_field_name = name.value
         self.required([self.EQUALS])
+        if not self.want_field(name.value) and self.skip_field_value():
+            return
         self.parse_value()
 
+    def skip_field_value(self):
+        """Skip the value of an unwanted field without parsing it.
+
+        Return ``False`` and stay in place if the value is not well-formed,
+        like :py:meth:`skip_entry_fields`.
+        """
+
+        pos = _skip_value(self.text, self.pos)
+        if pos is None or _skip_trailing_whitespace_re.match(self.text, pos):
+            return False
+        self.pos = pos
+        return True
+
     def parse_value(self):
         start = True
         concatenation = False
@@ -321,6 +387,152 @@ class LowLevelParser(Scanner):
                 raise PybtexSyntaxError('unbalanced braces', self)
 
 
+_skip_field_name_re = re.compile(r'\s*{0}'.format(LowLevelParser.NAME.regexp))
+_skip_equals_re = re.compile(r'\s*=')
+_skip_value_part_re = re.compile(
+    r'\s*(?:(["{{])|{0}|{1})'.format(LowLevelParser.NUMBER.regexp, LowLevelParser.NAME.regexp)
+)
+_skip_hash_re = re.compile(r'\s*#')
+_skip_comma_re = re.compile(r'\s*,')
+_skip_trailing_whitespace_re = re.compile(r'\s*\Z')
+_skip_braced_string_re = re.compile(r'[{}]')
+_skip_quoted_string_re = re.compile(r'[{}"]')
+
+
+def _skip_value(text, pos):
+    """Return the position after the end of a field value.
+
+    Return ``None`` if the value is not well-formed.
+    """
+
+    while True:
+        match = _skip_value_part_re.match(text, pos)
+        if not match:
+            return None
+        pos = match.end()
+        delimiter = match.group(1)
+        if delimiter:
+            pos = _skip_string(text, pos, delimiter == '"')
+            if pos is None:
+                return None
+        match = _skip_hash_re.match(text, pos)
+        if not match:
+            return pos
+        pos = match.end()
+
+
+def _skip_string(text, pos, quoted, max_level=100):
+    """Return the position after the end of a braced or quoted string.
+
+    Return ``None`` if the string is not well-formed.
+    """
+
+    string_re = _skip_quoted_string_re if quoted else _skip_braced_string_re
+    level = 0
+    while True:
+        match = string_re.search(text, pos)
+        if not match:
+            return None
+        pos = match.end()
+        char = match.group()
+        if char == '{':
+            level += 1
+            if level > max_level:
+                return None
+        elif char == '}':
+            if level:
+                level -= 1
+            elif quoted:
+                return None
+            else:
+                return pos
+        elif not level:
+            return pos
+
+
+class NeedMoreInput(Exception):
+    pass
+
+
+class LowLevelStreamParser(LowLevelParser):
+    """A :py:class:`LowLevelParser` that reads the input stream in chunks.
+
+    Only the unparsed tail of the input is kept in memory, so memory usage is
+    bounded by the chunk size and the size of the largest single command.
+    When a command turns out to continue past the end of the buffer, another
+    chunk is read and the command is parsed again from the start. Errors are
+    held back until the command is complete, so that each one is reported once.
+    """
+
+    def __init__(self, stream, chunk_size=2 ** 16, **kwargs):
+        super(LowLevelStreamParser, self).__init__('', **kwargs)
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.stream_eof = False
+        self.report_error = self.handle_error
+        self.pending_errors = []
+        self.handle_error = self.pending_errors.append
+
+    def read_more(self, keep_from):
+        """Drop the input before ``keep_from`` and append the next chunk."""
+
+        remainder = self.text[keep_from:]
+        chunk = self.stream.read(max(self.chunk_size, len(remainder)))
+        if not chunk:
+            self.stream_eof = True
+        self.line_offset += _count_newlines(self.text, 0, keep_from)
+        self.text = remainder + chunk
+        self.end_pos = len(self.text)
+        self.newline_positions = None
+        self.pos = 0
+
+    def eof(self):
+        if self.pos == self.end_pos and not self.stream_eof:
+            raise NeedMoreInput
+        return self.pos == self.end_pos
+
+    def skip_to(self, patterns):
+        token = super(LowLevelStreamParser, self).skip_to(patterns)
+        if token is None and not self.stream_eof:
+            raise NeedMoreInput
+        return token
+
+    def skip_to_command(self):
+        while not Scanner.skip_to(self, [self.AT]):
+            if self.stream_eof:
+                return False
+            # keep a trailing \r in case the next chunk starts with \n
+            keep_from = self.end_pos - 1 if self.text.endswith('\r') else self.end_pos
+            self.read_more(keep_from)
+        return True
+
+    def flush_errors(self):
+        errors = list(self.pending_errors)
+        del self.pending_errors[:]
+        for error in errors:
+            self.report_error(error)
+
+    def parse_bibliography(self):
+        while True:
+            if not self.skip_to_command():
+                return
+            self.command_start = self.pos - 1
+            try:
+                command = self.parse_command()
+            except NeedMoreInput:
+                del self.pending_errors[:]
+                self.read_more(self.command_start)
+                continue
+            except PybtexSyntaxError as error:
+                self.handle_error(error)
+                command = None
+            except SkipEntry:
+                command = None
+            self.flush_errors()
+            if command is not None:
+                yield command
+
+
 class BibTeXEntryIterator(LowLevelParser):
     def __init__(self, *args, **kwargs):
         import warnings
@@ -329,6 +541,253 @@ class BibTeXEntryIterator(LowLevelParser):
         super(BibTeXEntryIterator, self).__init__(*args, **kwargs)
 
 
+_command_head_re = re.compile(
+    r'@\s*({0})\s*([{{(])'.format(LowLevelParser.NAME.regexp)
+)
+_brace_body_re = re.compile(r'[{}]')
+_paren_body_re = re.compile(r'[{}")]')
+
+
+def _find_body_end(text, pos, body_start):
+    """Return the position right after the end of the command body.
+
+    This is a cheap approximation of :py:class:`LowLevelParser`:
+    braces are counted, and a parenthesized body ends at the first ``)``
+    outside of braces and quotes.
+    """
+
+    level = 0
+    if body_start == '{':
+        for match in _brace_body_re.finditer(text, pos):
+            if match.group() == '{':
+                level += 1
+            elif level:
+                level -= 1
+            else:
+                return match.end()
+    else:
+        in_quotes = False
+        for match in _paren_body_re.finditer(text, pos):
+            char = match.group()
+            if char == '{':
+                level += 1
+            elif char == '}':
+                if level:
+                    level -= 1
+            elif level:
+                continue
+            elif char == '"':
+                in_quotes = not in_quotes
+            elif not in_quotes:
+                return match.end()
+    return len(text)
+
+
+def iter_command_spans(text):
+    """Find top-level BibTeX commands without parsing them.
+
+    Yield ``(start, end, command)`` tuples. Like :py:class:`LowLevelParser`,
+    do not skip the body of ``@comment``.
+
+    >>> text = '@string{x = "y"} junk @comment{@misc(z, title = "1)")}'
+    >>> for start, end, command in iter_command_spans(text):
+    ...     print(command, text[start:end])
+    string @string{x = "y"}
+    comment @comment{
+    misc @misc(z, title = "1)")
+    """
+
+    pos = 0
+    while True:
+        match = _command_head_re.search(text, pos)
+        if not match:
+            return
+        command = match.group(1).lower()
+        if command == 'comment':
+            end = match.end()
+        else:
+            end = _find_body_end(text, match.end(), match.group(2))
+        yield match.start(), end, command
+        pos = end
+
+
+def _parse_chunk(text, macros, keyless_entries):
+    """Parse a part of a BibTeX file in a worker process."""
+
+    errors = []
+    entry_iterator = LowLevelParser(
+        text,
+        keyless_entries=keyless_entries,
+        handle_error=errors.append,
+        macros=macros,
+    )
+    commands = list(entry_iterator)
+    truncated = any(isinstance(error, PrematureEOF) for error in errors)
+    return commands, bool(errors), truncated
+
+
+def _file_digest(file):
+    digest = hashlib.sha1()
+    for block in iter(lambda: file.read(2 ** 20), b''):
+        digest.update(block)
+    return digest.hexdigest()
+
+
+class BibTeXIndex(object):
+    """An index of the commands in a BibTeX file.
+
+    For each @string, @preamble and entry, the index stores its byte range
+    in the file and the line number it starts at. The index is saved next to
+    the file and is invalidated when the file size, modification time or
+    contents change.
+
+    Only files without syntax errors are indexed.
+    """
+
+    version = 1
+    suffix = '.pybtex-index'
+
+    def __init__(self, size, mtime, digest, encoding, commands):
+        self.size = size
+        self.mtime = mtime
+        self.digest = digest
+        self.encoding = encoding
+        # a list of (command type, entry key, start, end, line number) tuples
+        self.commands = commands
+
+    @classmethod
+    def get_index_filename(cls, filename):
+        return filename + cls.suffix
+
+    @classmethod
+    def get(cls, filename, encoding):
+        """Load a valid index for the file, or build and save a new one.
+
+        Return ``None`` if the file cannot be indexed.
+        """
+
+        index = cls.load(filename, encoding)
+        if index is None:
+            index = cls.build(filename, encoding)
+            if index is not None:
+                index.save(filename)
+        return index
+
+    @classmethod
+    def load(cls, filename, encoding):
+        try:
+            with open(cls.get_index_filename(filename), encoding='UTF-8') as index_file:
+                index_data = json.load(index_file)
+            if index_data['version'] != cls.version:
+                return None
+            index = cls(**index_data['index'])
+        except (EnvironmentError, ValueError, KeyError, TypeError):
+            return None
+        if index.is_valid(filename, encoding):
+            return index
+
+    def is_valid(self, filename, encoding):
+        if self.encoding != codecs.lookup(encoding).name:
+            return False
+        stat = os.stat(filename)
+        if stat.st_size != self.size:
+            return False
+        if stat.st_mtime_ns == self.mtime:
+            return True
+        # the file has been touched, maybe the contents are the same
+        with open(filename, 'rb') as bib_file:
+            if _file_digest(bib_file) != self.digest:
+                return False
+        self.mtime = stat.st_mtime_ns
+        self.save(filename)
+        return True
+
+    @classmethod
+    def build(cls, filename, encoding):
+        with open(filename, 'rb') as bib_file:
+            stat = os.fstat(bib_file.fileno())
+            data = bib_file.read()
+        try:
+            text = data.decode(encoding)
+        except UnicodeDecodeError:
+            return None
+
+        def handle_error(error):
+            # undefined macros may be defined in other files
+            if not isinstance(error, UndefinedMacro):
+                raise error
+
+        commands = []
+        entry_iterator = LowLevelParser(text, handle_error=handle_error, macros=CaseInsensitiveDict())
+        try:
+            for command in entry_iterator:
+                start = entry_iterator.command_start
+                end = entry_iterator.pos
+                command_type = command[0].lower()
+                if command_type in ('string', 'preamble'):
+                    key = None
+                else:
+                    command_type = 'entry'
+                    key = command[1][0]
+                commands.append([command_type, key, start, end, entry_iterator.get_lineno(start)])
+        except PybtexSyntaxError:
+            return None
+
+        if len(text) != len(data):
+            cls._convert_offsets(text, commands, encoding)
+        return cls(
+            size=stat.st_size,
+            mtime=stat.st_mtime_ns,
+            digest=hashlib.sha1(data).hexdigest(),
+            encoding=codecs.lookup(encoding).name,
+            commands=commands,
+        )
+
+    @classmethod
+    def _convert_offsets(cls, text, commands, encoding):
+        """Convert character offsets to byte offsets."""
+
+        encoder = codecs.getincrementalencoder(encoding)()
+        char_pos = 0
+        byte_pos = len(encoder.encode(''))
+        for command in commands:
+            for i in 2, 3:
+                byte_pos += len(encoder.encode(text[char_pos:command[i]]))
+                char_pos = command[i]
+                command[i] = byte_pos
+
+    def save(self, filename):
+        index = {
+            'size': self.size,
+            'mtime': self.mtime,
+            'digest': self.digest,
+            'encoding': self.encoding,
+            'commands': self.commands,
+        }
+        try:
+            with open(self.get_index_filename(filename), 'w', encoding='UTF-8') as index_file:
+                json.dump({'version': self.version, 'index': index}, index_file)
+        except EnvironmentError:
+            pass
+
+    def find_entries(self, key):
+        """Return the numbers of the commands that define the entry."""
+
+        try:
+            entries_by_key = self._entries_by_key
+        except AttributeError:
+            entries_by_key = self._entries_by_key = {}
+            for i, command in enumerate(self.commands):
+                if command[0] == 'entry':
+                    entries_by_key.setdefault(command[1].lower(), []).append(i)
+        return entries_by_key.get(key.lower(), [])
+
+
+# low-level parser results, for programs that format many bibliographies
+# (see Parser.parse_cached)
+parsed_files = LRUCache(max_items=32)
+
+
 class Parser(BaseParser):
     default_suffix = '.bib'
     unicode_io = True
@@ -341,6 +800,11 @@ class Parser(BaseParser):
         macros=month_names,
         person_fields=Person.valid_roles,
         keyless_entries=False,
+        workers=None,
+        use_index=False,
+        use_cache=False,
+        cache_dir=None,
+        memory_cache=False,
         **kwargs
     ):
         BaseParser.__init__(self, encoding, **kwargs)
@@ -348,8 +812,16 @@ class Parser(BaseParser):
         self.macros = CaseInsensitiveDict(macros)
         self.person_fields = CaseInsensitiveSet(person_fields)
         self.keyless_entries = keyless_entries
+        self.workers = workers
+        self.use_index = use_index
+        self.use_cache = use_cache or cache_dir is not None
+        self.cache_dir = cache_dir
+        self.memory_cache = memory_cache
 
     def process_entry(self, entry_type, key, fields):
+        self.data.add_entry(*self.make_entry(entry_type, key, fields))
+
+    def make_entry(self, entry_type, key, fields):
         entry = Entry(entry_type)
 
         if key is None:
@@ -358,18 +830,20 @@ class Parser(BaseParser):
 
         seen_fields = set()
         for field_name, field_value_list in fields:
+            if not self.want_field(field_name):
+                continue
             if field_name.lower() in seen_fields:
                 self.handle_error(DuplicateField(key, field_name))
                 continue
 
             field_value = textutils.normalize_whitespace(self.flatten_value_list(field_value_list))
             if field_name in self.person_fields:
-                for name in split_name_list(field_value):
-                    entry.add_person(Person(name), field_name)
+                if field_value:
+                    entry.persons[field_name] = PersonList.from_string(field_value)
             else:
                 entry.fields[field_name] = field_value
             seen_fields.add(field_name.lower())
-        self.data.add_entry(key, entry)
+        return key, entry
 
     def process_preamble(self, value_list):
         value = textutils.normalize_whitespace(self.flatten_value_list(value_list))
@@ -382,15 +856,294 @@ class Parser(BaseParser):
         from pybtex.errors import report_error
         report_error(error)
 
+    def process_commands(self, commands, replayed=False):
+        for command in commands:
+            command_type = command[0]
+            command_type_lower = command_type.lower()
+            if command_type_lower == 'string':
+                if replayed:
+                    name, value_list = command[1]
+                    self.macros[name] = ''.join(value_list)
+            elif command_type_lower == 'preamble':
+                self.process_preamble(*command[1])
+            else:
+                key = command[1][0]
+                if replayed and key is not None and not self.data.want_entry(key):
+                    continue
+                self.process_entry(command_type, *command[1])
+
+    def parse_text(self, text, start=0, end=None):
+        entry_iterator = LowLevelParser(
+            text[start:end] if start or end is not None else text,
+            keyless_entries=self.keyless_entries,
+            handle_error=self.handle_error,
+            want_entry=self.data.want_entry,
+            want_field=self.want_field,
+            filename=self.filename,
+            macros=self.macros,
+        )
+        entry_iterator.line_offset = _count_newlines(text, 0, start)
+        self.process_commands(entry_iterator)
+
+    def parse_text_parallel(self, text):
+        """Parse the text in a pool of worker processes.
+
+        The text is split into chunks at command boundaries.
+        The values of @string macros at the start of each chunk are
+        computed in advance by parsing only the @string commands.
+        The results are merged in the original order. Chunks with errors
+        are parsed again serially, so that the result is the same as with
+        :py:meth:`parse_text`.
+        """
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        spans = list(iter_command_spans(text))
+        num_chunks = min(self.workers * 4, len(spans))
+        if num_chunks < 2:
+            return self.parse_text(text)
+
+        chunk_starts = [0]
+        macros = CaseInsensitiveDict(self.macros)
+        macro_snapshots = [CaseInsensitiveDict(macros)]
+        chunk_size = len(text) // num_chunks
+        for start, end, command in spans:
+            if start >= chunk_starts[-1] + chunk_size:
+                chunk_starts.append(start)
+                macro_snapshots.append(CaseInsensitiveDict(macros))
+            if command == 'string':
+                string_parser = LowLevelParser(
+                    text[start:end], macros=macros, handle_error=lambda error: None,
+                )
+                for _ in string_parser:
+                    pass
+        chunk_ends = chunk_starts[1:] + [len(text)]
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(_parse_chunk, text[start:end], chunk_macros, self.keyless_entries)
+                for start, end, chunk_macros in zip(chunk_starts, chunk_ends, macro_snapshots)
+            ]
+            try:
+                for start, end, chunk_macros, future in zip(chunk_starts, chunk_ends, macro_snapshots, futures):
+                    if self.macros != chunk_macros:
+                        break
+                    commands, had_errors, truncated = future.result()
+                    if truncated:
+                        break
+                    elif had_errors:
+                        self.parse_text(text, start, end)
+                    else:
+                        self.process_commands(commands, replayed=True)
+                else:
+                    return
+            finally:
+                for future in futures:
+                    future.cancel()
+        # the split went wrong, fall back to serial parsing
+        self.parse_text(text, start)
+
     def parse_string(self, text):
         self.unnamed_entry_counter = 1
         self.command_start = 0
 
-        entry_iterator = LowLevelParser(
-            text,
+        if self.workers and self.workers > 1:
+            self.parse_text_parallel(text)
+        else:
+            self.parse_text(text)
+        return self.data
+
+    def parse_stream(self, stream):
+        text = stream.read()
+        return self.parse_string(text)
+
+    def find_file(self, filename):
+        """Return the path to the file, or ``None`` if it cannot be found."""
+        return pybtex.io.find_file(filename)
+
+    def parse_file(self, filename, file_suffix=None):
+        if file_suffix is not None:
+            filename = filename + file_suffix
+        path = None
+        if (self.use_index or self.use_cache or self.memory_cache) and isinstance(filename, str):
+            path = self.find_file(filename)
+        if path is None:
+            return super(Parser, self).parse_file(filename)
+
+        wanted_entries = self.data.wanted_entries
+        if (
+            self.use_index and not self.keyless_entries
+            and wanted_entries is not None and '*' not in wanted_entries
+        ):
+            index = BibTeXIndex.get(path, self.encoding)
+            if index is not None:
+                self.filename = filename
+                self.unnamed_entry_counter = 1
+                self.command_start = 0
+                if index.commands:
+                    with open(path, 'rb') as bib_file:
+                        with mmap.mmap(bib_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                            self.parse_indexed(data, index)
+                return self.data
+        if self.use_cache or self.memory_cache:
+            self.filename = filename
+            self.parse_cached(path)
+            return self.data
+        return super(Parser, self).parse_file(filename)
+
+    def decode(self, data):
+        try:
+            text = data.decode(self.encoding)
+        except UnicodeDecodeError as error:
+            raise PybtexError(str(error), filename=self.filename)
+        # the same newline translation as with io.open()
+        return text.replace('\r\n', '\n').replace('\r', '\n')
+
+    def parse_cached(self, path):
+        """Parse the file, reusing the commands cached by a previous run.
+
+        The results of the low-level parser are cached for files without any
+        syntax errors or undefined macros. Since macro values are substituted
+        by the low-level parser, the current macro definitions are a part of
+        the cache key.
+
+        With :py:attr:`use_cache`, the commands are saved in the cache directory.
+        With :py:attr:`memory_cache`, they are also kept in memory, so that
+        a program that formats many bibliographies parses each file only once.
+        """
+
+        from pybtex import __version__
+        from pybtex.cache import DirectoryCache, get_default_cache_dir
+
+        if self.use_cache:
+            cache_dir = self.cache_dir or get_default_cache_dir()
+            cache = DirectoryCache(os.path.join(cache_dir, 'bibtex'))
+        else:
+            cache = {}
+        with open(path, 'rb') as bib_file:
+            stat = os.fstat(bib_file.fileno())
+            data = bib_file.read()
+        key = (
+            __version__,
+            type(self).__module__,
+            type(self).__name__,
+            os.path.abspath(path),
+            stat.st_size,
+            stat.st_mtime_ns,
+            hashlib.sha1(data).hexdigest(),
+            codecs.lookup(self.encoding).name,
+            self.keyless_entries,
+            tuple(sorted(self.macros.items())),
+        )
+        if self.memory_cache and key in parsed_files:
+            commands = parsed_files[key]
+        else:
+            try:
+                commands = cache[key]
+            except KeyError:
+                errors = []
+                entry_iterator = LowLevelParser(
+                    self.decode(data),
+                    keyless_entries=self.keyless_entries,
+                    handle_error=errors.append,
+                    macros=CaseInsensitiveDict(self.macros),
+                )
+                commands = list(entry_iterator)
+                if errors:
+                    # parse the file as usual to report the errors
+                    commands = None
+                cache[key] = commands
+            if self.memory_cache:
+                parsed_files[key] = commands
+
+        if commands is None:
+            self.parse_string(self.decode(data))
+        else:
+            self.unnamed_entry_counter = 1
+            self.command_start = 0
+            self.process_commands(commands, replayed=True)
+
+    def parse_indexed(self, data, index):
+        """Parse only the wanted entries, @string and @preamble commands.
+
+        Entries referenced by the crossref field are fetched too,
+        provided that they come after the referencing entry,
+        exactly as the sequential parser does.
+        """
+
+        pending = [
+            i for i, command in enumerate(index.commands) if command[0] != 'entry'
+        ]
+        for key in self.data.wanted_entries:
+            pending.extend(index.find_entries(key))
+        heapq.heapify(pending)
+        done = set()
+        while pending:
+            i = heapq.heappop(pending)
+            if i in done:
+                continue
+            done.add(i)
+            command_type, key, start, end, lineno = index.commands[i]
+            text = self.decode(data[start:end])
+            entry_iterator = LowLevelParser(
+                text,
+                keyless_entries=self.keyless_entries,
+                handle_error=self.handle_error,
+                want_entry=self.data.want_entry,
+                want_field=self.want_field,
+                filename=self.filename,
+                macros=self.macros,
+            )
+            entry_iterator.line_offset = lineno - 1
+            for command in entry_iterator:
+                if command_type != 'entry':
+                    self.process_commands([command])
+                    continue
+                entry_key, entry = self.make_entry(command[0], *command[1])
+                self.data.add_entry(entry_key, entry)
+                crossref = entry.fields.get('crossref')
+                if crossref is not None and self.data.entries.get(entry_key) is entry:
+                    for j in index.find_entries(crossref):
+                        if j > i:
+                            heapq.heappush(pending, j)
+
+    def iter_entries(self, stream, chunk_size=2 ** 16):
+        r"""Parse a text stream and yield ``(key, entry)`` pairs one by one.
+
+        The stream is read in chunks of ``chunk_size`` characters, and
+        each entry is yielded as soon as its closing brace is read. Entries are
+        not added to :py:attr:`data`, so memory usage is proportional to the
+        size of the largest entry rather than to the size of the whole file.
+
+        ``@STRING`` macros are remembered for the following entries,
+        and ``@PREAMBLE`` values are added to :py:attr:`data` as usual.
+        Duplicate keys are not detected.
+
+        >>> from io import StringIO
+        >>> parser = Parser()
+        >>> for key, entry in parser.iter_entries(StringIO(r'''
+        ...     @string{knuth = "Donald E. Knuth"}
+        ...     @preamble{"\newcommand{\noop}[1]{}"}
+        ...     @book{knuth1984, author = knuth, title = "The {\TeX}book"}
+        ...     @book{knuth1986, author = knuth, title = "The {METAFONT}book"}
+        ... ''')):
+        ...     print(key, entry.persons['author'], entry.fields['title'])
+        knuth1984 [Person('Knuth, Donald E.')] The {\TeX}book
+        knuth1986 [Person('Knuth, Donald E.')] The {METAFONT}book
+        >>> print(parser.data.preamble)
+        \newcommand{\noop}[1]{}
+
+        .. versionadded:: 0.25
+        """
+
+        self.unnamed_entry_counter = 1
+        entry_iterator = LowLevelStreamParser(
+            stream,
+            chunk_size=chunk_size,
             keyless_entries=self.keyless_entries,
             handle_error=self.handle_error,
             want_entry=self.data.want_entry,
+            want_field=self.want_field,
             filename=self.filename,
             macros=self.macros,
         )
@@ -402,9 +1155,4 @@ class Parser(BaseParser):
             elif entry_type_lower == 'preamble':
                 self.process_preamble(*entry[1])
             else:
-                self.process_entry(entry_type, *entry[1])
-        return self.data
-
-    def parse_stream(self, stream):
-        text = stream.read()
-        return self.parse_string(text)
+                yield self.make_entry(entry_type, *entry[1])
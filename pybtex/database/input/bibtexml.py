@@ -75,6 +75,8 @@ class Parser(BaseParser):
         e = Entry(type)
         for field in item:
             field_name = remove_ns(field.tag)
+            if not self.want_field(field_name):
+                continue
             if field_name in Person.valid_roles:
                 process_person(field, field_name)
             else:
@@ -90,6 +90,8 @@ class Parser(BaseParser):
         bib_entry = Entry(entry['type'])
         for (key, value) in entry.items():
             key_lower = key.lower()
+            if not self.want_field(key):
+                continue
             if key_lower in Person.valid_roles:
                 for names in value:
                     bib_entry.add_person(Person(**names), key)
@@ -27,6 +27,7 @@ import pybtex.io
 
 strict = True
 error_code = 0
+error_count = 0
 captured_errors = None
 
 
@@ -40,11 +41,12 @@ def capture():
     """Capture exceptions for debug purposes."""
 
     global captured_errors
+    previous_captured_errors = captured_errors
     captured_errors = []
     try:
         yield captured_errors
     finally:
-        captured_errors = None
+        captured_errors = previous_captured_errors
 
 
 def format_error(exception, prefix='ERROR: '):
@@ -67,8 +69,9 @@ def print_error(exception, prefix='ERROR: '):
 
 
 def report_error(exception):
-    global error_code
+    global error_code, error_count
 
+    error_count += 1
     if captured_errors is not None:
         captured_errors.append(exception)
         return
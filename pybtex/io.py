@@ -25,6 +25,7 @@
 from __future__ import absolute_import, unicode_literals
 
 import io
+import os
 import posixpath
 import sys
 from os import environ
@@ -49,6 +50,22 @@ def _decode_filename(filename, errors='strict'):
     return filename.decode(encoding, errors=errors)
 
 
+def find_file(filename):
+    """Return the path to an existing file, or ``None`` if it cannot be found.
+
+    Files that do not exist in the current directory are looked up with kpsewhich.
+    """
+
+    if posixpath.isfile(filename):
+        return filename
+    try:
+        path = kpsewhich(filename)
+    except EnvironmentError:
+        return None
+    if path:
+        return os.fsdecode(path)
+
+
 def _open_existing(opener, filename, mode, locate, **kwargs):
     if not posixpath.isfile(filename):
         found = locate(filename)
@@ -24,6 +24,7 @@
 from __future__ import unicode_literals
 
 import re
+from bisect import bisect_right
 
 from pybtex.exceptions import PybtexError
 
@@ -41,9 +42,12 @@ class Pattern(object):
     def __init__(self, regexp, description, flags=0):
         self.description = description
         compiled_regexp = re.compile(regexp, flags=flags)
+        self.regexp = compiled_regexp.pattern
+        self.flags = compiled_regexp.flags
         self.search = compiled_regexp.search
         self.match = compiled_regexp.match
         self.findall = compiled_regexp.findall
+        self.finditer = compiled_regexp.finditer
 
 
 class Literal(Pattern):
@@ -53,10 +57,81 @@ class Literal(Pattern):
         super(Literal, self).__init__(pattern, description)
 
 
+class Alternation(object):
+    """A tuple of patterns compiled into a single regular expression.
+
+    Matching an alternation is a single regexp operation that returns both the
+    match object and the pattern that produced it.
+
+    >>> a, b = Literal('a'), Pattern('[ab]+', 'a or b')
+    >>> match, pattern = Alternation((a, b)).match('abba')
+    >>> match.group(), pattern is a
+    ('a', True)
+    >>> match, pattern = Alternation((b, a)).search('xxabba')
+    >>> match.group(), pattern is b
+    ('abba', True)
+    >>> Alternation((a, b)).search('xyz')
+    (None, None)
+
+    """
+
+    inline_flags = (
+        (re.IGNORECASE, 'i'),
+        (re.MULTILINE, 'm'),
+        (re.DOTALL, 's'),
+        (re.VERBOSE, 'x'),
+    )
+
+    def __init__(self, patterns):
+        self.patterns = {}
+        alternatives = []
+        for i, pattern in enumerate(patterns):
+            group_name = '_{0}'.format(i)
+            self.patterns[group_name] = pattern
+            alternatives.append('(?P<{0}>{1})'.format(group_name, self._scope_flags(pattern)))
+        compiled_regexp = re.compile('|'.join(alternatives))
+        self._search = compiled_regexp.search
+        self._match = compiled_regexp.match
+
+    def _scope_flags(self, pattern):
+        flags = ''.join(letter for flag, letter in self.inline_flags if pattern.flags & flag)
+        if flags:
+            return '(?{0}:{1})'.format(flags, pattern.regexp)
+        else:
+            return '(?:{0})'.format(pattern.regexp)
+
+    def search(self, text, pos=0):
+        match = self._search(text, pos)
+        if match:
+            return match, self.patterns[match.lastgroup]
+        return None, None
+
+    def match(self, text, pos=0):
+        match = self._match(text, pos)
+        if match:
+            return match, self.patterns[match.lastgroup]
+        return None, None
+
+
+_alternations = {}
+
+
+def get_alternation(patterns):
+    """Return a cached :py:class:`Alternation` for the given sequence of patterns."""
+
+    key = tuple(patterns)
+    try:
+        return _alternations[key]
+    except KeyError:
+        alternation = _alternations[key] = Alternation(key)
+        return alternation
+
+
 class Scanner(object):
     text = None
-    lineno = 1
     pos = 0
+    line_offset = 0
+    newline_positions = None
     WHITESPACE = Pattern(r'\s+', 'whitespace')
     NEWLINE = Pattern(r'\n|(\r\n)|\r', 'newline')
 
@@ -66,29 +141,48 @@ class Scanner(object):
         self.filename = filename
 
     def skip_to(self, patterns):
-        end = None
-        winning_pattern = None
-        for pattern in patterns:
-            match = pattern.search(self.text, self.pos)
-            if match and (not end or match.end() < end):
-                end = match.end()
-                winning_pattern = pattern
-        if winning_pattern:
-            value = self.text[self.pos: end]
+        """Skip to the leftmost match of any of the patterns.
+
+        If several patterns match at the same position,
+        the one listed first wins.
+        """
+        match, pattern = get_alternation(patterns).search(self.text, self.pos)
+        if match:
+            end = match.end()
+            value = self.text[self.pos:end]
             self.pos = end
-            # print '>>', value
-            self.update_lineno(value)
-            return Token(value, winning_pattern)
+            return Token(value, pattern)
+
+    @property
+    def lineno(self):
+        return self.get_lineno(self.pos)
+
+    @lineno.setter
+    def lineno(self, value):
+        self.line_offset += value - self.lineno
+
+    def get_lineno(self, pos):
+        r"""Return the number of the line containing the given position.
+
+        Line numbers are only needed for error messages, so the positions of
+        the newlines are found when a line number is requested for the first
+        time.
+
+        >>> scanner = Scanner('one\ntwo\r\nthree\rfour')
+        >>> [scanner.get_lineno(pos) for pos in (0, 3, 4, 7, 9, 14, 15)]
+        [1, 1, 2, 2, 3, 3, 4]
+        """
 
-    def update_lineno(self, value):
-        num_newlines = value.count("\n") + value.count("\r") - value.count("\r\n")
-        self.lineno += num_newlines
+        if self.newline_positions is None:
+            self.newline_positions = [
+                match.end() for match in self.NEWLINE.finditer(self.text)
+            ]
+        return self.line_offset + bisect_right(self.newline_positions, pos) + 1
 
     def eat_whitespace(self):
         whitespace = self.WHITESPACE.match(self.text, self.pos)
         if whitespace:
             self.pos = whitespace.end()
-            self.update_lineno(whitespace.group())
 
     def eof(self):
         return self.pos == self.end_pos
@@ -100,13 +194,10 @@ class Scanner(object):
                 raise EOFError
             else:
                 raise PrematureEOF(self)
-        for pattern in patterns:
-            match = pattern.match(self.text, self.pos)
-            if match:
-                value = match.group()
-                self.pos = match.end()
-                # print '->', value
-                return Token(value, pattern)
+        match, pattern = get_alternation(patterns).match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            return Token(match.group(), pattern)
 
     def optional(self, patterns, allow_eof=False):
         return self.get_token(patterns, allow_eof=allow_eof)
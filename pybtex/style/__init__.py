@@ -34,7 +34,38 @@ class FormattedEntry(object):
         self.label = label
 
 
+class LazyFormattedEntry(FormattedEntry):
+    """Formatted bibliography entry that is formatted only when
+    its text is accessed for the first time.
+    """
+
+    def __init__(self, style, entry, label=None, bib_data=None):
+        self.key = entry.key
+        self.label = label
+        self.style = style
+        self.entry = entry
+        self.bib_data = bib_data
+        self._text = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = self.style.format_entry(self.label, self.entry, bib_data=self.bib_data).text
+        return self._text
+
+
 class FormattedBibliography(object):
+    """A list of formatted entries.
+
+    Formatted bibliographies can be sliced, for example to render
+    only a part of a long bibliography::
+
+        formatted_bibliography = style.format_bibliography(bib_data, lazy=True)
+        backend.write_to_stream(formatted_bibliography[:50], stream)
+
+    A slice is a :py:class:`FormattedBibliography` with the same style and preamble.
+    """
+
     def __init__(self, entries, style, preamble=''):
         self.entries = list(entries)
         self.style = style
@@ -43,6 +74,14 @@ class FormattedBibliography(object):
     def __iter__(self):
         return iter(self.entries)
 
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return type(self)(self.entries[index], style=self.style, preamble=self.preamble)
+        return self.entries[index]
+
     def get_longest_label(self):
         label_style = self.style.label_style
         return label_style.get_longest_label(self.entries)
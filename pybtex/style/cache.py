@@ -0,0 +1,207 @@
+# Copyright (c) 2006-2021  Andrey Golovizin
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Persistent cache of formatted bibliography entries.
+
+Formatting an entry with a Pythonic style gives the same text as long as the
+entry, the entries it cross-references and the style configuration stay the
+same. :py:class:`FormattedEntryCache` stores the formatted rich text under a
+key made of hashes of both, so unchanged entries are not formatted again
+on the next run:
+
+>>> from tempfile import mkdtemp
+>>> from shutil import rmtree
+>>> from pybtex.database import parse_string
+>>> from pybtex.style.formatting.unsrt import Style
+>>> bib_data = parse_string('@misc{key, title = {Title}}', 'bibtex')
+>>> cache_dir = mkdtemp()
+>>> entry_cache = FormattedEntryCache.from_directory(cache_dir)
+>>> print(Style().format_bibliography(bib_data, entry_cache=entry_cache).entries[0].text)
+Title.
+>>> entry_cache.hits, entry_cache.misses
+(0, 1)
+>>> print(Style().format_bibliography(bib_data, entry_cache=entry_cache).entries[0].text)
+Title.
+>>> entry_cache.hits, entry_cache.misses
+(1, 1)
+>>> entry_cache.close()
+>>> rmtree(cache_dir)
+
+"""
+
+from __future__ import unicode_literals
+
+import hashlib
+import os
+import sys
+
+import pybtex
+from pybtex.cache import DirectoryCache, SQLiteCache
+
+
+def _get_persons_key(persons):
+    # person lists read from .bib files keep the original string
+    names = getattr(persons, '_string', None)
+    if names is not None:
+        return names
+    return [
+        (
+            person.first_names, person.middle_names, person.prelast_names,
+            person.last_names, person.lineage_names,
+        )
+        for person in persons
+    ]
+
+
+def _get_module_key(module_name):
+    module = sys.modules.get(module_name)
+    try:
+        mtime = os.stat(module.__file__).st_mtime_ns
+    except (AttributeError, TypeError, EnvironmentError):
+        mtime = None
+    return module_name, mtime
+
+
+def _get_class_key(cls):
+    # a change in any base class changes the output, too
+    return [
+        (base.__qualname__,) + _get_module_key(base.__module__)
+        for base in cls.__mro__ if base is not object
+    ]
+
+
+class FormattedEntryCache(object):
+    """A persistent cache of formatted entry texts.
+
+    :param storage: A :py:class:`.DirectoryCache`, an :py:class:`.SQLiteCache`,
+        or any object with the same ``__getitem__()`` and ``update()`` methods.
+
+    The cache key includes:
+
+    - the type, key, fields and persons of the entry,
+    - the same data for the cross-referenced entries,
+    - the classes of the style and its name, label and sorting styles
+      and all their base classes, including the modification times
+      of their modules,
+    - the modification times of the template and rich text modules,
+    - the ``abbreviate_names`` and ``max_names`` options,
+    - the Pybtex version.
+
+    Labels are not part of the key: the cached text is reused even if the
+    numbering of the entries has changed. Entries that report errors are not
+    cached, so that the errors are reported again on the next run.
+
+    :py:attr:`hits` and :py:attr:`misses` count the entries that were found
+    in the cache and those that had to be formatted.
+    """
+
+    #: Increase when the cache format changes.
+    version = 1
+
+    #: Modules used by all styles. The cache is invalidated when they change.
+    style_modules = 'pybtex.style.template', 'pybtex.richtext'
+
+    #: Cross-references are followed up to this depth.
+    max_crossref_depth = 8
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.hits = 0
+        self.misses = 0
+        self._new_items = []
+
+    @classmethod
+    def from_directory(cls, cache_dir, backend='sqlite', max_size=2 ** 28):
+        """Create a cache in the given directory.
+
+        :param backend: ``sqlite`` to store all entries in a single database file,
+            or ``directory`` to store each entry in a separate file.
+        """
+
+        if backend == 'sqlite':
+            storage = SQLiteCache(os.path.join(cache_dir, 'formatted' + SQLiteCache.suffix), max_size=max_size)
+        elif backend == 'directory':
+            storage = DirectoryCache(os.path.join(cache_dir, 'formatted'), max_size=max_size)
+        else:
+            raise ValueError('unknown cache backend: {0}'.format(backend))
+        return cls(storage)
+
+    def get_style_key(self, style):
+        """Return a hash of the style configuration."""
+
+        style_classes = [
+            type(style), type(style.name_style), type(style.label_style), type(style.sorting_style),
+        ]
+        return self._get_digest([
+            self.version,
+            pybtex.__version__,
+            [_get_class_key(cls) for cls in style_classes],
+            [_get_module_key(module_name) for module_name in self.style_modules],
+            style.abbreviate_names,
+            style.max_names,
+        ])
+
+    def get_entry_key(self, entry, bib_data=None, depth=0):
+        """Return a hash of the entry and the entries it cross-references."""
+
+        data = [
+            entry.type,
+            entry.key,
+            list(entry.fields.items()),
+            [(role, _get_persons_key(persons)) for role, persons in entry.persons.items()],
+        ]
+        crossref = entry.fields.get('crossref')
+        if crossref and bib_data is not None and depth < self.max_crossref_depth:
+            referenced_entry = bib_data.entries.get(crossref)
+            if referenced_entry is not None:
+                data.append(self.get_entry_key(referenced_entry, bib_data, depth + 1))
+        return self._get_digest(data)
+
+    def _get_digest(self, data):
+        return hashlib.sha1(repr(data).encode('UTF-8')).hexdigest()
+
+    def get(self, style_key, entry, bib_data=None):
+        """Return the cached text of the entry, or ``None``."""
+
+        try:
+            text = self.storage[style_key, self.get_entry_key(entry, bib_data)]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return text
+
+    def add(self, style_key, entry, text, bib_data=None):
+        """Add the text of the entry to the cache on the next :py:meth:`save`."""
+
+        self._new_items.append(((style_key, self.get_entry_key(entry, bib_data)), text))
+
+    def save(self):
+        """Write the new entries to the storage."""
+
+        self.storage.update(self._new_items)
+        del self._new_items[:]
+
+    def close(self):
+        self.save()
+        close = getattr(self.storage, 'close', None)
+        if close:
+            close()
@@ -21,15 +21,15 @@
 
 from __future__ import unicode_literals
 
-from pybtex.style import FormattedEntry, FormattedBibliography
-from pybtex.style.template import node, join
+from pybtex.style import FormattedEntry, FormattedBibliography, LazyFormattedEntry
+from pybtex.style.template import macro, join
 from pybtex.richtext import Symbol
 from pybtex.plugin import Plugin, find_plugin
 
 
-@node
-def toplevel(children, data):
-    return join(sep=Symbol('newblock')) [children].format_data(data)
+@macro
+def toplevel(children):
+    return join(sep=Symbol('newblock')) [children]
 
 
 class BaseStyle(Plugin):
@@ -41,7 +41,17 @@ class BaseStyle(Plugin):
     default_label_style = None
     default_sorting_style = None
 
-    def __init__(self, label_style=None, name_style=None, sorting_style=None, abbreviate_names=False, min_crossrefs=2, **kwargs):
+    #: The smallest number of entries sent to a worker process
+    #: by :py:meth:`format_entries`.
+    min_chunk_size = 50
+
+    #: Names of the fields and person roles used by the style, or ``None``
+    #: if the style may use any field. Other fields are not read from
+    #: the bibliography files. The attribute is not inherited: a subclass
+    #: that does not set it may use any field.
+    fields = None
+
+    def __init__(self, label_style=None, name_style=None, sorting_style=None, abbreviate_names=False, min_crossrefs=2, max_names=None, **kwargs):
         self.name_style = find_plugin('pybtex.style.names', name_style or self.default_name_style)()
         self.label_style = find_plugin('pybtex.style.labels', label_style or self.default_label_style)()
         self.sorting_style = find_plugin('pybtex.style.sorting', sorting_style or self.default_sorting_style)()
@@ -50,12 +60,172 @@ class BaseStyle(Plugin):
         self.sort = self.sorting_style.sort
         self.abbreviate_names = abbreviate_names
         self.min_crossrefs = min_crossrefs
+        self.max_names = max_names
+        self._templates = {}
+
+    def get_fields(self):
+        """Return the names of the fields used by the style and its label and
+        sorting styles, or ``None`` if any of them may use any field.
+        """
+
+        field_lists = [
+            _get_declared_fields(style)
+            for style in (self, self.label_style, self.sorting_style)
+        ]
+        if any(fields is None for fields in field_lists):
+            return None
+        return sorted(set().union(*field_lists))
 
-    def format_entries(self, entries, bib_data=None):
+    def format_entries(self, entries, bib_data=None, workers=None, entry_cache=None, lazy=False):
+        """Sort and label the entries and return an iterable of
+        :py:class:`.FormattedEntry` objects.
+
+        :param workers: Format the entries in this many worker processes.
+            The entries are sorted and labeled in this process, then split into
+            chunks and formatted by forked workers. Entries that report errors
+            in a worker are formatted again in this process, so the errors
+            are reported in the same order as in serial mode. Formatting
+            an entry must not depend on the entries formatted before it.
+        :param entry_cache: A :py:class:`.FormattedEntryCache`. Only the
+            entries that are not in the cache are formatted.
+        :param lazy: Return :py:class:`.LazyFormattedEntry` objects that are
+            formatted only when their text is accessed. The entries are still
+            sorted and labeled immediately. Errors are reported when the text
+            is accessed. Can not be used with ``workers`` or ``entry_cache``.
+        """
+
+        if lazy and (workers or entry_cache is not None):
+            raise ValueError('lazy formatting can not be used with workers or entry_cache')
         sorted_entries = self.sort(entries)
         labels = self.format_labels(sorted_entries)
-        for label, entry in zip(labels, sorted_entries):
-            yield self.format_entry(label, entry, bib_data=bib_data)
+        if lazy:
+            return [
+                LazyFormattedEntry(self, entry, label, bib_data=bib_data)
+                for label, entry in zip(labels, sorted_entries)
+            ]
+        labeled_entries = list(zip(labels, sorted_entries))
+        if entry_cache is not None:
+            return self._format_entries_cached(labeled_entries, bib_data, workers, entry_cache)
+        return self._format_labeled_entries(labeled_entries, bib_data, workers, self.format_entry)
+
+    def _format_labeled_entries(self, labeled_entries, bib_data, workers, format_entry):
+        if workers and workers > 1:
+            formatted_entries = self._format_entries_parallel(labeled_entries, bib_data, workers, format_entry)
+            if formatted_entries is not None:
+                return formatted_entries
+        return (
+            format_entry(label, entry, bib_data=bib_data)
+            for label, entry in labeled_entries
+        )
+
+    def _format_entries_cached(self, labeled_entries, bib_data, workers, entry_cache):
+        import pybtex.errors
+
+        style_key = entry_cache.get_style_key(self)
+        texts = [entry_cache.get(style_key, entry, bib_data) for label, entry in labeled_entries]
+        missing_entries = [
+            labeled_entry for labeled_entry, text in zip(labeled_entries, texts) if text is None
+        ]
+        failed_entries = set()
+
+        def format_entry(label, entry, bib_data=None):
+            error_count = pybtex.errors.error_count
+            formatted_entry = self.format_entry(label, entry, bib_data=bib_data)
+            if pybtex.errors.error_count != error_count:
+                failed_entries.add(id(entry))
+            return formatted_entry
+
+        formatted_entries = iter(self._format_labeled_entries(missing_entries, bib_data, workers, format_entry))
+        result = []
+        for (label, entry), text in zip(labeled_entries, texts):
+            if text is None:
+                formatted_entry = next(formatted_entries)
+                if id(entry) not in failed_entries:
+                    entry_cache.add(style_key, entry, formatted_entry.text, bib_data)
+            else:
+                formatted_entry = FormattedEntry(entry.key, text, label)
+            result.append(formatted_entry)
+        entry_cache.save()
+        return result
+
+    def _format_entries_parallel(self, labeled_entries, bib_data, workers, format_entry):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        global _parallel_format
+
+        num_chunks = min(workers * 4, len(labeled_entries) // self.min_chunk_size)
+        if num_chunks < 2:
+            return None
+        try:
+            context = multiprocessing.get_context('fork')
+        except ValueError:
+            return None
+        chunk_size = -(-len(labeled_entries) // num_chunks)
+        chunks = [
+            range(start, min(start + chunk_size, len(labeled_entries)))
+            for start in range(0, len(labeled_entries), chunk_size)
+        ]
+
+        _parallel_format = self, labeled_entries, bib_data
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                results = executor.map(_format_chunk, chunks[1:])
+                formatted_entries = [
+                    format_entry(label, entry, bib_data=bib_data)
+                    for label, entry in labeled_entries[:chunk_size]
+                ]
+                try:
+                    results = list(results)
+                except Exception:
+                    # the formatted entries could not be sent back
+                    results = [[None] * len(chunk) for chunk in chunks[1:]]
+                for chunk, chunk_results in zip(chunks[1:], results):
+                    for index, formatted_entry in zip(chunk, chunk_results):
+                        if formatted_entry is None:
+                            label, entry = labeled_entries[index]
+                            formatted_entry = format_entry(label, entry, bib_data=bib_data)
+                        formatted_entries.append(formatted_entry)
+        finally:
+            _parallel_format = None
+        return formatted_entries
+
+    def get_template_key(self, entry):
+        """Return a hashable key identifying the template for the entry,
+        or ``None`` if the template should not be cached.
+
+        Templates are built and compiled once for each key and reused for all
+        entries with the same key, so the key must include everything
+        ``get_<type>_template`` branches on -- at least the entry type.
+        The built-in styles use the entry type and the names of the fields
+        and person roles present in the entry. A subclass whose templates
+        depend on field values must override this method.
+        """
+
+        return None
+
+    def get_template(self, entry):
+        """Return the template for the entry, or ``None`` if the style has
+        no ``get_<type>_template`` method for the entry type.
+        """
+
+        try:
+            get_template = getattr(self, 'get_{}_template'.format(entry.type))
+        except AttributeError:
+            return None
+        return get_template(entry)
+
+    def _get_template_function(self, entry):
+        template_key = self.get_template_key(entry)
+        if template_key is None:
+            template = self.get_template(entry)
+            return None if template is None else template.format_data
+        try:
+            return self._templates[template_key]
+        except KeyError:
+            template = self.get_template(entry)
+            function = None if template is None else template.compile()
+            self._templates[template_key] = function
+            return function
 
     def format_entry(self, label, entry, bib_data=None):
             context = {
@@ -63,28 +233,73 @@ class BaseStyle(Plugin):
                 'style': self,
                 'bib_data': bib_data,
             }
-            try:
-                get_template = getattr(self, 'get_{}_template'.format(entry.type))
-            except AttributeError:
+            format_template = self._get_template_function(entry)
+            if format_template is None:
                 format_method = getattr(self, "format_" + entry.type)
                 text = format_method(context)
             else:
-                text = get_template(entry).format_data(context)
+                text = format_template(context)
             return FormattedEntry(entry.key, text, label)
 
-    def format_bibliography(self, bib_data, citations=None):
+    def format_bibliography(self, bib_data, citations=None, workers=None, entry_cache=None, lazy=False):
         """
         Format bibliography entries with the given keys and return a
         ``FormattedBibliography`` object.
 
         :param bib_data: A :py:class:`pybtex.database.BibliographyData` object.
         :param citations: A list of citation keys.
+        :param workers: Number of worker processes (see :py:meth:`format_entries`).
+        :param entry_cache: A :py:class:`.FormattedEntryCache` to reuse
+            previously formatted entries.
+        :param lazy: Format each entry only when its text is accessed
+            (see :py:meth:`format_entries`).
         """
 
         if citations is None:
             citations = list(bib_data.entries.keys())
         citations = bib_data.add_extra_citations(citations, self.min_crossrefs)
         entries = [bib_data.entries[key] for key in citations]
-        formatted_entries = self.format_entries(entries)
+        if workers or entry_cache is not None or lazy:
+            formatted_entries = self.format_entries(
+                entries, bib_data, workers=workers, entry_cache=entry_cache, lazy=lazy,
+            )
+        else:
+            formatted_entries = self.format_entries(entries, bib_data)
         formatted_bibliography = FormattedBibliography(formatted_entries, style=self, preamble=bib_data.preamble)
         return formatted_bibliography
+
+
+def _get_declared_fields(style):
+    """Return the fields declared by the class of the style itself.
+
+    A subclass may use fields that its parent class does not, so inherited
+    field lists are ignored.
+    """
+
+    return type(style).__dict__.get('fields')
+
+
+def _format_chunk(indexes):
+    """Format the entries in a worker process.
+
+    Return a list of :py:class:`.FormattedEntry` objects, with ``None`` for
+    the entries that reported errors and have to be formatted serially.
+    """
+
+    import pybtex.errors
+
+    style, labeled_entries, bib_data = _parallel_format
+    results = []
+    for index in indexes:
+        label, entry = labeled_entries[index]
+        with pybtex.errors.capture() as captured_errors:
+            try:
+                formatted_entry = style.format_entry(label, entry, bib_data=bib_data)
+            except Exception:
+                formatted_entry = None
+        results.append(None if captured_errors else formatted_entry)
+    return results
+
+
+# the style, the labeled entries and the bibliography data for the forked worker processes
+_parallel_format = None
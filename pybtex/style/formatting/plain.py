@@ -25,4 +25,5 @@ from pybtex.style.formatting.unsrt import Style as UnsrtStyle
 
 
 class Style(UnsrtStyle):
+    fields = UnsrtStyle.fields
     default_sorting_style = 'author_year_title'
@@ -42,9 +42,28 @@ date = words [optional_field('month'), field('year')]
 
 
 class Style(BaseStyle):
+    fields = (
+        'address', 'author', 'booktitle', 'chapter', 'doi', 'edition', 'editor',
+        'eprint', 'howpublished', 'institution', 'isbn', 'journal', 'month',
+        'note', 'number', 'organization', 'pages', 'publisher', 'pubmed',
+        'school', 'series', 'title', 'type', 'url', 'urldate', 'volume', 'year',
+    )
+
+    def get_template_key(self, entry):
+        # the templates (and the templates of subclasses) may check which
+        # fields and persons are present, and format_editor() checks
+        # the number of editors
+        return (
+            entry.type,
+            frozenset(name.lower() for name in entry.fields),
+            frozenset(
+                (role.lower(), min(len(persons), 2))
+                for role, persons in entry.persons.items()
+            ),
+        )
 
     def format_names(self, role, as_sentence=True):
-        formatted_names = names(role, sep=', ', sep2 = ' and ', last_sep=', and ')
+        formatted_names = names(role, sep=', ', sep2 = ' and ', last_sep=', and ', max_names=self.max_names)
         if as_sentence:
             return sentence [formatted_names]
         else:
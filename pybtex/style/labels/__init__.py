@@ -26,6 +26,10 @@ from pybtex.textutils import width
 
 
 class BaseLabelStyle(Plugin):
+    #: Names of the fields used to make labels, or ``None`` for any field.
+    #: Not inherited by subclasses (see :py:attr:`.BaseStyle.fields`).
+    fields = None
+
     def get_longest_label(self, formatted_entries):
         labels = (entry.label for entry in formatted_entries)
         return max(labels, key=width)
@@ -59,6 +59,7 @@ def _abbr(parts):
 
 
 class LabelStyle(BaseLabelStyle):
+    fields = ('author', 'editor', 'key', 'organization', 'year')
 
     def format_labels(self, sorted_entries):
         labels = [self.format_label(entry) for entry in sorted_entries]
@@ -28,6 +28,7 @@ from pybtex.style.labels import BaseLabelStyle
 
 
 class LabelStyle(BaseLabelStyle):
+    fields = ()
 
     def format_labels(self, sorted_entries):
         for number, entry in enumerate(sorted_entries):
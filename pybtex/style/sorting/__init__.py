@@ -24,6 +24,10 @@ from pybtex.plugin import Plugin
 
 
 class BaseSortingStyle(Plugin):
+    #: Names of the fields used to sort entries, or ``None`` for any field.
+    #: Not inherited by subclasses (see :py:attr:`.BaseStyle.fields`).
+    fields = None
+
     def sorting_key(self, entry):
         raise NotImplementedError
 
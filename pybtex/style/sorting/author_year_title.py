@@ -1,6 +1,9 @@
 from __future__ import unicode_literals
 
+from functools import total_ordering
+
 from pybtex.style.sorting import BaseSortingStyle
+from pybtex.utils import LazyList
 
 
 # Copyright (c) 2006-2021  Andrey Golovizin
@@ -27,6 +30,7 @@ from pybtex.style.sorting import BaseSortingStyle
 
 
 class SortingStyle(BaseSortingStyle):
+    fields = ('author', 'editor', 'title', 'year')
 
     def sorting_key(self, entry):
         if entry.type in ('book', 'inbook'):
@@ -38,7 +42,7 @@ class SortingStyle(BaseSortingStyle):
         return (author_key, entry.fields.get('year', ''), entry.fields.get('title', ''))
 
     def persons_key(self, persons):
-        return '   '.join(self.person_key(person) for person in persons)
+        return PersonsKey(persons, self.person_key)
 
     def person_key(self, person):
         return '  '.join((
@@ -54,3 +58,93 @@ class SortingStyle(BaseSortingStyle):
             return self.persons_key(entry.persons['editor'])
         else:
             return ''
+
+
+def _compare_chunks(chunks, other_chunks):
+    """Compare two strings given as sequences of chunks.
+
+    >>> _compare_chunks(['ab', 'c'], ['a', 'bd'])
+    -1
+    >>> _compare_chunks(['ab', '', 'c'], ['abc'])
+    0
+    >>> _compare_chunks(['abc'], ['ab'])
+    1
+    """
+
+    chunks = iter(chunks)
+    other_chunks = iter(other_chunks)
+    chunk = other_chunk = ''
+    while True:
+        if not chunk:
+            chunk = next(chunks, None)
+        if not other_chunk:
+            other_chunk = next(other_chunks, None)
+        if chunk is None or other_chunk is None:
+            return (chunk is not None) - (other_chunk is not None)
+        length = min(len(chunk), len(other_chunk))
+        head, other_head = chunk[:length], other_chunk[:length]
+        if head != other_head:
+            return -1 if head < other_head else 1
+        chunk, other_chunk = chunk[length:], other_chunk[length:]
+
+
+@total_ordering
+class PersonsKey(object):
+    """A sort key for a list of persons.
+
+    The key compares like ``'   '.join(person_key(person) for person in persons)``,
+    but the keys of the individual persons are computed only as far as needed
+    to tell two lists apart. For entries with thousands of authors, usually
+    only the first few names are ever parsed.
+
+    >>> from pybtex.database import Person
+    >>> def person_key(person):
+    ...     return str(person).lower()
+    >>> key = PersonsKey([Person('Knuth, D.'), Person('Lamport, L.')], person_key)
+    >>> str(key)
+    'knuth, d.   lamport, l.'
+    >>> key < PersonsKey([Person('Knuth, D.'), Person('Patashnik, O.')], person_key)
+    True
+    >>> key == 'knuth, d.   lamport, l.'
+    True
+    >>> '' < key
+    True
+    """
+
+    separator = '   '
+
+    def __init__(self, persons, person_key):
+        self._chunks = LazyList(self._iter_chunks(persons, person_key))
+
+    def _iter_chunks(self, persons, person_key):
+        for index, person in enumerate(persons):
+            if index:
+                yield self.separator
+            yield person_key(person)
+
+    def _compare(self, other):
+        if isinstance(other, PersonsKey):
+            return _compare_chunks(self._chunks, other._chunks)
+        elif isinstance(other, str):
+            return _compare_chunks(self._chunks, [other])
+        else:
+            return NotImplemented
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+        result = self._compare(other)
+        return result if result is NotImplemented else result == 0
+
+    def __lt__(self, other):
+        result = self._compare(other)
+        return result if result is NotImplemented else result < 0
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __str__(self):
+        return ''.join(self._chunks)
+
+    def __repr__(self):
+        return 'PersonsKey({0!r})'.format(str(self))
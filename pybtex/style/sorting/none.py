@@ -25,6 +25,7 @@ from pybtex.style.sorting import BaseSortingStyle
 
 
 class SortingStyle(BaseSortingStyle):
+    fields = ()
 
     def sort(self, entries):
         return entries
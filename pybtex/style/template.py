@@ -45,6 +45,7 @@ one two three four
 from __future__ import unicode_literals
 
 import warnings
+from functools import wraps
 
 from pybtex import richtext
 from pybtex.exceptions import PybtexError
@@ -127,6 +128,21 @@ class Node(object):
 
         return self.f(self.children, data, *self.args, **self.kwargs)
 
+    def compile(self):
+        """Compile the template into a Python function.
+
+        The function takes the same argument as :py:meth:`format_data`
+        and returns the same result, but does not have to walk the
+        template tree every time.
+
+        >>> from pybtex.database import Entry
+        >>> template = words ['one', optional [field('volume')], 'two']
+        >>> print(str(template.compile()({'entry': Entry('book')})))
+        one two
+        """
+
+        return TemplateCompiler().compile(self)
+
     def format(self):
         """A convenience function to be used instead of format_data
         when no data is needed.
@@ -154,24 +170,27 @@ def node(f):
     return Node(f.__name__, f)
 
 
-@node
-def join(children, data, sep='', sep2=None, last_sep=None):
-    """Join text fragments together.
-    >>> print(str(join.format()))
-    <BLANKLINE>
-    >>> print(str(join ['a', 'b', 'c', 'd', 'e'].format()))
-    abcde
-    >>> print(str(join(sep=', ', sep2=' and ', last_sep=', and ') ['Tom', 'Jerry'].format()))
-    Tom and Jerry
-    >>> print(str(join(sep=', ', sep2=' and ', last_sep=', and ') ['Billy', 'Willy', 'Dilly'].format()))
-    Billy, Willy, and Dilly
+def macro(expand):
+    """Define a node as a shorthand for another template.
+
+    ``expand(children, *args, **kwargs)`` must return the template to format
+    instead of the node. Unlike a node defined with :py:func:`node`, a macro
+    can be inlined by :py:meth:`Node.compile`.
     """
 
+    @wraps(expand)
+    def f(children, data, *args, **kwargs):
+        return expand(children, *args, **kwargs).format_data(data)
+    f.expand = expand
+    return node(f)
+
+
+def _join(parts, sep='', sep2=None, last_sep=None):
     if sep2 is None:
         sep2 = sep
     if last_sep is None:
         last_sep = sep
-    parts = [part for part in _format_list(children, data) if part]
+    parts = [part for part in parts if part]
     if len(parts) <= 1:
         return richtext.Text(*parts)
     elif len(parts) == 2:
@@ -180,11 +199,58 @@ def join(children, data, sep='', sep2=None, last_sep=None):
         return richtext.Text(last_sep).join([richtext.Text(sep).join(parts[:-1]), parts[-1]])
 
 
+def _together(parts, last_tie=False):
+    from pybtex.textutils import tie_or_space
+    tie = richtext.nbsp
+    space = richtext.String(' ')
+    parts = [part for part in parts if part]
+    if not parts:
+        return richtext.Text()
+    if len(parts) <= 2:
+        tie2 = tie if last_tie else tie_or_space(parts[0], tie, space, other_word=parts[-1])
+        return tie2.join(parts)
+    else:
+        last_tie = tie if last_tie else tie_or_space(parts[-1], tie, space)
+        return richtext.Text(
+            parts[0], tie_or_space(parts[0], tie, space),
+            space.join(parts[1:-1]), last_tie, parts[-1]
+        )
+
+
+def _format_names(persons, context, max_names, et_al, kwargs):
+    style = context['style']
+    if max_names is not None and len(persons) > max_names:
+        formatted_names = [
+            style.format_name(person, style.abbreviate_names)
+            for person in persons[:max_names]
+        ]
+        sep = kwargs.get('sep', '')
+        return richtext.Text(_join(_format_list(formatted_names, context), sep=sep), et_al)
+    formatted_names = [style.format_name(person, style.abbreviate_names) for person in persons]
+    return _join(_format_list(formatted_names, context), **kwargs)
+
+
 @node
-def words(children, data, sep=' '):
+def join(children, data, sep='', sep2=None, last_sep=None):
+    """Join text fragments together.
+    >>> print(str(join.format()))
+    <BLANKLINE>
+    >>> print(str(join ['a', 'b', 'c', 'd', 'e'].format()))
+    abcde
+    >>> print(str(join(sep=', ', sep2=' and ', last_sep=', and ') ['Tom', 'Jerry'].format()))
+    Tom and Jerry
+    >>> print(str(join(sep=', ', sep2=' and ', last_sep=', and ') ['Billy', 'Willy', 'Dilly'].format()))
+    Billy, Willy, and Dilly
+    """
+
+    return _join(_format_list(children, data), sep, sep2, last_sep)
+
+
+@macro
+def words(children, sep=' '):
     """Join text fragments with spaces or something else."""
 
-    return join(sep) [children].format_data(data)
+    return join(sep) [children]
 
 
 @node
@@ -203,21 +269,7 @@ def together(children, data, last_tie=False):
     >>> print(str(together ['chapter', '666'].format()))
     chapter 666
     """
-    from pybtex.textutils import tie_or_space
-    tie = richtext.nbsp
-    space = richtext.String(' ')
-    parts = [part for part in _format_list(children, data) if part]
-    if not parts:
-        return richtext.Text()
-    if len(parts) <= 2:
-        tie2 = tie if last_tie else tie_or_space(parts[0], tie, space, other_word=parts[-1])
-        return tie2.join(parts)
-    else:
-        last_tie = tie if last_tie else tie_or_space(parts[-1], tie, space)
-        return richtext.Text(
-            parts[0], tie_or_space(parts[0], tie, space),
-            space.join(parts[1:-1]), last_tie, parts[-1]
-        )
+    return _together(_format_list(children, data), last_tie)
 
 
 @node
@@ -232,7 +284,7 @@ def sentence(children, data, capfirst=False, capitalize=False, add_period=True,
     uno, dos, tres
     """
 
-    text = join(sep) [children].format_data(data)
+    text = _join(_format_list(children, data), sep)
     if capfirst:
         text = text.capfirst()
     if capitalize:
@@ -268,8 +320,23 @@ def field(children, context, name, apply_func=None, raw=False):
 
 
 @node
-def names(children, context, role, **kwargs):
-    """Return formatted names."""
+def names(children, context, role, max_names=None, et_al=' et al.', **kwargs):
+    """Return formatted names.
+
+    If there are more than ``max_names`` persons, only the first ``max_names``
+    persons are formatted, followed by ``et_al``. The remaining names are not
+    even parsed, which matters for entries with thousands of authors.
+
+    >>> from pybtex.database import Entry, PersonList
+    >>> from pybtex.style.formatting.plain import Style
+    >>> entry = Entry('article')
+    >>> entry.persons['author'] = PersonList.from_string('Ann Smith and Bob Jones and Carl Brown')
+    >>> context = {'entry': entry, 'style': Style()}
+    >>> print(str(names('author', sep=', ', last_sep=', and ').format_data(context)))
+    Ann Smith, Bob Jones, and Carl Brown
+    >>> print(str(names('author', sep=', ', max_names=2).format_data(context)))
+    Ann Smith, Bob Jones et al.
+    """
 
     assert not children
 
@@ -278,9 +345,7 @@ def names(children, context, role, **kwargs):
     except KeyError:
         raise FieldIsMissing(role, context['entry'])
 
-    style = context['style']
-    formatted_names = [style.format_name(person, style.abbreviate_names) for person in persons]
-    return join(**kwargs) [formatted_names].format_data(context)
+    return _format_names(persons, context, max_names, et_al, kwargs)
 
 
 @node
@@ -301,10 +366,10 @@ def optional(children, data):
         return richtext.Text()
 
 
-@node
-def optional_field(children, data, *args, **kwargs):
+@macro
+def optional_field(children, *args, **kwargs):
     assert not children
-    return optional [field(*args, **kwargs)].format_data(data)
+    return optional [field(*args, **kwargs)]
 
 
 @node
@@ -355,3 +420,213 @@ def first_of(children, data):
         if child:
             return child
     return richtext.Text()
+
+
+def _find_field(entry, name, bib_data):
+    """Return the field like Entry._find_field(), or None if it is missing."""
+
+    fields = entry.fields
+    if name in fields:
+        return fields[name]
+    try:
+        return entry._find_field(name, bib_data)
+    except KeyError:
+        return None
+
+
+class TemplateCompiler(object):
+    """Compile a template into a Python function.
+
+    Templates made of the nodes defined in this module are lowered into
+    straight-line Python code: missing fields are checked with ``if``
+    statements and ``optional`` nodes become ``while True`` blocks that are
+    left with ``break`` when a field is missing. Macros are expanded, and
+    other nodes are called with :py:meth:`Node.format_data`.
+    """
+
+    # Python limits the nesting of indented and loop blocks
+    max_depth = 40
+    max_loop_depth = 15
+
+    def __init__(self):
+        self.namespace = {
+            'Text': richtext.Text,
+            'FieldIsMissing': FieldIsMissing,
+            'find_field': _find_field,
+            'from_latex': richtext.Text.from_latex,
+            'join': _join,
+            'together': _together,
+            'format_names': _format_names,
+        }
+        self.lines = []
+        self.variables = 0
+        self.optionals = []
+        self.compilers = {
+            join.f: self.compile_join,
+            together.f: self.compile_together,
+            sentence.f: self.compile_sentence,
+            field.f: self.compile_field,
+            names.f: self.compile_names,
+            optional.f: self.compile_optional,
+            tag.f: self.compile_tag,
+            href.f: self.compile_href,
+            first_of.f: self.compile_first_of,
+        }
+
+    def compile(self, template):
+        result = self.compile_node(template, depth=1)
+        source = 'def format_data(data):\n{0}\n    return {1}\n'.format('\n'.join(self.lines), result)
+        exec(compile(source, '<template>', 'exec'), self.namespace)
+        return self.namespace['format_data']
+
+    def add_constant(self, value):
+        name = 'c{0}'.format(len(self.namespace))
+        self.namespace[name] = value
+        return name
+
+    def add_variable(self):
+        self.variables += 1
+        return 'v{0}'.format(self.variables)
+
+    def emit(self, depth, line, *args):
+        self.lines.append('    ' * depth + line.format(*args))
+
+    def emit_missing(self, depth, name):
+        if self.optionals:
+            self.emit(depth, '{0} = Text()', self.optionals[-1])
+            self.emit(depth, 'break')
+        else:
+            self.emit(depth, "raise FieldIsMissing({0}, data['entry'])", self.add_constant(name))
+
+    def compile_node(self, node, depth):
+        """Emit the code formatting the node and return an expression
+        for the result.
+        """
+
+        if not hasattr(node, 'format_data'):
+            return self.add_constant(node)
+        if isinstance(node, Node) and depth < self.max_depth:
+            expand = getattr(node.f, 'expand', None)
+            compile_node = self.compilers.get(node.f)
+            start = len(self.lines)
+            try:
+                if expand:
+                    return self.compile_node(expand(node.children, *node.args, **node.kwargs), depth)
+                elif compile_node:
+                    return compile_node(depth, node.children, *node.args, **node.kwargs)
+            except TypeError:
+                # invalid arguments or a too complex template,
+                # let format_data() handle it
+                del self.lines[start:]
+        return self.compile_format_data(node, depth)
+
+    def compile_format_data(self, node, depth):
+        result = self.add_variable()
+        if self.optionals:
+            self.emit(depth, 'try:')
+            self.emit(depth + 1, '{0} = {1}.format_data(data)', result, self.add_constant(node))
+            self.emit(depth, 'except FieldIsMissing:')
+            self.emit_missing(depth + 1, None)
+        else:
+            self.emit(depth, '{0} = {1}.format_data(data)', result, self.add_constant(node))
+        return result
+
+    def compile_children(self, children, depth):
+        return ', '.join(self.compile_node(child, depth) for child in children)
+
+    def compile_join(self, depth, children, sep='', sep2=None, last_sep=None):
+        result = self.add_variable()
+        parts = self.compile_children(children, depth)
+        self.emit(
+            depth, '{0} = join([{1}], {2}, {3}, {4})', result, parts,
+            self.add_constant(sep), self.add_constant(sep2), self.add_constant(last_sep),
+        )
+        return result
+
+    def compile_together(self, depth, children, last_tie=False):
+        result = self.add_variable()
+        parts = self.compile_children(children, depth)
+        self.emit(depth, '{0} = together([{1}], {2})', result, parts, self.add_constant(last_tie))
+        return result
+
+    def compile_sentence(self, depth, children, capfirst=False, capitalize=False, add_period=True, sep=', '):
+        result = self.compile_join(depth, children, sep)
+        if capfirst:
+            self.emit(depth, '{0} = {0}.capfirst()', result)
+        if capitalize:
+            self.emit(depth, '{0} = {0}.capitalize()', result)
+        if add_period:
+            self.emit(depth, '{0} = {0}.add_period()', result)
+        return result
+
+    def compile_field(self, depth, children, name, apply_func=None, raw=False):
+        if children:
+            raise TypeError('field() takes no children')
+        result = self.add_variable()
+        self.emit(depth, "{0} = find_field(data['entry'], {1}, data.get('bib_data'))", result, self.add_constant(name))
+        self.emit(depth, 'if {0} is None:', result)
+        self.emit_missing(depth + 1, name)
+        if not raw:
+            self.emit(depth, '{0} = from_latex({0})', result)
+        if apply_func:
+            self.emit(depth, '{0} = {1}({0})', result, self.add_constant(apply_func))
+        return result
+
+    def compile_names(self, depth, children, role, max_names=None, et_al=' et al.', **kwargs):
+        if children:
+            raise TypeError('names() takes no children')
+        result = self.add_variable()
+        role = self.add_constant(role)
+        self.emit(depth, "{0} = data['entry'].persons", result)
+        self.emit(depth, 'if {0} not in {1}:', role, result)
+        self.emit_missing(depth + 1, self.namespace[role])
+        self.emit(
+            depth, '{0} = format_names({0}[{1}], data, {2}, {3}, {4})', result, role,
+            self.add_constant(max_names), self.add_constant(et_al), self.add_constant(kwargs),
+        )
+        return result
+
+    def compile_optional(self, depth, children):
+        if len(self.optionals) >= self.max_loop_depth:
+            raise TypeError('too many nested loops')
+        result = self.add_variable()
+        self.emit(depth, 'while True:')
+        self.optionals.append(result)
+        try:
+            parts = self.compile_children(children, depth + 1)
+        finally:
+            self.optionals.pop()
+        self.emit(depth + 1, '{0} = Text({1})', result, parts)
+        self.emit(depth + 1, 'break')
+        return result
+
+    def compile_tag(self, depth, children, name):
+        result = self.add_variable()
+        parts = self.compile_children(children, depth)
+        self.emit(depth, '{0} = {1}({2}, {3})', result, self.add_constant(richtext.Tag), self.add_constant(name), parts)
+        return result
+
+    def compile_href(self, depth, children, url=None, external=False):
+        if url is None:
+            raise TypeError('href() requires an url')
+        result = self.add_variable()
+        url = self.compile_node(url, depth)
+        parts = self.compile_children(children, depth)
+        self.emit(
+            depth, '{0} = {1}({2}, {3}, external={4})', result,
+            self.add_constant(richtext.HRef), url, parts, self.add_constant(external),
+        )
+        return result
+
+    def compile_first_of(self, depth, children):
+        if depth + len(children) >= self.max_depth:
+            raise TypeError('too many nested blocks')
+        result = self.add_variable()
+        for child in children:
+            part = self.compile_node(child, depth)
+            self.emit(depth, 'if {0}:', part)
+            self.emit(depth + 1, '{0} = {1}', result, part)
+            self.emit(depth, 'else:')
+            depth += 1
+        self.emit(depth, '{0} = Text()', result)
+        return result
@@ -377,3 +377,75 @@ class CaseInsensitiveSet(MutableSet):
 
     def lower(self):
         return type(self)(self._set)
+
+
+class LazyList(Sequence):
+    """A read-only list that takes items from an iterator only when they are needed.
+
+    >>> items = LazyList(iter('abcde'))
+    >>> items[1]
+    'b'
+    >>> items.items_read
+    2
+    >>> items[:3]
+    ['a', 'b', 'c']
+    >>> items.items_read
+    3
+    >>> len(items)
+    5
+    >>> items[-1]
+    'e'
+    >>> items[5]
+    Traceback (most recent call last):
+        ...
+    IndexError: list index out of range
+    """
+
+    def __init__(self, iterable):
+        self._iterator = iter(iterable)
+        self._items = []
+
+    @property
+    def items_read(self):
+        return len(self._items)
+
+    def _read_until(self, size=None):
+        if self._iterator is None:
+            return
+        if size is None:
+            self._items.extend(self._iterator)
+        elif size > len(self._items):
+            self._items.extend(itertools.islice(self._iterator, size - len(self._items)))
+            if size <= len(self._items):
+                return
+        else:
+            return
+        self._iterator = None
+
+    def __len__(self):
+        self._read_until()
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if (
+                index.stop is None or index.stop < 0
+                or (index.start or 0) < 0 or (index.step or 1) < 0
+            ):
+                self._read_until()
+            else:
+                self._read_until(index.stop)
+        elif index < 0:
+            self._read_until()
+        else:
+            self._read_until(index + 1)
+        return self._items[index]
+
+    def __iter__(self):
+        index = 0
+        while True:
+            self._read_until(index + 1)
+            if index >= len(self._items):
+                return
+            yield self._items[index]
+            index += 1
@@ -99,6 +99,7 @@ setup(
             'pybtex = pybtex.__main__:main',
             'pybtex-convert = pybtex.database.convert.__main__:main',
             'pybtex-format = pybtex.database.format.__main__:main',
+            'pybtex-batch = pybtex.batch.__main__:main',
         ],
         'pybtex.database.input': [
             'bibtex = pybtex.database.input.bibtex:Parser',
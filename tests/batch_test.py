@@ -0,0 +1,66 @@
+# Copyright (c) 2006-2021  Andrey Golovizin
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import unicode_literals
+
+import pytest
+
+from pybtex import errors
+from pybtex.bibtex import make_bibliographies
+from pybtex.database.input import bibtex
+
+bib_string = """
+@string{pub = "Publisher"}
+@book{first, title = {First}, publisher = pub}
+@book{second, title = {Second}, publisher = pub}
+"""
+
+bst_string = """
+ENTRY { title publisher } {} {}
+FUNCTION {print} { cite$ ": " * title * ", " * publisher * write$ newline$ }
+READ
+ITERATE {print}
+"""
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_make_bibliographies(tmpdir, monkeypatch, workers):
+    monkeypatch.chdir(tmpdir)
+    monkeypatch.setattr(errors, 'strict', False)
+    monkeypatch.setattr(bibtex, 'parsed_files', bibtex.LRUCache())
+    tmpdir.join('test.bib').write(bib_string)
+    tmpdir.join('test.bst').write(bst_string)
+    tmpdir.join('one.aux').write('\\citation{first}\n\\bibdata{test}\n\\bibstyle{test}\n')
+    tmpdir.join('two.aux').write('\\citation{second}\n\\citation{missing}\n\\bibdata{test}\n\\bibstyle{test}\n')
+    tmpdir.join('bad.aux').write('\\citation{first}\n\\bibdata{missing}\n\\bibstyle{test}\n')
+    tmpdir.join('three.aux').write('\\citation{*}\n\\bibdata{test}\n\\bibstyle{test}\n')
+
+    results = make_bibliographies(['one.aux', 'two.aux', 'bad.aux', 'three.aux'], workers=workers)
+    assert [result.aux_filename for result in results] == ['one.aux', 'two.aux', 'bad.aux', 'three.aux']
+    assert [result.error for result in results[:2]] == [None, None]
+    assert results[1].warnings == ['WARNING: missing database entry for "missing"']
+    assert 'missing.bib' in results[2].error
+    assert results[3].error is None
+    assert tmpdir.join('one.bbl').read() == 'first: First, Publisher\n'
+    assert tmpdir.join('two.bbl').read() == 'second: Second, Publisher\n'
+    assert tmpdir.join('three.bbl').read() == 'first: First, Publisher\nsecond: Second, Publisher\n'
+    # the database is parsed once for all documents
+    assert len(bibtex.parsed_files.keys()) == 1
@@ -31,12 +31,17 @@ https://github.com/matthew-brett/babybib
 
 from __future__ import absolute_import, unicode_literals
 
+from io import StringIO
 from unittest import TestCase
 
 from itertools import zip_longest
 
+import pytest
+
+from pybtex import errors
 from pybtex.database import BibliographyData, Entry, Person
 from pybtex.database.input.bibtex import Parser
+from .utils import get_data
 
 
 class _TestParser(Parser):
@@ -70,6 +75,30 @@ class ParserTest(object):
             actual_error = str(error)
             assert actual_error == correct_error
 
+    def test_parser_parallel(self):
+        parser = _TestParser(encoding='UTF-8', workers=2, **self.parser_options)
+        for input_string in self.input_strings:
+            parser.parse_string(input_string)
+        result = parser.data
+        correct_result = self.correct_result
+        assert result == correct_result
+        for error, correct_error in zip_longest(parser.errors, self.errors):
+            actual_error = str(error)
+            assert actual_error == correct_error
+
+    def test_iter_entries(self):
+        for chunk_size in 1, 5, 1024:
+            parser = _TestParser(encoding='UTF-8', **self.parser_options)
+            for input_string in self.input_strings:
+                entries = parser.iter_entries(StringIO(input_string), chunk_size=chunk_size)
+                parser.data.add_entries(entries)
+            result = parser.data
+            correct_result = self.correct_result
+            assert result == correct_result
+            for error, correct_error in zip_longest(parser.errors, self.errors):
+                actual_error = str(error)
+                assert actual_error == correct_error
+
 
 class EmptyDataTest(ParserTest, TestCase):
     input_string = u''
@@ -418,6 +447,24 @@ class UnusedEntryTest(ParserTest, TestCase):
     correct_result = BibliographyData()
 
 
+class UnwantedEntriesTest(ParserTest, TestCase):
+    parser_options = {'wanted_entries': ['wanted']}
+    input_string = u"""
+        @misc{skipped1, title = "Quoted {with} {nested {braces}}", note = {@misc{fake, year = 1}}}
+        @article(skipped2, journal = jan # " and " # undefined, year = 2000, pages = "1)")
+        @book{wanted, crossref = {xref}}
+        @misc{skipped3, title "no equals sign"}
+        @misc{xref, title = {Included}}
+    """
+    correct_result = BibliographyData(entries=[
+        ('wanted', Entry('book', [('crossref', 'xref')])),
+        ('xref', Entry('misc', [('title', 'Included')])),
+    ])
+    errors = [
+        "syntax error in line 5: '=' expected",
+    ]
+
+
 class CrossFileMacrosTest(ParserTest, TestCase):
     input_strings = [
         u'@string{jackie = "Jackie Chan"}',
@@ -541,3 +588,131 @@ class DuplicatePersonFieldTest(ParserTest, TestCase):
     errors = [
         'entry with key Me2009 has a duplicate AUTHoR field',
     ]
+
+
+class WantedFieldsTest(ParserTest, TestCase):
+    parser_options = {'wanted_fields': ['Title', 'author', 'year']}
+    input_string = u"""
+        @string{long = "Lorem ipsum"}
+        @article{first,
+            author = {Nom de Plume, My},
+            TITLE = "A short story",
+            abstract = {{Lorem} ipsum " dolor} # " sit amet" # long # undefined_macro,
+            file = {story.pdf}, file = {story2.pdf},
+            crossref = {second},
+        }
+        @book{second, editor = {Foo}, year = 2009, note = 1}
+    """
+    correct_result = BibliographyData(
+        entries=[
+            ('first', Entry('article',
+                fields=[('TITLE', 'A short story'), ('crossref', 'second')],
+                persons={'author': [Person('Nom de Plume, My')]},
+            )),
+            ('second', Entry('book', fields=[('year', '2009')])),
+        ]
+    )
+
+
+@pytest.mark.parametrize(["dataset_name"], [("xampl.bib",), ("IEEEtran.bib",), ("cyrillic.bib",)])
+def test_parse_parallel(dataset_name):
+    text = get_data(dataset_name) * 3
+    with errors.capture() as serial_errors:
+        serial_result = Parser(encoding='UTF-8').parse_string(text)
+    with errors.capture() as parallel_errors:
+        parallel_result = Parser(encoding='UTF-8', workers=2).parse_string(text)
+    assert list(parallel_result.entries) == list(serial_result.entries)
+    assert parallel_result == serial_result
+    assert parallel_result.preamble == serial_result.preamble
+    assert [str(error) for error in parallel_errors] == [str(error) for error in serial_errors]
+    assert serial_errors
+
+
+indexed_bib = u"""
+    @string{j = "Journal"}
+    @article{first, journal = j, crossref = {third}}
+    @book{second, title = "Café", crossref = {first}}
+    @inbook{third, title = {Third}, year = 2000}
+    @preamble{"preamble"}
+    @string{j = "Another journal"}
+    @misc{fourth, journal = j, note = undefined}
+    @misc{first, title = "duplicate"}
+"""
+
+
+@pytest.mark.parametrize(
+    ["wanted_entries"],
+    [(["first"],), (["SECOND"],), (["fourth"],), (["second", "fourth", "missing"],)]
+)
+def test_parse_indexed(tmpdir, wanted_entries):
+    bib_file = tmpdir.join('indexed.bib')
+    bib_file.write_text(indexed_bib, encoding='UTF-8')
+    filename = str(bib_file)
+
+    results = []
+    for use_index in False, True, True:
+        with errors.capture() as captured_errors:
+            parser = Parser(encoding='UTF-8', wanted_entries=wanted_entries, use_index=use_index)
+            bib_data = parser.parse_file(filename)
+        results.append((
+            list(bib_data.entries),
+            bib_data,
+            bib_data.preamble,
+            [str(error) for error in captured_errors],
+        ))
+    assert tmpdir.join('indexed.bib.pybtex-index').check()
+    assert results[1] == results[0]
+    assert results[2] == results[0]
+
+
+def test_index_invalidation(tmpdir):
+    from pybtex.database.input.bibtex import BibTeXIndex
+
+    bib_file = tmpdir.join('indexed.bib')
+    bib_file.write_text(indexed_bib, encoding='UTF-8')
+    filename = str(bib_file)
+    index = BibTeXIndex.get(filename, 'UTF-8')
+    assert [command[1] for command in index.commands] == [
+        None, 'first', 'second', 'third', None, None, 'fourth', 'first',
+    ]
+    assert BibTeXIndex.load(filename, 'UTF-8').commands == index.commands
+    assert BibTeXIndex.load(filename, 'latin1') is None
+
+    bib_file.setmtime(bib_file.mtime() + 10)
+    assert BibTeXIndex.load(filename, 'UTF-8').commands == index.commands
+
+    bib_file.write_text(indexed_bib.replace('Café', 'Cafe'), encoding='UTF-8')
+    bib_file.setmtime(bib_file.mtime() + 20)
+    assert BibTeXIndex.load(filename, 'UTF-8') is None
+
+    bib_file.write_text(u'@misc{broken, title = {', encoding='UTF-8')
+    assert BibTeXIndex.build(filename, 'UTF-8') is None
+
+
+def test_parse_cached(tmpdir, monkeypatch):
+    from pybtex.database.input import bibtex
+
+    bib_file = tmpdir.join('cached.bib')
+    bib_file.write_text(indexed_bib.replace('note = undefined', 'note = j'), encoding='UTF-8')
+    filename = str(bib_file)
+    cache_dir = str(tmpdir.join('cache'))
+
+    def parse(**kwargs):
+        with errors.capture() as captured_errors:
+            parser = Parser(encoding='UTF-8', wanted_entries=['first', 'fourth'], **kwargs)
+            bib_data = parser.parse_file(filename)
+        return list(bib_data.entries), bib_data, bib_data.preamble, [str(error) for error in captured_errors]
+
+    correct_result = parse()
+    assert parse(cache_dir=cache_dir) == correct_result
+    # cache hits do not use the low-level parser at all
+    monkeypatch.setattr(bibtex, 'LowLevelParser', None)
+    assert parse(cache_dir=cache_dir) == correct_result
+    monkeypatch.undo()
+
+    # files with errors are parsed as usual
+    bib_file.write_text(indexed_bib, encoding='UTF-8')
+    correct_result = parse()
+    assert len(correct_result[-1]) == 2
+    assert parse(cache_dir=cache_dir) == correct_result
+    assert parse(cache_dir=cache_dir) == correct_result
@@ -0,0 +1,148 @@
+# Copyright (c) 2006-2021  Andrey Golovizin
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+"""Compare the BibTeX string functions with straightforward implementations
+on top of :py:class:`pybtex.bibtex.utils.BibTeXString` on random strings.
+"""
+
+from __future__ import unicode_literals
+
+import random
+
+import pytest
+
+from pybtex.bibtex import utils
+from pybtex.bibtex.exceptions import BibTeXError
+from pybtex.charwidths import charwidths
+
+ALPHABET = 'aBz09 :-~{}\\_.\'\tßΣİé'
+
+
+def scan(string):
+    return utils.BibTeXString(string).traverse(
+        open=lambda string: ('{', string.level),
+        f=lambda char, string: (char, string.level),
+        close=lambda string: ('}', string.level - 1),
+    )
+
+
+def reference_len(string):
+    return sum(1 for char, brace_level in scan(string) if char not in '{}')
+
+
+def reference_width(string):
+    width = 0
+    for token, brace_level in scan(string):
+        if brace_level == 1 and token.startswith('\\'):
+            width += sum(charwidths.get(char, 0) for char in token[2:] if char not in '{}')
+            width -= 1000
+        else:
+            width += charwidths.get(token, 0)
+    return width
+
+
+def reference_prefix(string, num_chars):
+    result = []
+    length = 0
+    brace_level = 0
+    for char, brace_level in scan(string):
+        result.append(char)
+        if char not in '{}':
+            length += 1
+        if length >= num_chars:
+            break
+    return ''.join(result) + '}' * brace_level
+
+
+def reference_purify(string):
+    result = []
+    for token, brace_level in scan(string):
+        if brace_level == 1 and token.startswith('\\'):
+            result.extend(char for char in utils.purify_special_char_re.sub('', token) if char.isalnum())
+        elif token.isalnum():
+            result.append(token)
+        elif token.isspace() or token in '-~':
+            result.append(' ')
+    return ''.join(result)
+
+
+def reference_change_case(string, mode):
+    def convert(text, state):
+        if mode == 'l' or mode == 't' and state != 'start':
+            return text.lower()
+        elif mode == 'u':
+            return text.upper()
+        return text
+
+    result = []
+    state = 'start'
+    for char, brace_level in scan(string):
+        if brace_level == 0:
+            result.append(convert(char, state))
+            if char == ':':
+                state = 'after colon'
+            elif char.isspace() and state == 'after colon':
+                state = 'start'
+            else:
+                state = 'normal'
+        elif brace_level == 1 and char.startswith('\\'):
+            result.append(' '.join(
+                word if word.startswith('\\') else convert(word, state)
+                for word in char.split(' ')
+            ))
+        else:
+            result.append(char)
+    return ''.join(result)
+
+
+def random_strings(seed, count=300, max_length=20):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, max_length)))
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_scan_bibtex_string(seed):
+    for string in random_strings(seed):
+        assert list(utils.scan_bibtex_string(string)) == list(scan(string)), string
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_string_functions(seed):
+    for string in random_strings(seed):
+        assert utils.bibtex_len(string) == reference_len(string), string
+        assert utils.bibtex_width(string) == reference_width(string), string
+        assert utils.bibtex_purify(string) == reference_purify(string), string
+        for num_chars in range(-1, 5):
+            assert utils.bibtex_prefix(string, num_chars) == reference_prefix(string, num_chars), string
+        for mode in 'lut':
+            assert utils.change_case(string, mode) == reference_change_case(string, mode), (string, mode)
+
+
+def test_too_many_braces():
+    string = '{' * 101 + '}' * 101
+    with pytest.raises(BibTeXError):
+        list(scan(string))
+    for function in utils.bibtex_len, utils.bibtex_width, utils.bibtex_purify, list:
+        with pytest.raises(BibTeXError):
+            function(utils.scan_bibtex_string(string) if function is list else string)
+    assert utils.bibtex_len('{' * 100 + '}' * 100) == 0
@@ -0,0 +1,241 @@
+# Copyright (c) 2006-2021  Andrey Golovizin
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import unicode_literals
+
+import pytest
+
+from pybtex.bibtex import format_from_string
+from pybtex.bibtex.exceptions import BibTeXError
+
+bib_string = """
+@book{first, title = {First}, year = 2000}
+@article{second, title = {Second}}
+"""
+
+
+def run_bst(tmpdir, bst_string, citations=('*',)):
+    style = str(tmpdir.join('test'))
+    tmpdir.join('test.bst').write(bst_string)
+    return format_from_string(bib_string, style, citations=list(citations))
+
+
+def test_control_flow(tmpdir):
+    result = run_bst(tmpdir, """
+        ENTRY { title year } {} {}
+        INTEGERS { n }
+        FUNCTION {show.year}
+        { year empty$ { "no year" } { year } if$ }
+        FUNCTION {count}
+        { #0 'n :=
+          { n #3 < } { n #1 + 'n := } while$
+          n int.to.str$
+        }
+        FUNCTION {book} { title " " * show.year * " " * count * write$ newline$ }
+        FUNCTION {article} { title " " * show.year * write$ newline$ }
+        FUNCTION {indirect} { #1 { "direct" } { "indirect" } swap$ if$ write$ newline$ }
+        READ
+        ITERATE {call.type$}
+        EXECUTE {indirect}
+    """)
+    assert result == 'First 2000 3\nSecond no year\nindirect\n'
+
+
+def test_deep_nesting(tmpdir):
+    depth = 60
+    body = '#1 ' * depth + '{ ' * depth + '"deep"' + ' } { "no" } if$' * depth
+    result = run_bst(tmpdir, """
+        FUNCTION {{test}} {{ {0} write$ newline$ }}
+        EXECUTE {{test}}
+    """.format(body))
+    assert result == 'deep\n'
+
+
+def test_forward_reference(tmpdir):
+    result = run_bst(tmpdir, """
+        FUNCTION {first} { #1 { later } { undefined.function } if$ }
+        FUNCTION {later} { "later" write$ newline$ }
+        EXECUTE {first}
+    """)
+    assert result == 'later\n'
+
+
+def test_undefined_function(tmpdir):
+    with pytest.raises(BibTeXError, match='undefined function'):
+        run_bst(tmpdir, """
+            FUNCTION {test} { undefined.function }
+            EXECUTE {test}
+        """)
+
+
+def test_entry_variables(tmpdir):
+    result = run_bst(tmpdir, """
+        ENTRY { title } { number } { label }
+        INTEGERS { counter }
+        FUNCTION {init} { counter #1 + 'counter := counter 'number := title "l" change.case$ 'label := }
+        FUNCTION {presort} { number #1 = { "b" } { "a" } if$ 'sort.key$ := }
+        FUNCTION {print} { number int.to.str$ " " * label * " " * cite$ * write$ newline$ }
+        READ
+        ITERATE {init}
+        ITERATE {presort}
+        SORT
+        ITERATE {print}
+        REVERSE {print}
+    """)
+    assert result == '2 second second\n1 first first\n1 first first\n2 second second\n'
+
+
+parallel_bst = """
+    ENTRY { title } { number } { label }
+    INTEGERS { counter }
+    STRINGS { s }
+    FUNCTION {make.label}
+    { title 's :=
+      s empty$ { "empty title in " cite$ * warning$ "?" 's := } 'skip$ if$
+      s "u" change.case$ 'label :=
+      label text.length$ 'number :=
+    }
+    FUNCTION {count} { counter number + 'counter := }
+    FUNCTION {print} { label " " * number int.to.str$ * write$ newline$ }
+    FUNCTION {print.total} { counter int.to.str$ write$ newline$ }
+    READ
+    ITERATE {make.label}
+    ITERATE {count}
+    ITERATE {print}
+    EXECUTE {print.total}
+"""
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_parallel_iterate(tmpdir, monkeypatch, workers):
+    from pybtex.bibtex.interpreter import Interpreter
+    from pybtex.errors import capture
+
+    serial_citations = []
+    iterate_parallel = Interpreter.iterate_parallel
+
+    def log_iterate_parallel(self, f, citations):
+        result = iterate_parallel(self, f, citations)
+        serial_citations.append(len(result))
+        return result
+
+    monkeypatch.setattr(Interpreter, 'min_chunk_size', 1)
+    monkeypatch.setattr(Interpreter, 'iterate_parallel', log_iterate_parallel)
+    bib = '\n'.join(
+        '@misc{{key{0}, title = {{{1}}}}}'.format(i, 'Title' * (i % 3))
+        for i in range(20)
+    )
+    style = str(tmpdir.join('test'))
+    tmpdir.join('test.bst').write(parallel_bst)
+    with capture() as errors:
+        result = format_from_string(bib, style, citations=['*'], workers=workers)
+    lines = result.splitlines()
+    assert lines[:4] == ['? 1', 'TITLE 5', 'TITLETITLE 10', '? 1']
+    assert lines[-1] == '102'
+    assert [str(error) for error in errors] == [
+        'empty title in key{0}'.format(i) for i in range(0, 20, 3)
+    ]
+    if workers:
+        # make.label is executed in parallel, count and print are not
+        assert serial_citations == [0, 18, 20]
+
+
+def test_output_file(tmpdir):
+    from pybtex.bibtex import format_from_files
+
+    tmpdir.join('test.bib').write(bib_string)
+    tmpdir.join('test.bst').write("""
+        ENTRY { title } {} {}
+        FUNCTION {print} { title write$ newline$ }
+        READ
+        ITERATE {print}
+    """)
+    output_filename = str(tmpdir.join('test.bbl'))
+    result = format_from_files(
+        [str(tmpdir.join('test.bib'))], str(tmpdir.join('test')), output_filename=output_filename,
+    )
+    assert result is None
+    assert tmpdir.join('test.bbl').read() == 'First\nSecond\n'
+
+
+def test_profiler(tmpdir):
+    import json
+
+    from pybtex.bibtex.profiler import Profiler
+
+    profiler = Profiler()
+    style = str(tmpdir.join('test'))
+    tmpdir.join('test.bst').write("""
+        ENTRY { title } {} {}
+        FUNCTION {format.title} { title "u" change.case$ }
+        FUNCTION {print} { format.title write$ newline$ }
+        READ
+        ITERATE {print}
+    """)
+    result = format_from_string(bib_string, style, citations=['*'], profiler=profiler)
+    assert result == 'FIRST\nSECOND\n'
+
+    stats = {function_stats.name: function_stats for function_stats in profiler.get_stats()}
+    assert stats['print'].calls == 2
+    assert stats['format.title'].calls == 2
+    assert stats['format.title'].kind == 'function'
+    assert stats['change.case$'].calls == 2
+    assert stats['change.case$'].kind == 'builtin'
+    assert stats['print'].total_time >= stats['format.title'].total_time
+    assert [key for key, elapsed in profiler.entry_times['print']] == ['first', 'second']
+
+    report_filename = str(tmpdir.join('profile.json'))
+    profiler.write_report(report_filename)
+    with open(report_filename) as report_file:
+        report = json.load(report_file)
+    assert report['iterations'][0]['function'] == 'print'
+    assert report['iterations'][0]['entries'] == 2
+    assert 'format.title' in profiler.format_report()
+
+
+def test_entry_fields(tmpdir, monkeypatch):
+    from pybtex.database.input import bibtex
+    from pybtex.errors import capture
+
+    parsed_fields = []
+    make_entry = bibtex.Parser.make_entry
+
+    def log_make_entry(self, entry_type, key, fields):
+        parsed_fields.extend(name for name, value in fields)
+        return make_entry(self, entry_type, key, fields)
+
+    monkeypatch.setattr(bibtex.Parser, 'make_entry', log_make_entry)
+    style = str(tmpdir.join('test'))
+    tmpdir.join('test.bst').write("""
+        ENTRY { title } {} {}
+        FUNCTION {print} { title write$ newline$ }
+        READ
+        ITERATE {print}
+    """)
+    bib = """
+        @book{first, title = {First}, abstract = {Very long} # undefined, abstract = {Again}}
+        @book{second, Title = {Second}, crossref = {first}}
+    """
+    with capture() as errors:
+        result = format_from_string(bib, style, citations=['*'])
+    assert result == 'First\nSecond\n'
+    assert errors == []
+    assert parsed_fields == ['title', 'Title', 'crossref']
@@ -0,0 +1,172 @@
+# Copyright (c) 2006-2021  Andrey Golovizin
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+from __future__ import unicode_literals
+
+import os
+import sys
+
+import pytest
+
+from pybtex.bibtex import bst
+from pybtex.cache import DirectoryCache, clear_cache
+
+
+def test_missing_directory(tmpdir):
+    cache = DirectoryCache(str(tmpdir.join('cache')))
+    with pytest.raises(KeyError):
+        cache['key']
+    cache['key'] = 'value'
+    assert cache['key'] == 'value'
+
+
+def test_broken_file(tmpdir):
+    cache = DirectoryCache(str(tmpdir))
+    cache['key'] = 'value'
+    with open(cache.get_filename('key'), 'wb') as cache_file:
+        cache_file.write(b'garbage')
+    with pytest.raises(KeyError):
+        cache['key']
+    assert 'key' not in cache
+
+
+def test_lru_eviction(tmpdir):
+    cache = DirectoryCache(str(tmpdir), max_size=2 ** 16)
+    value = 'x' * 2 ** 14
+    for i in range(3):
+        cache[i] = value
+        os.utime(cache.get_filename(i), (i, i))
+    # reading makes the value recently used
+    assert cache[0] == value
+    cache[3] = value
+    assert [i in cache for i in range(4)] == [True, False, True, True]
+    cache[4] = value
+    assert [i in cache for i in range(5)] == [True, False, False, True, True]
+
+
+def test_clear_cache(tmpdir):
+    cache = DirectoryCache(str(tmpdir.join('subdir')))
+    cache['key'] = 'value'
+    clear_cache(str(tmpdir))
+    assert 'key' not in cache
+
+
+def test_bst_cache(tmpdir):
+    bst_file = tmpdir.join('test.bst')
+    bst_file.write('FUNCTION {test} { "first" write$ }\nEXECUTE {test}\n')
+    cache_dir = str(tmpdir.join('cache'))
+    commands = bst.parse_file(str(bst_file), cache_dir=cache_dir)
+    assert bst.parse_file(str(bst_file)) is commands
+    bst.parsed_styles.clear()
+    cached_commands = bst.parse_file(str(bst_file), cache_dir=cache_dir)
+    assert cached_commands is not commands
+    assert cached_commands == commands
+    # a modified style is parsed again
+    bst_file.write('FUNCTION {test} { "second" write$ }\nEXECUTE {test}\n')
+    new_commands = bst.parse_file(str(bst_file), cache_dir=cache_dir)
+    assert new_commands != commands
+
+
+def test_sqlite_cache(tmpdir):
+    from pybtex.cache import SQLiteCache
+
+    filename = str(tmpdir.join('cache', 'test.sqlite'))
+    cache = SQLiteCache(filename, max_size=2 ** 16)
+    value = 'x' * 2 ** 14
+    cache.update([(i, value) for i in range(3)])
+    assert cache[0] == value
+    with pytest.raises(KeyError):
+        cache['missing key']
+    cache.close()
+
+    # reading makes the value recently used
+    cache = SQLiteCache(filename, max_size=2 ** 16)
+    cache[3] = value
+    assert [i in cache for i in range(4)] == [True, False, True, True]
+    clear_cache(str(tmpdir))
+    assert 0 not in cache
+    cache.close()
+
+
+@pytest.mark.parametrize('backend', ['sqlite', 'directory'])
+def test_formatted_entry_cache(tmpdir, monkeypatch, backend):
+    from pybtex import errors
+    from pybtex.database import parse_string
+    from pybtex.style.cache import FormattedEntryCache
+    from pybtex.style.formatting.unsrt import Style
+
+    monkeypatch.setattr(errors, 'strict', False)
+    bib_string = """
+        @book{book, author = {Jane Doe}, title = {Book}, booktitle = {Book}, publisher = {P}, year = 2000}
+        @incollection{paper, author = {John Doe}, title = {Paper}, crossref = {book}, pages = {1--2}}
+        @misc{bad, author = {Doe, Jane, Jr., X}, title = {Bad}}
+    """
+    cache_dir = str(tmpdir)
+
+    def format_bibliography(bib_string, **kwargs):
+        entry_cache = FormattedEntryCache.from_directory(cache_dir, backend=backend)
+        bib_data = parse_string(bib_string, 'bibtex')
+        with errors.capture() as captured_errors:
+            formatted_bibliography = Style(**kwargs).format_bibliography(bib_data, entry_cache=entry_cache)
+        entry_cache.close()
+        texts = [entry.text.render_as('text') for entry in formatted_bibliography]
+        return texts, (entry_cache.hits, entry_cache.misses), len(captured_errors)
+
+    texts, stats, error_count = format_bibliography(bib_string)
+    assert stats == (0, 3)
+    assert error_count == 1
+    # entries that reported errors are not cached
+    assert format_bibliography(bib_string) == (texts, (2, 1), 1)
+    # the changed crossref target changes both entries
+    new_texts, stats, error_count = format_bibliography(bib_string.replace('{P}', '{Q}'))
+    assert stats == (0, 3)
+    assert new_texts != texts
+    assert format_bibliography(bib_string, abbreviate_names=True)[1] == (0, 3)
+
+
+def test_formatted_entry_cache_style_key(tmpdir, monkeypatch):
+    import importlib
+
+    from pybtex.style.cache import FormattedEntryCache
+
+    tmpdir.join('basestyle.py').write(
+        'from pybtex.style.formatting.unsrt import Style as UnsrtStyle\n'
+        'class Style(UnsrtStyle):\n'
+        '    pass\n'
+    )
+    tmpdir.join('mystyle.py').write(
+        'from basestyle import Style as BaseStyle\n'
+        'class Style(BaseStyle):\n'
+        '    pass\n'
+    )
+    monkeypatch.syspath_prepend(str(tmpdir))
+    for module_name in 'basestyle', 'mystyle':
+        monkeypatch.delitem(sys.modules, module_name, raising=False)
+    style = importlib.import_module('mystyle').Style()
+    entry_cache = FormattedEntryCache({})
+    style_key = entry_cache.get_style_key(style)
+    assert entry_cache.get_style_key(style) == style_key
+
+    # editing the base class module invalidates the cache
+    base_module = tmpdir.join('basestyle.py')
+    os.utime(str(base_module), ns=(base_module.stat().mtime_ns + 10 ** 9,) * 2)
+    assert entry_cache.get_style_key(style) != style_key
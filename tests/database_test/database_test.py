@@ -176,3 +176,63 @@ def test_database_pickling(protocol):
 
 def test_database_repr():
     check_database_io(ReprEvalIO())
+
+
+def test_lazy_persons(monkeypatch):
+    from pybtex.database import Person
+
+    parsed_names = []
+    parse_string_orig = Person._parse_string
+
+    def _parse_string(self, name):
+        parsed_names.append(name)
+        return parse_string_orig(self, name)
+
+    monkeypatch.setattr(Person, '_parse_string', _parse_string)
+    bib_data = parse_string(u"""
+        @book{test, author = {Knuth, Donald E. and Lamport, Leslie and Patashnik, Oren}}
+    """, 'bibtex')
+    authors = bib_data.entries['test'].persons['author']
+    assert parsed_names == []
+    assert len(authors) == 3
+    assert parsed_names == []
+    assert str(authors[1]) == 'Lamport, Leslie'
+    assert parsed_names == ['Lamport, Leslie']
+    assert authors == [Person('Knuth, Donald E.'), Person('Lamport, Leslie'), Person('Patashnik, Oren')]
+
+
+def test_person_list_split_on_demand():
+    from pybtex.database import PersonList
+
+    names = ' and '.join('Author{0}, A.'.format(i) for i in range(5000))
+    persons = PersonList.from_string(names)
+    assert [str(person) for person in persons[:2]] == ['Author0, A.', 'Author1, A.']
+    assert persons._names.items_read == 2
+    assert str(persons[-1]) == 'Author4999, A.'
+    assert len(persons) == 5000
+    assert pickle.loads(pickle.dumps(persons)) == persons
+
+
+def test_person_list_as_list():
+    from pybtex.database import Person, PersonList
+
+    persons = PersonList.from_string('Knuth, Donald E. and Lamport, Leslie')
+    knuth, lamport, patashnik = Person('Knuth, Donald E.'), Person('Lamport, Leslie'), Person('Patashnik, Oren')
+    assert persons + [patashnik] == [knuth, lamport, patashnik]
+    assert type(persons + [patashnik]) is list
+    assert [patashnik] + persons == [patashnik, knuth, lamport]
+    assert persons + PersonList([patashnik]) == [knuth, lamport, patashnik]
+    with pytest.raises(TypeError):
+        persons + (patashnik,)
+
+    persons_copy = persons.copy()
+    assert isinstance(persons_copy, PersonList)
+    assert persons_copy == persons
+    persons_copy.append(patashnik)
+    assert persons == [knuth, lamport]
+    assert persons_copy == [knuth, lamport, patashnik]
+    assert PersonList([knuth]).copy() == [knuth]
+
+    persons += [patashnik]
+    assert isinstance(persons, PersonList)
+    assert persons == [knuth, lamport, patashnik]
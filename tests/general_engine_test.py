@@ -163,3 +163,53 @@ def test_bibtex_engine(check, filenames):
 def test_pybtex_engine(check, filenames):
     import pybtex
     check(pybtex, filenames)
+
+
+@pytest.mark.parametrize('style', ['unsrt', 'alpha'])
+def test_parallel_formatting(monkeypatch, style):
+    import pybtex
+    from pybtex.style.formatting import BaseStyle
+
+    monkeypatch.setattr(errors, 'strict', False)
+    parallel_results = []
+    format_entries_parallel = BaseStyle._format_entries_parallel
+
+    def log_format_entries_parallel(self, *args):
+        result = format_entries_parallel(self, *args)
+        parallel_results.append(result is not None)
+        return result
+
+    monkeypatch.setattr(BaseStyle, 'min_chunk_size', 1)
+    monkeypatch.setattr(BaseStyle, '_format_entries_parallel', log_format_entries_parallel)
+    bib_string = get_data('cyrillic.bib') + '\n'.join(
+        '@misc{{bad{0}, author = {{Doe, Jane, Jr., {0}}}, title = {{Bad}}}}'.format(i)
+        for i in range(3)
+    )
+    with errors.capture() as serial_errors:
+        serial_result = pybtex.format_from_string(bib_string, style, citations=['*'])
+    with errors.capture() as parallel_errors:
+        parallel_result = pybtex.format_from_string(bib_string, style, citations=['*'], workers=3)
+    assert parallel_result == serial_result
+    assert [str(error) for error in parallel_errors] == [str(error) for error in serial_errors]
+    assert len(serial_errors) == 3
+    assert parallel_results == [True]
+
+
+def test_subclassed_style_fields():
+    import pybtex
+    from pybtex.style.formatting import toplevel
+    from pybtex.style.formatting.unsrt import Style
+    from pybtex.style.template import field, sentence
+
+    class AbstractStyle(Style):
+        def get_misc_template(self, e):
+            return toplevel [sentence [field('title'), field('abstract')]]
+
+    class TitleStyle(Style):
+        fields = ('title',)
+
+    bib_string = '@misc{key, title = {T}, abstract = {Abs}, note = {N}}'
+    assert AbstractStyle().get_fields() is None
+    assert TitleStyle().get_fields() == ['title']
+    result = pybtex.format_from_string(bib_string, AbstractStyle, output_backend='text')
+    assert result == '[1] T, Abs.\n'
@@ -207,3 +207,39 @@ def test_parse_name(name, correct_result, expected_errors):
     result = (person.bibtex_first_names, person.prelast_names, person.last_names, person.lineage_names)
     assert result == correct_result
     assert captured_errors == expected_errors
+
+
+name_formats = [
+    '{ff~}{vv~}{ll}{, jj}',
+    '{vv~}{ll}{, jj}{, f.}',
+    '{f.~}{vv~}{ll}{, jj}',
+    '{vv{}}{ll{}}',
+    '{ll~~}{f{.}~}',
+    'abc {ff} xyz {l.}?',
+    '{{ }ff~{ }}{vv~{- Test text here -}~}{ll}{, jj}',
+]
+
+
+@pytest.mark.parametrize('name_format', name_formats)
+@pytest.mark.parametrize(["name", "correct_result", "expected_errors"], sample_names)
+def test_compiled_name_format(name, correct_result, expected_errors, name_format):
+    from pybtex.bibtex.names import NameFormat, compile_name_format
+
+    with errors.capture():
+        expected = NameFormat(name_format).format(name)
+        result = compile_name_format(name_format)(Person(name))
+    assert result == expected
+
+
+def test_format_name_errors():
+    from pybtex.bibtex.builtins import _format_name
+
+    names = 'Doe, Jane, Jr., Sr. and John Smith'
+    for name_format, expected in [('{ll}', 'Doe'), ('{ll}', 'Doe'), ('{ff}', 'Jr.~Sr.')]:
+        # the invalid name is reported every time it is formatted
+        with errors.capture() as captured_errors:
+            assert _format_name(names, 1, name_format) == expected
+        assert captured_errors == [InvalidNameString('Doe, Jane, Jr., Sr.')]
+    with errors.capture() as captured_errors:
+        assert _format_name(names, 2, '{ll}') == 'Smith'
+    assert captured_errors == []
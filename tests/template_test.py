@@ -1,3 +1,5 @@
+import os
+
 import pytest
 from pybtex.style.template import href, words
 
@@ -18,3 +20,193 @@ def test_old_href_syntax():
     assert result == '<a href="www.test2.org">click here!</a>'
 
 
+
+
+def test_crossref_fields():
+    from pybtex.database import parse_string
+    from pybtex.style.formatting.unsrt import Style
+
+    bib_data = parse_string(u"""
+        @inproceedings{paper, author = {Jane Doe}, title = {A paper}, crossref = {proc}}
+        @proceedings{proc, title = {Proceedings}, booktitle = {Proceedings}, year = {2000}}
+    """, 'bibtex')
+    formatted_bibliography = Style().format_bibliography(bib_data, ['paper'])
+    entry = list(formatted_bibliography)[0]
+    assert entry.text.render_as('text') == 'Jane Doe. A paper. In Proceedings. 2000.'
+
+
+def test_template_cache(monkeypatch):
+    from pybtex.database import parse_string
+    from pybtex.style.formatting.unsrt import Style
+
+    bib_data = parse_string(u"""
+        @proceedings{one, editor = {Jane Doe}, title = {One}, year = {2000}}
+        @proceedings{two, editor = {John Doe}, title = {Two}, year = {2001}}
+        @proceedings{three, editor = {Jane Doe and John Doe}, title = {Three}, year = {2002}}
+        @proceedings{four, organization = {ACM}, title = {Four}, year = {2003}}
+        @misc{five, title = {Five}}
+    """, 'bibtex')
+    style = Style()
+    built_templates = []
+    get_proceedings_template = style.get_proceedings_template
+
+    def log_get_proceedings_template(e):
+        built_templates.append(e.key)
+        return get_proceedings_template(e)
+
+    monkeypatch.setattr(style, 'get_proceedings_template', log_get_proceedings_template)
+    formatted_bibliography = style.format_bibliography(bib_data)
+    assert [entry.text.render_as('text') for entry in formatted_bibliography] == [
+        'Jane Doe, editor. One, 2000.',
+        'John Doe, editor. Two, 2001.',
+        'Jane Doe and John Doe, editors. Three, 2002.',
+        'ACM. Four, 2003.',
+        'Five.',
+    ]
+    assert built_templates == ['one', 'three', 'four']
+
+
+def test_template_cache_subclass():
+    from pybtex.database import parse_string
+    from pybtex.style.formatting import toplevel
+    from pybtex.style.formatting.unsrt import Style
+    from pybtex.style.template import field, sentence
+
+    class NoteStyle(Style):
+        def get_article_template(self, e):
+            if 'note' in e.fields:
+                return toplevel [sentence [field('author'), field('note')]]
+            return toplevel [sentence [field('author')]]
+
+    bib_data = parse_string(u"""
+        @article{one, author = {A}}
+        @article{two, author = {B}, note = {N}}
+    """, 'bibtex')
+    formatted_bibliography = NoteStyle().format_bibliography(bib_data)
+    assert [entry.text.render_as('text') for entry in formatted_bibliography] == ['A.', 'B, N.']
+
+
+def format_template(function, context):
+    from pybtex.style.template import FieldIsMissing
+
+    try:
+        return function(context)
+    except FieldIsMissing as error:
+        return str(error)
+
+
+@pytest.mark.parametrize('style_name', ['unsrt', 'alpha', 'plain', 'unsrtalpha'])
+@pytest.mark.parametrize('bib_name', ['xampl', 'xampl_mixed', 'cyrillic', 'extrafields'])
+def test_compiled_templates(bib_name, style_name):
+    from pybtex.database import parse_file
+    from pybtex.plugin import find_plugin
+
+    bib_data = parse_file(os.path.join(os.path.dirname(__file__), 'data', bib_name + '.bib'))
+    style = find_plugin('pybtex.style.formatting', style_name)(max_names=3)
+    templates = 0
+    for entry in bib_data.entries.values():
+        template = style.get_template(entry)
+        if template is None:
+            continue
+        templates += 1
+        context = {'entry': entry, 'style': style, 'bib_data': bib_data}
+        text = format_template(template.format_data, context)
+        assert format_template(template.compile(), context) == text
+    assert templates
+
+
+def test_compiled_templates_subclass():
+    from pybtex.database import parse_string
+    from pybtex.style.formatting import toplevel
+    from pybtex.style.formatting.unsrt import Style
+    from pybtex.style.template import field, optional, sentence
+
+    class NoteStyle(Style):
+        def get_article_template(self, e):
+            template = super(NoteStyle, self).get_article_template(e)
+            if 'abstract' in e.fields:
+                return toplevel [template, sentence ['Abstract', field('abstract')]]
+            if 'year' not in e.fields:
+                return toplevel [sentence [field('title'), optional [field('journal')]]]
+            return template
+
+    bib_data = parse_string(u"""
+        @article{one, author = {A}, title = {One}, journal = {J}, year = {2000}}
+        @article{two, author = {B}, title = {Two}, journal = {J}, year = {2001}, abstract = {Abs}}
+        @article{three, title = {Three}, journal = {J}}
+        @article{four, author = {D}, title = {Four}, journal = {J}, year = {2003}}
+        @article{five, title = {Five}}
+    """, 'bibtex')
+    style = NoteStyle()
+    formatted_bibliography = style.format_bibliography(bib_data)
+    compiled_texts = [entry.text for entry in formatted_bibliography]
+    interpreted_texts = [
+        style.get_template(entry).format_data({'entry': entry, 'style': style, 'bib_data': bib_data})
+        for entry in bib_data.entries.values()
+    ]
+    assert compiled_texts == interpreted_texts
+    assert [text.render_as('text') for text in compiled_texts] == [
+        'A. One. J, 2000.',
+        'B. Two. J, 2001. Abstract, Abs.',
+        'Three, J.',
+        'D. Four. J, 2003.',
+        'Five.',
+    ]
+
+
+def test_compiled_custom_nodes():
+    from pybtex.database import Entry
+    from pybtex.style.template import field, join, macro, node, optional
+
+    @node
+    def upper(children, data):
+        return join [children].format_data(data).upper()
+
+    @macro
+    def volume(children):
+        return join ['vol. ', field('volume')]
+
+    template = join(sep=', ') [
+        optional [upper [field('title')]],
+        optional [upper [field('note')], 'never'],
+        optional [volume],
+    ]
+    format_template = template.compile()
+    for fields, expected in [({'title': 'Title', 'volume': '3'}, 'TITLE, vol. 3'), ({}, '')]:
+        context = {'entry': Entry('book', fields=fields)}
+        assert format_template(context) == template.format_data(context)
+        assert str(format_template(context)) == expected
+
+
+def test_lazy_formatting(monkeypatch):
+    import io
+
+    from pybtex.database import parse_string
+    from pybtex.plugin import find_plugin
+    from pybtex.style.formatting.unsrt import Style
+
+    bib_data = parse_string('\n'.join(
+        '@misc{{key{0}, title = {{Title {0}}}}}'.format(i) for i in range(100)
+    ), 'bibtex')
+    style = Style()
+    formatted_keys = []
+    format_entry = style.format_entry
+
+    def log_format_entry(label, entry, bib_data=None):
+        formatted_keys.append(entry.key)
+        return format_entry(label, entry, bib_data=bib_data)
+
+    monkeypatch.setattr(style, 'format_entry', log_format_entry)
+    formatted_bibliography = style.format_bibliography(bib_data, lazy=True)
+    assert len(formatted_bibliography) == 100
+    assert formatted_bibliography.get_longest_label() == '100'
+    assert formatted_keys == []
+
+    page = formatted_bibliography[50:52]
+    assert [entry.label for entry in page] == ['51', '52']
+    stream = io.StringIO()
+    find_plugin('pybtex.backends', 'plaintext')().write_to_stream(page, stream)
+    assert stream.getvalue() == '[51] Title 50.\n[52] Title 51.\n'
+    assert formatted_keys == ['key50', 'key51']
+    assert formatted_bibliography[50].text.render_as('text') == 'Title 50.'
+    assert formatted_keys == ['key50', 'key51']